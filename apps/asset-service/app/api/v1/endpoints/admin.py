@@ -0,0 +1,64 @@
+"""
+Admin endpoints: slow-query log and request profiles
+"""
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.profiling import profiles
+from app.core.security import TokenData, require_roles
+from app.db.slow_queries import slow_queries
+from app.schemas.profile import ProfileDetail, ProfileSummary
+from app.schemas.slow_query import SlowQueryReport
+
+router = APIRouter()
+
+
+@router.get("/slow-queries", response_model=SlowQueryReport)
+async def get_slow_queries(
+    route: Optional[str] = Query(None, description="Only statements issued by routes starting with this path"),
+    min_ms: float = Query(0.0, ge=0, description="Only entries at least this slow"),
+    limit: int = Query(20, ge=1, le=500),
+    current_user: TokenData = Depends(require_roles(["admin"])),
+):
+    """Slow and timed-out statements, grouped by SQL with the most total time first"""
+    return slow_queries.report(route=route, min_ms=min_ms, limit=limit)
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(
+    current_user: TokenData = Depends(require_roles(["admin"])),
+):
+    """Empty the slow-query log, e.g. after deploying a fix"""
+    slow_queries.clear()
+
+
+@router.get("/profiles", response_model=List[ProfileSummary])
+async def list_profiles(
+    route: Optional[str] = Query(None, description="Only profiles of routes starting with this path"),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: TokenData = Depends(require_roles(["admin"])),
+):
+    """Stored request profiles, newest first"""
+    return [profile.to_dict() for profile in profiles.list(route=route, limit=limit)]
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    response_model=ProfileDetail,
+    responses={200: {"content": {"text/plain": {}}}},
+)
+async def get_profile(
+    profile_id: str,
+    format: Literal["json", "folded"] = Query("json", description="folded: flame graph input for flamegraph.pl, speedscope or inferno"),
+    current_user: TokenData = Depends(require_roles(["admin"])),
+):
+    """One request profile with its sampled stacks"""
+    try:
+        profile = profiles.get(profile_id)
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    if format == "folded":
+        return PlainTextResponse(profile.folded())
+    return profile.to_dict(stacks=True)
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, text
+from datetime import date, datetime, timedelta
+from typing import List, Optional
 
+from app.core.config import settings
+from app.api.v1.filters import AssetFilters
+from app.core.coalesce import SingleFlight, coalesce
 from app.db.session import get_db
 from app.models.asset import Asset
-from app.schemas.analytics import DashboardStatsResponse, EmployeeAssetCount
+from app.models.analytics import AssetStatusDaily
+from app.schemas.analytics import DashboardStatsResponse, EmployeeAssetCount, PivotResponse, PivotRow, StatusTimeSeries
 from app.core.security import get_current_user, TokenData
 
 print("--- DEBUG: Loading analytics module ---")
@@ -13,6 +19,73 @@ router = APIRouter()
 
 print("--- DEBUG: Analytics router created ---")
 
+# Columns a pivot may group by, and the aggregates it may compute
+PIVOT_DIMENSIONS = {
+    "status": Asset.status,
+    "asset_type": Asset.asset_type,
+    "asset_class": Asset.asset_class,
+    "manufacturer": Asset.manufacturer,
+    "model": Asset.model,
+    "os_installed": Asset.os_installed,
+}
+PIVOT_MEASURES = {
+    "count": lambda: func.count(Asset.id),
+    "assigned": lambda: func.count(Asset.id).filter(Asset.status == "assigned"),
+    "employees": lambda: func.count(Asset.assigned_employee_id.distinct()),
+}
+PIVOT_GROUPINGS = {"cube": func.cube, "rollup": func.rollup}
+PIVOT_MAX_DIMS = 4
+
+pivot_results = SingleFlight(ttl=settings.ANALYTICS_PIVOT_CACHE_SECONDS)
+
+def _parse_names(raw: str, allowed: dict, what: str) -> List[str]:
+    names = list(dict.fromkeys(n.strip() for n in raw.split(",") if n.strip()))
+    unknown = [n for n in names if n not in allowed]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid {what} {unknown or raw!r}; choose from {', '.join(allowed)}",
+        )
+    return names
+
+async def _pivot(
+    db: AsyncSession, dims: List[str], measures: List[str], grouping: str, filters: AssetFilters,
+) -> PivotResponse:
+    columns = [PIVOT_DIMENSIONS[d] for d in dims]
+    query = filters.apply(
+        select(
+            # Bit i (from the left) is set when dims[i] is rolled up in this row,
+            # which tells a subtotal apart from a real NULL value
+            func.grouping(*columns).label("rolled_up"),
+            *columns,
+            *[PIVOT_MEASURES[m]().label(m) for m in measures],
+        )
+        .group_by(PIVOT_GROUPINGS[grouping](*columns))
+        .order_by(text("rolled_up"), *columns)
+        .limit(settings.ANALYTICS_PIVOT_MAX_ROWS + 1)
+    )
+    result = (await db.execute(query)).all()
+
+    rows = []
+    for row in result[:settings.ANALYTICS_PIVOT_MAX_ROWS]:
+        rolled_up = row[0]
+        rows.append(PivotRow(
+            dimensions={
+                d: row[1 + i]
+                for i, d in enumerate(dims)
+                if not rolled_up & (1 << (len(dims) - 1 - i))
+            },
+            measures={m: row[1 + len(dims) + j] for j, m in enumerate(measures)},
+        ))
+    return PivotResponse(
+        dims=dims,
+        measures=measures,
+        grouping=grouping,
+        rows=rows,
+        truncated=len(result) > settings.ANALYTICS_PIVOT_MAX_ROWS,
+        generated_at=datetime.utcnow(),
+    )
+
 # Test endpoint to verify routing works
 @router.get("/test", tags=["analytics"])
 async def test_analytics_route():
@@ -25,6 +98,7 @@ async def test_analytics_route():
     }
 
 @router.get("/dashboard-stats", response_model=DashboardStatsResponse)
+@coalesce(ttl=settings.ANALYTICS_COALESCE_TTL_SECONDS, enabled=settings.ANALYTICS_COALESCE)
 async def get_dashboard_stats(
     db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user),
@@ -68,6 +142,7 @@ async def get_dashboard_stats(
     )
 
 @router.get("/employee-usage", response_model=list[EmployeeAssetCount])
+@coalesce(ttl=settings.ANALYTICS_COALESCE_TTL_SECONDS, enabled=settings.ANALYTICS_COALESCE)
 async def get_employee_usage_stats(
     db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user),
@@ -95,3 +170,64 @@ async def get_employee_usage_stats(
         ))
         
     return usage_stats
+
+@router.get("/pivot", response_model=PivotResponse)
+async def get_pivot(
+    dims: str = Query(..., description=f"Comma separated, at most {PIVOT_MAX_DIMS} of: {', '.join(PIVOT_DIMENSIONS)}"),
+    measures: str = Query("count", description=f"Comma separated: {', '.join(PIVOT_MEASURES)}"),
+    grouping: str = Query("cube", pattern="^(cube|rollup)$", description="cube: every subtotal; rollup: hierarchical subtotals in dims order"),
+    filters: AssetFilters = Depends(),
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """
+    Asset counts grouped by any combination of dimensions, with all
+    subtotals and the grand total, in a single GROUP BY CUBE/ROLLUP pass.
+    """
+    dim_names = _parse_names(dims, PIVOT_DIMENSIONS, "dimensions")
+    if len(dim_names) > PIVOT_MAX_DIMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {PIVOT_MAX_DIMS} dimensions per pivot",
+        )
+    measure_names = _parse_names(measures, PIVOT_MEASURES, "measures")
+    key = (tuple(dim_names), tuple(measure_names), grouping, filters.key())
+    return await pivot_results.do(key, lambda: _pivot(db, dim_names, measure_names, grouping, filters))
+
+@router.get("/timeseries", response_model=StatusTimeSeries)
+async def get_status_timeseries(
+    days: int = Query(365, ge=1, le=3660),
+    end: Optional[date] = Query(None, description="Last day of the series; defaults to yesterday (UTC)"),
+    statuses: Optional[str] = Query(None, description="Comma separated statuses; defaults to all"),
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """
+    Daily number of assets per status, read from the nightly snapshots
+    (one primary key range scan, independent of how much history exists).
+    """
+    end = end or datetime.utcnow().date() - timedelta(days=1)
+    start = end - timedelta(days=days - 1)
+    query = (
+        select(AssetStatusDaily.day, AssetStatusDaily.status, AssetStatusDaily.asset_count)
+        .where(AssetStatusDaily.day >= start)
+        .where(AssetStatusDaily.day <= end)
+    )
+    wanted = [s.strip() for s in statuses.split(",") if s.strip()] if statuses else []
+    if wanted:
+        query = query.where(AssetStatusDaily.status.in_(wanted))
+    result = await db.execute(query)
+
+    index = {start + timedelta(days=i): i for i in range(days)}
+    series = {s: [None] * days for s in wanted}
+    snapshot_days = set()
+    for day, status_name, asset_count in result:
+        snapshot_days.add(day)
+        series.setdefault(status_name, [None] * days)[index[day]] = asset_count
+    # A status without a row on a snapshotted day had no assets that day
+    for day in snapshot_days:
+        for values in series.values():
+            if values[index[day]] is None:
+                values[index[day]] = 0
+
+    return StatusTimeSeries(start=start, end=end, days=list(index), series=dict(sorted(series.items())))
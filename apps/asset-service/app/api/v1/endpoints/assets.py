@@ -4,11 +4,18 @@ Asset API Endpoints
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from typing import List, Optional
+from typing import List
 import math
 
+from app.api.v1.fieldsets import fieldset
+from app.api.v1.filters import AssetFilters
+from app.core.config import settings
+from app.core.responses import model_response
+from app.db.counting import CountMode, count_rows
 from app.db.session import get_db
 from app.models.asset import Asset
+from app.repositories import ReadModel, asset_rows
+from app.services import record_status_change
 from app.schemas.asset import (
     AssetCreate,
     AssetUpdate,
@@ -25,10 +32,9 @@ router = APIRouter()
 async def list_assets(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
-    asset_type: Optional[str] = None,
-    asset_class: Optional[str] = None,
-    status: Optional[str] = None,
-    search: Optional[str] = None,
+    filters: AssetFilters = Depends(),
+    count: CountMode = Query(CountMode.EXACT, description="exact | estimate | none"),
+    rows: ReadModel = Depends(fieldset(asset_rows)),
     db: AsyncSession = Depends(get_db),
     # current_user: TokenData = Depends(get_current_user),
 ):
@@ -37,104 +43,71 @@ async def list_assets(
     """
     print("--- DEBUG: Entering list_assets ---")
     # Build query
-    query = select(Asset)
-    count_query = select(func.count(Asset.id))
-    
-    # Apply filters
-    if asset_type:
-        query = query.where(Asset.asset_type == asset_type)
-        count_query = count_query.where(Asset.asset_type == asset_type)
-    
-    if asset_class:
-        query = query.where(Asset.asset_class == asset_class)
-        count_query = count_query.where(Asset.asset_class == asset_class)
-
-    if status:
-        query = query.where(Asset.status == status)
-        count_query = count_query.where(Asset.status == status)
-    
-    if search:
-        search_filter = f"%{search}%"
-        query = query.where(
-            (Asset.asset_id.ilike(search_filter)) |
-            (Asset.serial_number.ilike(search_filter)) |
-            (Asset.model.ilike(search_filter)) |
-            (Asset.asset_type.ilike(search_filter)) |
-            (Asset.manufacturer.ilike(search_filter)) |
-            (Asset.asset_class.ilike(search_filter))
-        )
-        count_query = count_query.where(
-            (Asset.asset_id.ilike(search_filter)) |
-            (Asset.serial_number.ilike(search_filter)) |
-            (Asset.model.ilike(search_filter)) |
-            (Asset.asset_type.ilike(search_filter)) |
-            (Asset.manufacturer.ilike(search_filter)) |
-            (Asset.asset_class.ilike(search_filter))
-        )
+    query = filters.apply(rows.select())
     
     # Get total count
-    print("--- DEBUG: Executing count_query ---")
-    total_result = await db.execute(count_query)
-    print("--- DEBUG: Count query done ---")
-    total = total_result.scalar() or 0
+    print("--- DEBUG: Counting assets ---")
+    total, total_is_estimate = await count_rows(db, query, count, settings.LIST_COUNT_CAP)
+    print("--- DEBUG: Count done ---")
     
-    # Apply pagination
+    # Apply pagination; one extra row tells whether another page exists
     offset = (page - 1) * size
-    query = query.offset(offset).limit(size).order_by(Asset.created_at.desc())
+    query = query.offset(offset).limit(size + 1).order_by(Asset.created_at.desc())
     
     # Execute query
-    result = await db.execute(query)
-    assets = result.scalars().all()
+    assets = await rows.all(db, query)
     
-    return AssetList(
-        items=[AssetResponse.model_validate(a) for a in assets],
+    return model_response(rows.page(AssetList)(
+        items=assets[:size],
         total=total,
+        total_is_estimate=total_is_estimate,
+        has_more=len(assets) > size,
         page=page,
         size=size,
-        pages=math.ceil(total / size) if total > 0 else 0,
-    )
+        pages=math.ceil(total / size) if total is not None else None,
+    ), sparse=rows.sparse)
 
 @router.get("/assigned", response_model=AssetList)
 async def list_assigned_assets(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    rows: ReadModel = Depends(fieldset(asset_rows)),
     db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user),
 ):
     """
     List all currently assigned assets.
     """
-    query = select(Asset).where(Asset.status == "assigned")
+    query = rows.select().where(Asset.status == "assigned")
     
     # Calculate total count (simplified for async)
     # total = await db.scalar(select(func.count()).select_from(query.subquery()))
     
     # Pagination
-    result = await db.execute(query.offset((page - 1) * size).limit(size))
-    assets = result.scalars().all()
+    assets = await rows.all(db, query.offset((page - 1) * size).limit(size))
     
     # Ideally should implement count properly, here returning mock total or separate count query
     total_query = select(func.count(Asset.id)).where(Asset.status == "assigned")
     total_res = await db.execute(total_query)
     total = total_res.scalar_one()
 
-    return AssetList(
+    return model_response(rows.page(AssetList)(
         items=assets,
         total=total,
         page=page,
         size=size,
         pages=(total + size - 1) // size
-    )
+    ), sparse=rows.sparse)
 
 @router.get("/{asset_id}", response_model=AssetResponse)
 async def get_asset(
     asset_id: int,
+    rows: ReadModel = Depends(fieldset(asset_rows)),
     db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user),
 ):
     """Get a specific asset by ID"""
-    result = await db.execute(select(Asset).where(Asset.id == asset_id))
-    asset = result.scalar_one_or_none()
+    asset = await rows.first(db, rows.select().where(Asset.id == asset_id))
     
     if not asset:
         raise HTTPException(
@@ -142,7 +115,7 @@ async def get_asset(
             detail="Asset not found"
         )
     
-    return AssetResponse.model_validate(asset)
+    return model_response(asset, sparse=rows.sparse)
 
 @router.post("", response_model=AssetResponse, status_code=status.HTTP_201_CREATED)
 async def create_asset(
@@ -191,10 +164,13 @@ async def update_asset(
             detail="Asset not found"
         )
     
-    # Update fields
+    # Update fields; a status change is also logged for the daily snapshots
     update_data = asset_data.model_dump(exclude_unset=True)
+    new_status = update_data.pop("status", None)
     for field, value in update_data.items():
         setattr(asset, field, value)
+    if new_status is not None:
+        record_status_change(db, asset, new_status, changed_by=current_user.email or current_user.sub)
     
     await db.commit()
     await db.refresh(asset)
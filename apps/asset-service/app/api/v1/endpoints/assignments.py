@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime
@@ -9,7 +10,10 @@ from app.models.assignment import AssetAssignment
 from app.models.history import AssignmentHistory
 from app.schemas.asset import AssetResponse
 from app.schemas.assignment import AssetAssign, AssetReturn
-from app.core.security import get_current_user, TokenData
+from app.services import record_status_change
+from app.clients import employee_directory
+from app.core.security import security, get_current_user, TokenData
+from app.core.service_client import ServiceError
 
 router = APIRouter()
 
@@ -18,6 +22,7 @@ async def assign_asset(
     asset_id: int,
     assign_data: AssetAssign,
     db: AsyncSession = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
     current_user: TokenData = Depends(get_current_user),
 ):
     """
@@ -33,8 +38,24 @@ async def assign_asset(
     if asset.status == "assigned":
         raise HTTPException(status_code=400, detail="Asset is already assigned")
 
+    # Validate the employee against employee-service (cached, pooled connection)
+    try:
+        employee = await employee_directory.get(
+            assign_data.employee_id, f"Bearer {credentials.credentials}"
+        )
+    except ServiceError as e:
+        raise HTTPException(status_code=503, detail=f"Cannot validate employee: {e}")
+    if employee is None:
+        raise HTTPException(status_code=422, detail="Employee not found")
+    if not employee.get("is_active", True):
+        raise HTTPException(status_code=422, detail="Employee is inactive")
+
     # 2. Update Asset
-    asset.status = "assigned"
+    record_status_change(
+        db, asset, "assigned",
+        reason=f"Assigned to employee {assign_data.employee_id}",
+        changed_by=current_user.email or current_user.sub,
+    )
     asset.assigned_employee_id = assign_data.employee_id
     asset.updated_at = datetime.utcnow()
     
@@ -42,7 +63,8 @@ async def assign_asset(
     history = AssignmentHistory(
         asset_id=asset.id,
         employee_id=assign_data.employee_id,
-        assigned_by=current_user.id, # Using authenticated user ID
+        # The token's subject is the user id; service tokens may carry another kind
+        assigned_by=int(current_user.sub) if current_user.sub.isdigit() else None,
         assigned_date=assign_data.assigned_date or datetime.utcnow(),
         notes=assign_data.notes
     )
@@ -111,7 +133,11 @@ async def return_asset(
         db.add(assignment)
 
     # 4. Update Asset
-    asset.status = "in_stock"
+    record_status_change(
+        db, asset, "in_stock",
+        reason=f"Returned by employee {asset.assigned_employee_id}",
+        changed_by=current_user.email or current_user.sub,
+    )
     asset.assigned_employee_id = None
     asset.updated_at = datetime.utcnow()
     
@@ -0,0 +1,123 @@
+"""
+Batch endpoint: several GET requests in one round trip
+
+The asset detail page needs the asset, its history, its maintenance log and
+the category configuration. POST /batch runs such sub-requests in-process
+against the API router, one after the other. The batch authenticates once,
+and its sub-requests reuse that identity (app.core.security.batch_identity).
+They also share one database session (app.db.session.shared_session), so a
+page costs one connection checkout and one commit instead of one per call.
+
+Sub-requests skip the HTTP middleware: they are not compressed on their own,
+and the batch response as a whole is. Admission still applies to each one
+(app.core.admission.admit_inner): it costs a token from the caller's rate
+bucket and counts against its route's concurrency limit. Each also runs
+under its own path's statement timeout rather than the batch's. Only GET is
+accepted, so the shared session only ever reads.
+"""
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app.core.admission import admit_inner, release_inner
+from app.core.config import settings
+from app.core.security import TokenData, batch_identity, get_current_user
+from app.db.session import get_db, shared_session
+from app.db.slow_queries import set_statement_timeout
+from app.schemas.batch import BatchRequest, BatchResponse, BatchSubRequest, BatchSubResponse
+
+router = APIRouter()
+
+API_PREFIX = "/api/v1/"
+BATCH_PATH = "/api/v1/batch"
+FORWARDED_HEADERS = (b"authorization", b"x-request-deadline")
+
+
+async def _dispatch(request: Request, db: AsyncSession, sub: BatchSubRequest) -> BatchSubResponse:
+    path, _, query = sub.path.partition("?")
+    if not path.startswith(API_PREFIX):
+        return BatchSubResponse(id=sub.id, status=status.HTTP_400_BAD_REQUEST, body={"detail": f"Path must start with {API_PREFIX}"})
+    if path.rstrip("/") == BATCH_PATH:
+        return BatchSubResponse(id=sub.id, status=status.HTTP_400_BAD_REQUEST, body={"detail": "Batches cannot be nested"})
+
+    # The batch's scope carries the app, exception handlers and exit stacks the routes rely on
+    scope = {
+        key: value for key, value in request.scope.items()
+        if key not in ("route", "endpoint", "path_params")
+    }
+    scope.update(
+        method=sub.method,
+        path=path,
+        raw_path=path.encode(),
+        query_string=query.encode(),
+        headers=[(k, v) for k, v in request.scope["headers"] if k in FORWARDED_HEADERS]
+        + [(b"accept", b"application/json")],
+    )
+    started, chunks = {}, []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            started.update(message)
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    rejection, prefix = admit_inner(scope)
+    if rejection is not None:
+        return BatchSubResponse(id=sub.id, status=rejection.status_code, body=json.loads(rejection.body))
+    try:
+        await set_statement_timeout(db, path)
+        await request.app.router(scope, receive, send)
+    except StarletteHTTPException as e:
+        # Raised by the router itself, e.g. 404 for an unknown path
+        return BatchSubResponse(id=sub.id, status=e.status_code, body={"detail": e.detail})
+    except Exception as e:
+        print(f"--- BATCH: {sub.method} {sub.path} FAILED: {e} ---")
+        return BatchSubResponse(id=sub.id, status=status.HTTP_500_INTERNAL_SERVER_ERROR, body={"detail": "Internal server error"})
+    finally:
+        release_inner(prefix)
+
+    body = b"".join(chunks)
+    content_type = dict(started.get("headers", [])).get(b"content-type", b"")
+    if body and content_type.startswith(b"application/json"):
+        payload = json.loads(body)
+    else:
+        payload = body.decode("utf-8", errors="replace") or None
+    return BatchSubResponse(id=sub.id, status=started.get("status", 500), body=payload)
+
+
+@router.post("", response_model=BatchResponse)
+async def run_batch(
+    batch: BatchRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """
+    Run up to BATCH_MAX_REQUESTS GET sub-requests with one identity and one
+    database session; responses come back in request order.
+    """
+    if len(batch.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BATCH_MAX_REQUESTS} sub-requests per batch",
+        )
+
+    identity_token = batch_identity.set(current_user)
+    session_token = shared_session.set(db)
+    try:
+        responses = []
+        for sub in batch.requests:
+            response = await _dispatch(request, db, sub)
+            if response.status >= 500:
+                # Leave the shared session usable for the remaining sub-requests
+                await db.rollback()
+            responses.append(response)
+    finally:
+        shared_session.reset(session_token)
+        batch_identity.reset(identity_token)
+    return BatchResponse(responses=responses)
@@ -1,15 +1,23 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.core.compression import PrecompressedCache
+from app.core.config import settings
 from app.db.session import get_db
 from app.models.category import AssetCategory
 from app.schemas.category import Category
 
 router = APIRouter()
 
+# Category configuration rarely changes: compress it once per version, not per request
+category_list = TypeAdapter(List[Category])
+precompressed = PrecompressedCache(minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
 @router.get("/", response_model=List[Category])
 async def read_categories(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
@@ -19,4 +27,7 @@ async def read_categories(
     """
     result = await db.execute(select(AssetCategory).offset(skip).limit(limit))
     categories = result.scalars().all()
-    return categories
+    if not settings.COMPRESSION_ENABLED:
+        return categories
+    payload = category_list.validate_python(categories, from_attributes=True)
+    return precompressed.response(request, category_list.dump_json(payload))
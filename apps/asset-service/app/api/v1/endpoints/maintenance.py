@@ -9,6 +9,7 @@ from datetime import datetime
 
 from app.db.session import get_db
 from app.models.asset import Asset, MaintenanceLog
+from app.repositories import maintenance_rows
 from app.schemas.maintenance import (
     MaintenanceLogCreate,
     MaintenanceLogResponse,
@@ -28,7 +29,7 @@ async def get_asset_maintenance_logs(
     Get all maintenance logs for a specific asset.
     """
     # Verify asset exists
-    asset_result = await db.execute(select(Asset).where(Asset.id == asset_id))
+    asset_result = await db.execute(select(Asset.id).where(Asset.id == asset_id))
     asset = asset_result.scalar_one_or_none()
     
     if not asset:
@@ -38,12 +39,12 @@ async def get_asset_maintenance_logs(
         )
     
     # Get maintenance logs
-    result = await db.execute(
-        select(MaintenanceLog)
+    logs = await maintenance_rows.all(
+        db,
+        maintenance_rows.select()
         .where(MaintenanceLog.asset_id == asset_id)
         .order_by(MaintenanceLog.performed_at.desc())
     )
-    logs = result.scalars().all()
     
     return logs
 
@@ -0,0 +1,47 @@
+"""
+Asset filters shared by the list and analytics endpoints
+"""
+from dataclasses import dataclass, astuple
+from typing import Optional
+
+from sqlalchemy import Select
+
+from app.models.asset import Asset
+
+
+@dataclass(frozen=True)
+class AssetFilters:
+    """Query parameters that narrow a set of assets (use as a dependency)"""
+    asset_type: Optional[str] = None
+    asset_class: Optional[str] = None
+    status: Optional[str] = None
+    assigned_employee_id: Optional[int] = None
+    search: Optional[str] = None
+
+    def key(self) -> tuple:
+        return astuple(self)
+
+    def apply(self, query: Select) -> Select:
+        if self.asset_type:
+            query = query.where(Asset.asset_type == self.asset_type)
+
+        if self.asset_class:
+            query = query.where(Asset.asset_class == self.asset_class)
+
+        if self.status:
+            query = query.where(Asset.status == self.status)
+
+        if self.assigned_employee_id is not None:
+            query = query.where(Asset.assigned_employee_id == self.assigned_employee_id)
+
+        if self.search:
+            search_filter = f"%{self.search}%"
+            query = query.where(
+                (Asset.asset_id.ilike(search_filter)) |
+                (Asset.serial_number.ilike(search_filter)) |
+                (Asset.model.ilike(search_filter)) |
+                (Asset.asset_type.ilike(search_filter)) |
+                (Asset.manufacturer.ilike(search_filter)) |
+                (Asset.asset_class.ilike(search_filter))
+            )
+        return query
@@ -41,6 +41,20 @@ try:
 except Exception as e:
     print(f"✗ Failed to register maintenance router: {e}")
 
+try:
+    from app.api.v1.endpoints import batch
+    router.include_router(batch.router, prefix="/batch", tags=["batch"])
+    print("✓ Batch router registered")
+except Exception as e:
+    print(f"✗ Failed to register batch router: {e}")
+
+try:
+    from app.api.v1.endpoints import admin
+    router.include_router(admin.router, prefix="/admin", tags=["admin"])
+    print("✓ Admin router registered")
+except Exception as e:
+    print(f"✗ Failed to register admin router: {e}")
+
 try:
     print("--- DEBUG: Attempting to import analytics module ---")
     from app.api.v1.endpoints import analytics
@@ -0,0 +1,53 @@
+"""
+Clients for the services asset-service depends on
+"""
+import time
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.service_client import ServiceUnavailable, register_client
+
+employee_service = register_client(
+    "employee-service",
+    settings.EMPLOYEE_SERVICE_URL,
+    timeout=settings.SERVICE_CALL_TIMEOUT_SECONDS,
+    retries=settings.SERVICE_CALL_RETRIES,
+    hedge_after=settings.SERVICE_HEDGE_AFTER_SECONDS,
+)
+
+
+class EmployeeDirectory:
+    """
+    Employee lookups against employee-service. Found employees are cached
+    briefly so repeated assignments to the same person skip the network.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache: Dict[int, Tuple[float, dict]] = {}
+
+    async def get(self, employee_id: int, authorization: str) -> Optional[dict]:
+        """The employee, or None if it does not exist; raises ServiceError when unreachable"""
+        cached = self._cache.get(employee_id)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        response = await employee_service.get(
+            f"/api/v1/employees/{employee_id}",
+            headers={"Authorization": authorization},
+        )
+        if response.status_code == 404:
+            self._cache.pop(employee_id, None)
+            return None
+        if response.status_code != 200:
+            raise ServiceUnavailable(f"employee-service returned {response.status_code}")
+
+        employee = response.json()
+        if len(self._cache) >= self.max_entries:
+            self._cache.clear()
+        self._cache[employee_id] = (time.monotonic() + self.ttl, employee)
+        return employee
+
+
+employee_directory = EmployeeDirectory(ttl=settings.EMPLOYEE_LOOKUP_CACHE_SECONDS)
@@ -0,0 +1,205 @@
+"""
+Admission control and load shedding
+
+When the database slows down, requests used to queue for up to
+pool_timeout seconds waiting for a connection while clients retried on top
+of them. AdmissionMiddleware turns requests away fast instead, before they
+touch the database:
+
+- 503 when the connection pool is exhausted and more requests are already
+  in flight than the pool can serve plus ADMISSION_MAX_POOL_WAITERS
+- 503 when a route prefix in ADMISSION_ROUTE_LIMITS already has that many
+  requests running
+- 429 when a user (JWT subject, or client address without a valid token)
+  has used up their token bucket of RATE_LIMIT_BURST requests, refilled at
+  RATE_LIMIT_PER_SECOND
+
+Every rejection carries Retry-After. Health and documentation paths are
+never limited. Requests served in-process without passing through the
+middleware (batch sub-requests) go through admit_inner instead.
+"""
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from jose import JWTError, jwt
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+
+EXEMPT_PATHS = ("/health", "/docs", "/redoc", "/openapi.json")
+
+# The installed middleware, for admission_stats()
+_active: Optional["AdmissionMiddleware"] = None
+
+
+class TokenBucket:
+    """`burst` tokens, refilled continuously at `rate` per second"""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, burst: float, now: float):
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, rate: float, burst: float, now: float) -> float:
+        """Take one token; returns 0 on success, otherwise seconds until one is available"""
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / rate
+
+
+class AdmissionMiddleware:
+    """ASGI middleware rejecting requests the service cannot serve in time"""
+
+    def __init__(
+        self,
+        app,
+        pool_status: Callable[[], Dict[str, int]],
+        pool_capacity: int,
+        max_pool_waiters: int = 20,
+        route_limits: Optional[Dict[str, int]] = None,
+        rate: float = 0.0,
+        burst: int = 0,
+        retry_after: int = 1,
+        max_users: int = 10000,
+    ):
+        self.app = app
+        self.pool_status = pool_status
+        self.pool_capacity = pool_capacity
+        self.max_pool_waiters = max_pool_waiters
+        # Longest prefix first, so /api/v1/invoices/bulk wins over /api/v1/invoices
+        self.route_limits = sorted((route_limits or {}).items(), key=lambda item: -len(item[0]))
+        self.rate = rate
+        self.burst = burst
+        self.retry_after = retry_after
+        self.max_users = max_users
+        self.in_flight = 0
+        self.route_in_flight: Dict[str, int] = {prefix: 0 for prefix, _ in self.route_limits}
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        # Verified token -> subject, so each token is decoded once rather than per request
+        self._subjects: "OrderedDict[str, str]" = OrderedDict()
+        self.rejected = {"pool": 0, "route": 0, "rate": 0}
+        global _active
+        _active = self
+
+    def _user_key(self, scope) -> str:
+        authorization = Headers(scope=scope).get("authorization", "")
+        token = authorization[7:] if authorization[:7].lower() == "bearer " else ""
+        if token:
+            subject = self._subjects.get(token)
+            if subject is None:
+                try:
+                    payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+                    subject = f"user:{payload.get('sub', '')}"
+                except JWTError:
+                    subject = ""
+                self._subjects[token] = subject
+                if len(self._subjects) > self.max_users:
+                    self._subjects.popitem(last=False)
+            if subject:
+                return subject
+        client = scope.get("client")
+        return f"addr:{client[0]}" if client else "addr:unknown"
+
+    def _rate_limited(self, scope) -> float:
+        now = time.monotonic()
+        key = self._user_key(scope)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(self.burst, now)
+            if len(self.buckets) > self.max_users:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+        return bucket.take(self.rate, self.burst, now)
+
+    def _pool_saturated(self) -> bool:
+        if self.in_flight < self.pool_capacity + self.max_pool_waiters:
+            return False
+        return self.pool_status()["checked_out"] >= self.pool_capacity
+
+    def _route(self, path: str) -> Tuple[Optional[str], int]:
+        for prefix, limit in self.route_limits:
+            if path.startswith(prefix):
+                return prefix, limit
+        return None, 0
+
+    def _reject(self, reason: str, status_code: int, detail: str, retry_after: float):
+        self.rejected[reason] += 1
+        return JSONResponse(
+            {"detail": detail},
+            status_code=status_code,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    def admit(self, scope, check_pool: bool = True) -> Tuple[Optional[JSONResponse], Optional[str]]:
+        """
+        Charge the user's bucket and take a slot of the route's limit.
+        Returns (rejection, None), or (None, prefix) where a non-None prefix
+        must be handed back to release() when the request is done.
+        """
+        if self.rate > 0:
+            wait = self._rate_limited(scope)
+            if wait:
+                return self._reject("rate", 429, "Rate limit exceeded", wait), None
+        prefix, limit = self._route(scope["path"])
+        if prefix is not None and self.route_in_flight[prefix] >= limit:
+            return self._reject("route", 503, "Too many concurrent requests for this endpoint", self.retry_after), None
+        if check_pool and self._pool_saturated():
+            return self._reject("pool", 503, "Service overloaded, retry shortly", self.retry_after), None
+        if prefix is not None:
+            self.route_in_flight[prefix] += 1
+        return None, prefix
+
+    def release(self, prefix: Optional[str]) -> None:
+        if prefix is not None:
+            self.route_in_flight[prefix] -= 1
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PATHS):
+            return await self.app(scope, receive, send)
+
+        rejection, prefix = self.admit(scope)
+        if rejection is not None:
+            return await rejection(scope, receive, send)
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+            self.release(prefix)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "in_flight": self.in_flight,
+            "routes_in_flight": dict(self.route_in_flight),
+            "rejected": dict(self.rejected),
+        }
+
+
+def admit_inner(scope) -> Tuple[Optional[JSONResponse], Optional[str]]:
+    """
+    Admission for a request served in-process without the middleware (batch
+    sub-requests): its user's rate bucket and its route's limit apply, while
+    the pool slot is the one its outer request already holds
+    """
+    if _active is None or scope["path"].startswith(EXEMPT_PATHS):
+        return None, None
+    return _active.admit(scope, check_pool=False)
+
+
+def release_inner(prefix: Optional[str]) -> None:
+    if _active is not None:
+        _active.release(prefix)
+
+
+def admission_stats() -> Dict[str, object]:
+    """In-flight and rejected request counts, for /health"""
+    return _active.stats() if _active is not None else {}
@@ -0,0 +1,183 @@
+"""
+Response compression
+
+CompressionMiddleware compresses response bodies with Brotli or gzip, as the
+client's Accept-Encoding prefers. Brotli is only offered when the brotli
+package is installed. Bodies below a size threshold, types that do not
+compress (images, PDFs, archives) and responses that already carry a
+Content-Encoding are passed through untouched. Streaming responses are
+compressed chunk by chunk, with a flush after every chunk so that clients
+still receive each part as soon as it is sent.
+
+PrecompressedCache is for payloads that rarely change, such as category
+configuration. It compresses each distinct body once per encoding at the
+highest level, serves it with an ETag and answers If-None-Match with 304.
+The middleware leaves these responses alone because they already carry a
+Content-Encoding.
+"""
+import hashlib
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/xml", "application/javascript", "image/svg+xml")
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header, or None for identity"""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    wildcard = weights.get("*", 0.0)
+    candidates = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_q = None, 0.0
+    for name in candidates:
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return zlib.compress(data, level, wbits=31)
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=level)
+        else:
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses of at least `minimum_size` bytes"""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        level = self.levels[encoding]
+        start = None
+        stream: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, stream, passthrough
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether to compress
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                return await send(message)
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if stream is None:
+                headers = MutableHeaders(raw=start["headers"])
+                if (
+                    start["status"] in (204, 304)
+                    or not compressible(headers)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start)
+                    return await send(message)
+
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body:
+                    body = compress(body, encoding, level)
+                    headers["Content-Length"] = str(len(body))
+                    await send({**start, "headers": headers.raw})
+                    return await send({"type": "http.response.body", "body": body})
+
+                del headers["Content-Length"]
+                stream = _StreamCompressor(encoding, level)
+                await send({**start, "headers": headers.raw})
+
+            data = stream.chunk(body) if body else b""
+            if not more_body:
+                data += stream.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+class PrecompressedCache:
+    """Compressed variants of rarely changing payloads, keyed by a hash of the body"""
+
+    def __init__(self, max_entries: int = 16, minimum_size: int = 1024):
+        self.max_entries = max_entries
+        self.minimum_size = minimum_size
+        self._entries: "OrderedDict[str, Dict[str, bytes]]" = OrderedDict()
+
+    def response(self, request: Request, body: bytes, media_type: str = "application/json") -> Response:
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        if encoding is None or len(body) < self.minimum_size:
+            return Response(body, media_type=media_type, headers=headers)
+
+        variants = self._entries.get(etag)
+        if variants is None:
+            variants = self._entries[etag] = {}
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(etag)
+        if encoding not in variants:
+            variants[encoding] = compress(body, encoding, 11 if encoding == "br" else 9)
+        return Response(variants[encoding], media_type=media_type, headers={**headers, "Content-Encoding": encoding})
@@ -0,0 +1,319 @@
+"""
+Request profiling
+
+Admins profile a single request by sending X-Profile: 1 or adding
+?profile=1. While a profiled request runs, a SIGPROF timer samples the
+Python stack every PROFILE_INTERVAL_MS of CPU time. The signal handler runs
+in the context of whatever was interrupted, so a context variable tells it
+which request a sample belongs to, and concurrent requests on the event
+loop do not blur together. A profile splits the request's wall time into:
+
+- db: time waiting on the database driver, from the cursor execute hooks
+- serialization: CPU samples inside model validation, response rendering
+  and compression
+- cpu: all other CPU samples
+- other: the remainder (other tasks on the loop, the network, pool waits)
+
+Profiles are kept in memory (the PROFILE_STORE_SIZE most recent). A
+requested profile's id and timings come back in the X-Profile-Id and
+Server-Timing headers, and GET /api/v1/admin/profiles/{id}?format=folded
+serves its stacks in the folded format read by flamegraph.pl, speedscope
+and inferno. PROFILE_SAMPLE_EVERY also profiles every Nth request, without
+adding headers, to keep a low-overhead sample of production traffic.
+
+Sampling needs SIGPROF and the event loop on the main thread, as under
+uvicorn. Elsewhere, profiles still carry the db and total timings but no
+stacks.
+"""
+import itertools
+import os
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from fastapi import HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.routes import route_template
+from app.core.security import get_current_user, require_roles
+
+PROFILE_HEADER = "x-profile"
+
+# Samples inside these functions count as serialization
+SERIALIZATION_FUNCTIONS = frozenset({
+    "serialize_response",
+    "jsonable_encoder",
+    "JSONResponse.render",
+    "PydanticJSONResponse.render",
+    "BaseModel.model_dump",
+    "BaseModel.model_dump_json",
+    "BaseModel.model_validate",
+    "ReadModel.to_models",
+    "compress",
+    "_StreamCompressor.chunk",
+})
+
+current_profile: ContextVar[Optional["Profile"]] = ContextVar("current_profile", default=None)
+
+_labels: Dict[Any, str] = {}
+
+
+def _label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        label = _labels[code] = (
+            f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+        )
+    return label
+
+
+class Profile:
+    """Stack samples and timings for one request"""
+
+    def __init__(self, id: str, method: str, path: str, trigger: str, interval_ms: float, anchor):
+        self.id = id
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.status: Optional[int] = None
+        self.trigger = trigger
+        self.interval_ms = interval_ms
+        self.at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+        self.total_ms: Optional[float] = None
+        # The middleware's frame: stacks are cut there so they start at the request
+        self.anchor = anchor
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self.serialization_samples = 0
+        self.db_ms = 0.0
+        self.db_statements = 0
+
+    def sample(self, frame) -> None:
+        labels: List[str] = []
+        serialization = False
+        # Frames running in SQLAlchemy's greenlet do not link back to the anchor;
+        # those stacks end at the greenlet instead
+        while frame is not None and frame is not self.anchor:
+            if frame.f_code.co_qualname in SERIALIZATION_FUNCTIONS:
+                serialization = True
+            labels.append(_label(frame.f_code))
+            frame = frame.f_back
+        stack = ";".join(reversed(labels))
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.samples += 1
+        self.serialization_samples += serialization
+
+    def finish(self, scope) -> None:
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+        self.route = route_template(scope)
+        self.anchor = None
+
+    def timings(self) -> Dict[str, float]:
+        total = self.total_ms if self.total_ms is not None else (time.perf_counter() - self.started) * 1000
+        serialization = self.serialization_samples * self.interval_ms
+        cpu = (self.samples - self.serialization_samples) * self.interval_ms
+        return {
+            "total_ms": round(total, 1),
+            "db_ms": round(self.db_ms, 1),
+            "serialization_ms": round(serialization, 1),
+            "cpu_ms": round(cpu, 1),
+            "other_ms": round(max(0.0, total - self.db_ms - serialization - cpu), 1),
+        }
+
+    def server_timing(self) -> str:
+        timings = self.timings()
+        return ", ".join(f"{name};dur={timings[f'{name}_ms']}" for name in ("db", "serialization", "cpu", "total"))
+
+    def folded(self) -> str:
+        """Stacks as "root;frame;frame count" lines, with database waits as a [db wait] frame"""
+        root = f"{self.method} {self.route or self.path}".replace(";", ",")
+        lines = [f"{root};{stack} {count}" if stack else f"{root} {count}" for stack, count in self.stacks.items()]
+        db_samples = round(self.db_ms / self.interval_ms)
+        if db_samples:
+            lines.append(f"{root};[db wait] {db_samples}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self, stacks: bool = False) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "trigger": self.trigger,
+            "at": self.at,
+            "db_statements": self.db_statements,
+            "samples": self.samples,
+            "interval_ms": self.interval_ms,
+            **self.timings(),
+        }
+        if stacks:
+            data["stacks"] = dict(self.stacks)
+        return data
+
+
+class ProfileStore:
+    """The most recent profiles, oldest dropped first"""
+
+    def __init__(self, size: int):
+        self.profiles: Deque[Profile] = deque(maxlen=size)
+
+    def add(self, profile: Profile) -> None:
+        self.profiles.append(profile)
+
+    def get(self, id: str) -> Profile:
+        for profile in self.profiles:
+            if profile.id == id:
+                return profile
+        raise LookupError(f"Profile {id} not found")
+
+    def list(self, route: Optional[str] = None, limit: int = 50) -> List[Profile]:
+        found = [
+            profile for profile in reversed(self.profiles)
+            if route is None or (profile.route or profile.path).startswith(route)
+        ]
+        return found[:limit]
+
+
+profiles = ProfileStore(settings.PROFILE_STORE_SIZE)
+
+
+class _Sampler:
+    """Process-wide SIGPROF timer, running while any profile is active"""
+
+    def __init__(self):
+        self.installed = False
+        self.interval = 0.0
+        self.active = 0
+
+    def install(self, interval_ms: float) -> bool:
+        if not self.installed:
+            if not hasattr(signal, "SIGPROF") or threading.current_thread() is not threading.main_thread():
+                return False
+            signal.signal(signal.SIGPROF, self._handle)
+            self.installed = True
+        self.interval = interval_ms / 1000
+        return True
+
+    @staticmethod
+    def _handle(signum, frame):
+        profile = current_profile.get()
+        if profile is not None and frame is not None:
+            profile.sample(frame)
+
+    def start(self) -> None:
+        self.active += 1
+        if self.active == 1:
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self) -> None:
+        self.active -= 1
+        if self.active == 0:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+
+
+_sampler = _Sampler()
+
+
+async def _require_admin(headers: Headers) -> None:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    user = await get_current_user(HTTPAuthorizationCredentials(scheme=scheme, credentials=token))
+    await require_roles(["admin"])(user)
+
+
+def _flag(value: Optional[str]) -> bool:
+    return value is not None and value.lower() in ("1", "true", "yes")
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests that ask for it, and every Nth request"""
+
+    def __init__(self, app, interval_ms: float = 5.0, sample_every: int = 0):
+        self.app = app
+        self.interval_ms = interval_ms
+        self.sample_every = sample_every
+        self.sampling = _sampler.install(interval_ms)
+        self._requests = itertools.count(1)
+        self._ids = itertools.count(1)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = Headers(scope=scope)
+        requested = _flag(headers.get(PROFILE_HEADER)) or _flag(QueryParams(scope["query_string"]).get("profile"))
+        if not requested and not (self.sample_every and next(self._requests) % self.sample_every == 0):
+            return await self.app(scope, receive, send)
+
+        if requested:
+            try:
+                await _require_admin(headers)
+            except HTTPException as e:
+                response = JSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)
+                return await response(scope, receive, send)
+
+        profile = Profile(
+            str(next(self._ids)),
+            scope["method"],
+            scope["path"],
+            "requested" if requested else "sampled",
+            self.interval_ms,
+            sys._getframe(),
+        )
+
+        async def send_profiled(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                if requested:
+                    response_headers = MutableHeaders(scope=message)
+                    response_headers["X-Profile-Id"] = profile.id
+                    response_headers.append("Server-Timing", profile.server_timing())
+            await send(message)
+
+        token = current_profile.set(profile)
+        if self.sampling:
+            _sampler.start()
+        try:
+            await self.app(scope, receive, send_profiled)
+        finally:
+            if self.sampling:
+                _sampler.stop()
+            current_profile.reset(token)
+            profile.finish(scope)
+            profiles.add(profile)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and current_profile.get() is not None:
+        context.profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "profile_started", None)
+    profile = current_profile.get()
+    if started is not None and profile is not None:
+        profile.db_ms += (time.perf_counter() - started) * 1000
+        profile.db_statements += 1
+
+
+def _handle_error(exception_context):
+    _after_cursor_execute(None, None, None, None, exception_context.execution_context, False)
+
+
+def install(engine) -> None:
+    """Register the database timing hooks on an (async) engine"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
@@ -0,0 +1,20 @@
+"""
+Route templates, for labelling requests in the slow-query log and profiles
+"""
+from typing import Any, MutableMapping
+
+
+def route_template(scope: MutableMapping[str, Any]) -> str:
+    """The request path with its path parameters put back, e.g. /api/v1/assets/{id}
+
+    Rebuilt from path_params because scope["route"].path is relative to its
+    router in newer FastAPI versions.
+    """
+    segments = scope["path"].split("/")
+    for name, value in scope.get("path_params", {}).items():
+        value = str(value)
+        for index in range(len(segments) - 1, 0, -1):
+            if segments[index] == value:
+                segments[index] = "{" + name + "}"
+                break
+    return "/".join(segments)
@@ -5,6 +5,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
 from pydantic import BaseModel
+from contextvars import ContextVar
 from typing import List, Optional
 
 from app.core.config import settings
@@ -17,10 +18,16 @@ class TokenData(BaseModel):
     email: Optional[str] = None
     roles: List[str] = []
 
+# Set by POST /batch: its sub-requests reuse the identity the batch authenticated
+batch_identity: ContextVar[Optional[TokenData]] = ContextVar("batch_identity", default=None)
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> TokenData:
     """Extract and validate JWT token from request"""
+    identity = batch_identity.get()
+    if identity is not None:
+        return identity
     token = credentials.credentials
     
     try:
@@ -0,0 +1,175 @@
+"""
+Per-request query statistics and N+1 detection
+
+QueryStatsMiddleware gives each request a QueryStats that the cursor hooks
+fill in: statements executed, rows returned or affected (as the driver
+reports them; asyncpg reports SELECT row counts too), time spent in the
+driver, and how often each distinct SQL string ran. The same SQL running
+N_PLUS_ONE_THRESHOLD times or more in one request is the signature of an
+N+1 loop.
+
+With DEBUG on, responses carry X-DB-Queries, X-DB-Rows and X-DB-Time-Ms,
+plus X-DB-Repeated naming the most repeated statement when one crosses the
+threshold. Totals per route are reported by /health.
+
+Tests pin an endpoint's query count with assert_query_budget, which fails
+when the block issues more statements than allowed:
+
+    with assert_query_budget(2, max_repeats=1):
+        response = await client.get("/api/v1/assets")
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+from app.core.routes import route_template
+
+
+class QueryStats:
+    """Statements, rows and driver time for one request or test block"""
+
+    __slots__ = ("statements", "rows", "db_ms", "by_sql")
+
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+        self.db_ms = 0.0
+        self.by_sql: Dict[str, int] = {}
+
+    def add(self, statement: str, rows: int, ms: float) -> None:
+        self.statements += 1
+        self.rows += rows
+        self.db_ms += ms
+        self.by_sql[statement] = self.by_sql.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        """Statements that ran at least `threshold` times, most repeated first"""
+        found = [(sql, count) for sql, count in self.by_sql.items() if count >= threshold]
+        return dict(sorted(found, key=lambda item: -item[1]))
+
+
+current_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_stats", default=None)
+
+# Open assert_query_budget blocks; global so that they also see requests a
+# test client runs on another thread
+_recorders: List[QueryStats] = []
+
+# Route template -> totals, for /health
+_routes: Dict[str, Dict[str, Any]] = {}
+
+
+def _targets() -> List[QueryStats]:
+    stats = current_stats.get()
+    return _recorders + [stats] if stats is not None else _recorders
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and (_recorders or current_stats.get() is not None):
+        context.query_stats_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "query_stats_started", None)
+    if started is None:
+        return
+    ms = (time.perf_counter() - started) * 1000
+    rows = cursor.rowcount if cursor is not None and cursor.rowcount > 0 else 0
+    for stats in _targets():
+        stats.add(statement, rows, ms)
+
+
+def _handle_error(exception_context):
+    _after_cursor_execute(
+        None, None, exception_context.statement, None, exception_context.execution_context, False
+    )
+
+
+def install(engine) -> None:
+    """Register the counting hooks on an (async) engine"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def _record_route(route: str, stats: QueryStats, repeated: bool) -> None:
+    totals = _routes.get(route)
+    if totals is None:
+        totals = _routes[route] = {
+            "requests": 0, "statements": 0, "max_statements": 0, "rows": 0, "db_ms": 0.0, "n_plus_one": 0,
+        }
+    totals["requests"] += 1
+    totals["statements"] += stats.statements
+    totals["max_statements"] = max(totals["max_statements"], stats.statements)
+    totals["rows"] += stats.rows
+    totals["db_ms"] += stats.db_ms
+    totals["n_plus_one"] += repeated
+
+
+def query_metrics() -> Dict[str, Dict[str, Any]]:
+    """Statement, row and driver time totals per route, for /health"""
+    return {
+        route: {
+            **totals,
+            "db_ms": round(totals["db_ms"], 1),
+            "statements_per_request": round(totals["statements"] / totals["requests"], 2),
+        }
+        for route, totals in sorted(_routes.items())
+    }
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware collecting QueryStats per request, optionally as response headers"""
+
+    def __init__(self, app, headers: bool = False, repeat_threshold: int = 5):
+        self.app = app
+        self.headers = headers
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        stats = QueryStats()
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start" and self.headers:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(stats.statements)
+                headers["X-DB-Rows"] = str(stats.rows)
+                headers["X-DB-Time-Ms"] = f"{stats.db_ms:.1f}"
+                for sql, count in stats.repeated(self.repeat_threshold).items():
+                    headers["X-DB-Repeated"] = f"{count}x {' '.join(sql.split())[:200]}"
+                    break
+            await send(message)
+
+        token = current_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            current_stats.reset(token)
+            # Only matched routes, so unknown paths cannot grow the table
+            if scope.get("route") is not None:
+                _record_route(route_template(scope), stats, bool(stats.repeated(self.repeat_threshold)))
+
+
+@contextmanager
+def assert_query_budget(max_statements: int, max_repeats: Optional[int] = None) -> Iterator[QueryStats]:
+    """Fail if the block runs more than max_statements statements, or one statement more than max_repeats times"""
+    stats = QueryStats()
+    _recorders.append(stats)
+    try:
+        yield stats
+    finally:
+        _recorders.remove(stats)
+    problems = []
+    if stats.statements > max_statements:
+        problems.append(f"{stats.statements} statements, budget is {max_statements}")
+    if max_repeats is not None and stats.repeated(max_repeats + 1):
+        problems.append(f"a statement ran more than {max_repeats} times")
+    if problems:
+        listing = "\n".join(f"  {count}x {' '.join(sql.split())}" for sql, count in stats.by_sql.items())
+        raise AssertionError(f"Query budget exceeded: {'; '.join(problems)}\n{listing}")
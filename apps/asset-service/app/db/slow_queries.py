@@ -0,0 +1,235 @@
+"""
+Statement timeouts and slow-query capture
+
+get_db gives each request's transactions a statement_timeout taken from
+STATEMENT_TIMEOUTS (longest matching path prefix) or STATEMENT_TIMEOUT_MS,
+so a pathological search or analytics query is cancelled by Postgres
+instead of holding its connection indefinitely.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS, and statements cancelled by
+their timeout, are kept in an in-memory ring buffer with the SQL, the shape
+of the bind parameters (types and list lengths, never values), the duration
+and the route that issued them. A sample of slow SELECTs
+(SLOW_QUERY_EXPLAIN_SAMPLE_RATE) is re-run under EXPLAIN (ANALYZE, BUFFERS)
+inside a savepoint and the plan kept with the entry. ANALYZE executes the
+statement again, so one that would change state a rollback cannot undo
+(nextval, advisory locks) or take row locks (FOR UPDATE) is only planned,
+under plain EXPLAIN. GET
+/api/v1/admin/slow-queries reports the buffer grouped by statement.
+"""
+import json
+import random
+import re
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# SQLSTATE for "canceling statement due to statement timeout"
+QUERY_CANCELED = "57014"
+
+_TIMEOUTS = sorted(settings.STATEMENT_TIMEOUTS.items(), key=lambda item: -len(item[0]))
+
+
+def statement_timeout_ms(path: str) -> int:
+    """Timeout for statements issued while serving `path`; 0 means none"""
+    for prefix, timeout in _TIMEOUTS:
+        if path.startswith(prefix):
+            return timeout
+    return settings.STATEMENT_TIMEOUT_MS
+
+
+async def set_statement_timeout(session, path: str) -> None:
+    """Give an open session the timeout of `path`, e.g. for each sub-request of a batch sharing it"""
+    timeout = statement_timeout_ms(path)
+    session.info["statement_timeout_ms"] = timeout
+    if session.in_transaction():
+        connection = await session.connection()
+        if connection.dialect.name == "postgresql":
+            await connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
+
+
+# Statements that must not be executed a second time by EXPLAIN ANALYZE:
+# sequences and advisory locks survive the savepoint rollback, row locks
+# would be held until the caller's transaction ends
+_SIDE_EFFECTS = re.compile(
+    r"\b(nextval|setval|pg_advisory\w*|for\s+(no\s+key\s+)?update|for\s+(key\s+)?share|insert|update|delete)\b",
+    re.IGNORECASE,
+)
+
+
+def has_side_effects(statement: str) -> bool:
+    """Whether re-running `statement` could change state or take locks"""
+    return _SIDE_EFFECTS.search(statement) is not None
+
+
+def _value_shape(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Bind parameter types, without their values"""
+    if executemany:
+        rows = list(parameters)
+        return {"rows": len(rows), "row": parameter_shape(rows[0]) if rows else None}
+    if parameters is None:
+        return None
+    if isinstance(parameters, dict):
+        return {name: _value_shape(value) for name, value in parameters.items()}
+    return [_value_shape(value) for value in parameters]
+
+
+class SlowQueryLog:
+    """The most recent slow statements, oldest dropped first"""
+
+    def __init__(self, size: int):
+        self.entries: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self.recorded = 0
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        self.entries.append(entry)
+        self.recorded += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.recorded = 0
+
+    def report(self, route: Optional[str] = None, min_ms: float = 0.0, limit: int = 20) -> Dict[str, Any]:
+        """Entries grouped by SQL, the most total time first, plus the latest entries"""
+        entries = [
+            entry for entry in self.entries
+            if entry["duration_ms"] >= min_ms and (route is None or (entry["route"] or "").startswith(route))
+        ]
+        statements: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            stats = statements.get(entry["sql"])
+            if stats is None:
+                stats = statements[entry["sql"]] = {
+                    "sql": entry["sql"],
+                    "calls": 0,
+                    "timeouts": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "routes": [],
+                    "parameters": entry["parameters"],
+                    "last_seen": entry["at"],
+                    "plan": None,
+                }
+            stats["calls"] += 1
+            stats["timeouts"] += entry["timed_out"]
+            stats["total_ms"] += entry["duration_ms"]
+            stats["max_ms"] = max(stats["max_ms"], entry["duration_ms"])
+            if entry["route"] and entry["route"] not in stats["routes"]:
+                stats["routes"].append(entry["route"])
+            stats["parameters"] = entry["parameters"]
+            stats["last_seen"] = entry["at"]
+            if entry["plan"] is not None:
+                stats["plan"] = entry["plan"]
+        ranked = sorted(statements.values(), key=lambda stats: -stats["total_ms"])[:limit]
+        for stats in ranked:
+            stats["total_ms"] = round(stats["total_ms"], 1)
+            stats["mean_ms"] = round(stats["total_ms"] / stats["calls"], 1)
+        return {
+            "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+            "recorded": self.recorded,
+            "retained": len(self.entries),
+            "statements": ranked,
+            "recent": entries[-limit:][::-1],
+        }
+
+
+slow_queries = SlowQueryLog(settings.SLOW_QUERY_LOG_SIZE)
+
+
+def _explain(conn, statement: str, parameters: Any) -> Any:
+    """
+    EXPLAIN on the caller's connection, isolated by a savepoint; with ANALYZE
+    and BUFFERS unless the statement has side effects
+    """
+    options = "FORMAT JSON" if has_side_effects(statement) else "ANALYZE, BUFFERS, FORMAT JSON"
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN ({options}) " + statement, parameters)
+            plan = cursor.fetchone()[0]
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return {"error": str(e)}
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return json.loads(plan) if isinstance(plan, str) else plan
+    finally:
+        cursor.close()
+
+
+def _record(conn, context, statement: str, parameters: Any, executemany: bool, timed_out: bool) -> None:
+    duration_ms = (time.perf_counter() - context.slow_query_started) * 1000
+    plan = None
+    if (
+        not timed_out
+        and not executemany
+        and conn.dialect.name == "postgresql"
+        and statement.lstrip()[:6].upper() == "SELECT"
+        and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+    ):
+        plan = _explain(conn, statement, parameters)
+    slow_queries.record({
+        "sql": statement,
+        "route": conn.info.get("route"),
+        "parameters": parameter_shape(parameters, executemany),
+        "duration_ms": round(duration_ms, 1),
+        "timed_out": timed_out,
+        "at": datetime.now(timezone.utc),
+        "plan": plan,
+    })
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.slow_query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "slow_query_started", None)
+    if started is not None and (time.perf_counter() - started) * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        _record(conn, context, statement, parameters, executemany, timed_out=False)
+
+
+def _handle_error(exception_context):
+    context = exception_context.execution_context
+    if (
+        getattr(context, "slow_query_started", None) is not None
+        and getattr(exception_context.original_exception, "sqlstate", None) == QUERY_CANCELED
+    ):
+        _record(
+            exception_context.connection,
+            context,
+            exception_context.statement,
+            exception_context.parameters,
+            context.executemany,
+            timed_out=True,
+        )
+
+
+def _after_begin(session, transaction, connection):
+    # The route labels slow-query entries; cleared for sessions outside a request
+    connection.info["route"] = session.info.get("route")
+    timeout = session.info.get("statement_timeout_ms")
+    if timeout and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
+
+
+def install(engine) -> None:
+    """Register the timing hooks on an (async) engine and its sessions"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+    event.listen(Session, "after_begin", _after_begin)
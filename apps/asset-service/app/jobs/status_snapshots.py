@@ -0,0 +1,181 @@
+"""
+Daily asset status snapshots
+
+Fills assets.asset_status_daily with the number of assets in each status at
+the end of each UTC day. A day is computed by replaying status events: an
+asset's status at a moment T is the from_status of its first event after T,
+or its current status if nothing happened to it since. Only events from the
+first requested day onwards are read, so the nightly run touches one day of
+history plus the assets table, and a full backfill is a single pass.
+
+Status events come from assets.asset_status_history, which the asset
+update, assign and return endpoints write in the same transaction as the
+change (record_status_change), and from the assets.asset_history audit
+trail that AssetService writes: assigned / unassigned entries, and the
+status_changed entries that record a status ("Status changed: a -> b" from
+change_status, a "status: a -> b" part of an update_asset edit, and the
+soft delete, which disposes of the asset). Edits of other fields are
+status_changed entries too but carry no status and are skipped. Deletes and
+assignments do not say what the asset was before; that comes from its
+previous event.
+
+Usage:
+    python -m app.jobs.status_snapshots                     # catch up to yesterday
+    python -m app.jobs.status_snapshots --backfill-days 365 # rebuild the last year
+"""
+import argparse
+import asyncio
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func, select, text
+
+from app.db.session import AsyncSessionLocal, engine
+from app.models.analytics import AssetStatusDaily
+
+# Status changes in asset_history details, as AssetService writes them:
+# "Status changed: a -> b (Reason: ...)" and "...; status: a -> b; ...".
+# Plain enough for both Postgres and Python regular expressions.
+STATUS_FROM_PATTERN = r"(?:^Status changed|(?:^|; )status): (\S+) -> "
+STATUS_TO_PATTERN = r"(?:^Status changed|(?:^|; )status): \S+ -> ([^;\s]+)"
+# AssetService.delete_asset's entry; the asset is now disposed
+DISPOSED_DETAILS = "Asset disposed/deleted"
+
+REPLAY_SQL = text(r"""
+INSERT INTO assets.asset_status_daily (day, status, asset_count)
+WITH audit AS (
+    SELECT
+        asset_id,
+        event_time AS at,
+        -- An assignment entry does not say what the asset was before
+        CASE upper(event_type::text)
+            WHEN 'ASSIGNED' THEN NULL
+            WHEN 'UNASSIGNED' THEN 'assigned'
+            ELSE substring(details FROM CAST(:status_from_pattern AS text))
+        END AS from_status,
+        CASE
+            WHEN upper(event_type::text) = 'ASSIGNED' THEN 'assigned'
+            -- AssetService.unassign_asset makes the asset active again
+            WHEN upper(event_type::text) = 'UNASSIGNED' THEN 'active'
+            WHEN details = CAST(:disposed_details AS text) THEN 'disposed'
+            ELSE substring(details FROM CAST(:status_to_pattern AS text))
+        END AS to_status
+    FROM assets.asset_history
+    WHERE event_time >= CAST(:first_day AS date)
+      AND upper(event_type::text) IN ('ASSIGNED', 'UNASSIGNED', 'STATUS_CHANGED')
+),
+events AS (
+    SELECT asset_id, changed_at AS at, from_status, to_status
+    FROM assets.asset_status_history
+    WHERE changed_at >= CAST(:first_day AS date)
+    UNION ALL
+    -- Edits that did not touch the status are not status events
+    SELECT asset_id, at, from_status, to_status
+    FROM audit
+    WHERE to_status IS NOT NULL
+),
+intervals AS (
+    -- Each event closes the interval in which the asset had its from_status
+    -- (or, when the event does not name it, the previous event's to_status)
+    SELECT
+        e.asset_id,
+        coalesce(lag(e.at) OVER w, a.created_at) AS valid_from,
+        e.at AS valid_to,
+        coalesce(e.from_status, lag(e.to_status) OVER w) AS status
+    FROM events e
+    JOIN assets.assets a ON a.id = e.asset_id
+    WINDOW w AS (PARTITION BY e.asset_id ORDER BY e.at)
+    UNION ALL
+    -- After its last event an asset has its current status
+    SELECT a.id, coalesce(max(e.at), a.created_at), NULL, a.status
+    FROM assets.assets a
+    LEFT JOIN events e ON e.asset_id = a.id
+    GROUP BY a.id
+),
+days AS (
+    SELECT CAST(d AS date) AS day
+    FROM generate_series(CAST(:first_day AS date), CAST(:last_day AS date), interval '1 day') d
+)
+SELECT days.day, i.status, count(*)
+FROM days
+JOIN intervals i
+  ON i.valid_from < days.day + 1
+ AND (i.valid_to IS NULL OR i.valid_to >= days.day + 1)
+WHERE i.status IS NOT NULL
+GROUP BY days.day, i.status
+""")
+
+
+def _yesterday() -> date:
+    return datetime.utcnow().date() - timedelta(days=1)
+
+
+async def snapshot_days(first_day: date, last_day: date) -> int:
+    """(Re)compute the snapshots for first_day..last_day in one transaction; returns rows written"""
+    if first_day > last_day:
+        return 0
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            delete(AssetStatusDaily)
+            .where(AssetStatusDaily.day >= first_day)
+            .where(AssetStatusDaily.day <= last_day)
+        )
+        result = await db.execute(REPLAY_SQL, {
+            "first_day": first_day,
+            "last_day": last_day,
+            "status_from_pattern": STATUS_FROM_PATTERN,
+            "status_to_pattern": STATUS_TO_PATTERN,
+            "disposed_details": DISPOSED_DETAILS,
+        })
+        await db.commit()
+    return result.rowcount
+
+
+async def catch_up(backfill_days: Optional[int] = None) -> int:
+    """
+    Snapshot every day after the latest stored one, up to yesterday.
+    With backfill_days, rebuild that many days instead.
+    """
+    last_day = _yesterday()
+    if backfill_days:
+        first_day = last_day - timedelta(days=backfill_days - 1)
+    else:
+        async with AsyncSessionLocal() as db:
+            latest = (await db.execute(select(func.max(AssetStatusDaily.day)))).scalar()
+        first_day = latest + timedelta(days=1) if latest else last_day
+    return await snapshot_days(first_day, last_day)
+
+
+async def run_nightly(at: time) -> None:
+    """Background loop used by the service lifespan: catch up now, then daily at `at` (UTC)"""
+    while True:
+        try:
+            written = await catch_up()
+            if written:
+                print(f"--- SNAPSHOT: wrote {written} asset status row(s) ---")
+        except Exception as e:
+            print(f"--- SNAPSHOT: status snapshot FAILED: {e} ---")
+        now = datetime.utcnow()
+        next_run = datetime.combine(now.date(), at)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        await asyncio.sleep((next_run - now).total_seconds())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record daily asset status counts")
+    parser.add_argument("--backfill-days", type=int, help="Rebuild this many days up to yesterday")
+    args = parser.parse_args()
+
+    async def _main():
+        try:
+            written = await catch_up(args.backfill_days)
+            print(f"Wrote {written} asset status row(s)")
+        finally:
+            await engine.dispose()
+
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
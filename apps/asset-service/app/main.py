@@ -2,13 +2,26 @@
 TB ERP - Asset Management Service
 FastAPI-based microservice for asset lifecycle management
 """
-from fastapi import FastAPI
+import asyncio
+from datetime import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from sqlalchemy.exc import DBAPIError
+from contextlib import asynccontextmanager, suppress
 
 from app.api.v1.router import router as api_router
 from app.core.config import settings
-from app.db.session import init_db
+from app.core.service_client import DeadlineMiddleware, close_clients
+from app.core.admission import AdmissionMiddleware, admission_stats
+from app.core.coalesce import coalescing_stats
+from app.core.compression import CompressionMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.db.query_stats import QueryStatsMiddleware, query_metrics
+from app.db.session import init_db, pool_status
+from app.db.slow_queries import QUERY_CANCELED
+from app.jobs.status_snapshots import run_nightly
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -25,9 +38,17 @@ async def lifespan(app: FastAPI):
         print("--- Please check your database connection settings ---")
         # Don't raise - allow server to start even if DB connection fails
         # Database will be connected on first request
+    snapshots = None
+    if settings.STATUS_SNAPSHOT_TIME_UTC:
+        snapshots = asyncio.create_task(run_nightly(time.fromisoformat(settings.STATUS_SNAPSHOT_TIME_UTC)))
     yield
     # Shutdown
     print("--- LIFESPAN: SHUTTING DOWN ---")
+    if snapshots:
+        snapshots.cancel()
+        with suppress(asyncio.CancelledError):
+            await snapshots
+    await close_clients()
 
 app = FastAPI(
     title="Asset Management Service",
@@ -39,6 +60,20 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Shed load before it queues on the connection pool. Added before CORS so
+# that 429/503 responses still carry CORS headers.
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(
+        AdmissionMiddleware,
+        pool_status=pool_status,
+        pool_capacity=settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+        max_pool_waiters=settings.ADMISSION_MAX_POOL_WAITERS,
+        route_limits=settings.ADMISSION_ROUTE_LIMITS,
+        rate=settings.RATE_LIMIT_PER_SECOND,
+        burst=settings.RATE_LIMIT_BURST,
+        retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    )
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -48,12 +83,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Honour X-Request-Deadline from callers and pass the remaining budget on
+app.add_middleware(DeadlineMiddleware)
+
+# Compress larger responses for clients on slow links
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# Count statements, rows and database time per request; headers in debug mode
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(
+        QueryStatsMiddleware,
+        headers=settings.DEBUG,
+        repeat_threshold=settings.N_PLUS_ONE_THRESHOLD,
+    )
+
+# Profile requests an admin asks for, and every PROFILE_SAMPLE_EVERY-th request
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        interval_ms=settings.PROFILE_INTERVAL_MS,
+        sample_every=settings.PROFILE_SAMPLE_EVERY,
+    )
+
 # Direct test route to verify routing works (define BEFORE router to test)
 @app.get("/api/v1/analytics/test-direct")
 async def test_direct_route():
     """Direct test route to verify routing"""
     return {"message": "Direct route works!", "path": "/api/v1/analytics/test-direct"}
 
+# A statement cancelled by its statement_timeout means "try again later", not a bug
+@app.exception_handler(DBAPIError)
+async def statement_timeout_handler(request: Request, exc: DBAPIError):
+    if getattr(exc.orig, "sqlstate", None) != QUERY_CANCELED:
+        raise exc
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Query exceeded its time budget"},
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+    )
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -78,4 +152,11 @@ else:
 @app.get("/health")
 async def health_check():
     """Health check endpoint for container orchestration"""
-    return {"status": "healthy", "service": "asset-service"}
+    return {
+        "status": "healthy",
+        "service": "asset-service",
+        "db_pool": pool_status(),
+        "coalescing": coalescing_stats(),
+        "admission": admission_stats(),
+        "queries": query_metrics(),
+    }
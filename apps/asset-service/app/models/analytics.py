@@ -0,0 +1,20 @@
+"""
+Reporting snapshots maintained by the asset service
+"""
+from sqlalchemy import Column, Integer, String, Date
+from app.db.session import Base
+
+class AssetStatusDaily(Base):
+    """
+    Number of assets in each status at the end of each (UTC) day.
+
+    Backfilled once by replaying the status history and then extended by the
+    nightly snapshot job (app.jobs.status_snapshots), so time series reads
+    never touch the history tables.
+    """
+    __tablename__ = "asset_status_daily"
+    __table_args__ = {"schema": "assets"}
+    
+    day = Column(Date, primary_key=True)
+    status = Column(String(50), primary_key=True)
+    asset_count = Column(Integer, default=0, nullable=False)
@@ -1 +1,18 @@
+"""
+Asset assignment model
+"""
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy.sql import func
 
+from app.db.session import Base
+
+class AssetAssignment(Base):
+    """Who holds an asset; the open assignment is the one without unassigned_at"""
+    __tablename__ = "asset_assignments"
+    __table_args__ = {"schema": "assets"}
+    
+    id = Column(Integer, primary_key=True, index=True)
+    asset_id = Column(Integer, ForeignKey("assets.assets.id", ondelete="CASCADE"), index=True)
+    employee_id = Column(Integer, nullable=False)  # employees.employees, owned by employee-service
+    assigned_at = Column(DateTime, server_default=func.now())
+    unassigned_at = Column(DateTime, nullable=True)
@@ -25,3 +25,29 @@ class AssetHistory(Base):
     event_time = Column(DateTime, server_default=func.now(), nullable=False)
     details = Column(Text, nullable=True)
     performed_by = Column(String(255), nullable=True)
+
+class AssignmentHistory(Base):
+    """Every assignment of an asset with its return date and notes"""
+    __tablename__ = "assignment_history"
+    __table_args__ = {"schema": "assets"}
+
+    id = Column(Integer, primary_key=True, index=True)
+    asset_id = Column(Integer, ForeignKey("assets.assets.id", ondelete="CASCADE"), index=True)
+    employee_id = Column(Integer, nullable=True)  # employees.employees, owned by employee-service
+    assigned_by = Column(Integer, nullable=True)  # the assigning user's id
+    assigned_date = Column(DateTime, server_default=func.now())
+    return_date = Column(DateTime, nullable=True)
+    notes = Column(Text, nullable=True)
+
+class AssetStatusHistory(Base):
+    """Every status change of an asset; replayed by the daily status snapshots"""
+    __tablename__ = "asset_status_history"
+    __table_args__ = {"schema": "assets"}
+
+    id = Column(Integer, primary_key=True, index=True)
+    asset_id = Column(Integer, ForeignKey("assets.assets.id", ondelete="CASCADE"), index=True)
+    from_status = Column(String(50), nullable=False)
+    to_status = Column(String(50), nullable=False)
+    reason = Column(Text, nullable=True)
+    changed_at = Column(DateTime, server_default=func.now(), index=True)
+    changed_by = Column(String(255), nullable=True)  # the user's email
@@ -1 +1,92 @@
+"""
+Read models for list endpoints
 
+A ReadModel selects exactly the columns its response schema needs with a
+Core select() and validates the rows straight into that schema. No ORM
+entities are built, so nothing lands in the session identity map and there
+is no instance state to track for rows that are serialized and dropped right
+away. Filters and ordering still use the mapped attributes (Asset.status,
+...), which work on a Core select as well.
+
+`narrowed(fields)` gives the read model for a sparse fieldset (fields=):
+only the requested columns are selected and the rows validate into a
+schema with just those fields. The response schema's fields are the
+whitelist, and id is always included.
+
+Use it for read-only endpoints; anything that modifies rows goes through the
+ORM models.
+"""
+import functools
+from typing import Generic, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy import Select, Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.asset import Asset, MaintenanceLog
+from app.schemas.asset import AssetResponse
+from app.schemas.maintenance import MaintenanceLogResponse
+
+S = TypeVar("S", bound=BaseModel)
+
+ALWAYS_INCLUDED = ("id",)
+
+
+class ReadModel(Generic[S]):
+    """The columns of `table` that `schema` declares, validated into `schema`"""
+
+    def __init__(self, schema: Type[S], table: Table, sparse: bool = False):
+        self.schema = schema
+        self.table = table
+        self.sparse = sparse
+        self.fields = list(schema.model_fields)
+        # Fails at import if the schema names a column the table does not have
+        self.columns = [table.c[name] for name in self.fields]
+        self._adapter = TypeAdapter(List[schema])
+
+    def select(self) -> Select:
+        return select(*self.columns)
+
+    def to_models(self, rows: Sequence[Sequence]) -> List[S]:
+        # One validation call for the page; dicts are the cheapest input for pydantic-core
+        fields = self.fields
+        return self._adapter.validate_python([dict(zip(fields, row)) for row in rows])
+
+    async def all(self, db: AsyncSession, query: Select) -> List[S]:
+        return self.to_models((await db.execute(query)).all())
+
+    async def first(self, db: AsyncSession, query: Select) -> Optional[S]:
+        models = self.to_models((await db.execute(query.limit(1))).all())
+        return models[0] if models else None
+
+    def narrowed(self, fields: Optional[str]) -> "ReadModel":
+        """
+        This read model limited to a comma-separated list of field names.
+        Raises ValueError for names the schema does not have.
+        """
+        names = {name.strip() for name in (fields or "").split(",") if name.strip()}
+        if not names:
+            return self
+        unknown = names.difference(self.fields)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(self.fields)}")
+        names.update(ALWAYS_INCLUDED)
+        subset = tuple(name for name in self.fields if name in names)
+        return self if len(subset) == len(self.fields) else self._subset(subset)
+
+    # Bounded: every distinct combination of fields builds a schema
+    @functools.lru_cache(maxsize=64)
+    def _subset(self, names: Tuple[str, ...]) -> "ReadModel":
+        definitions = {name: (self.schema.model_fields[name].annotation, self.schema.model_fields[name]) for name in names}
+        return ReadModel(create_model(f"{self.schema.__name__}Fields", **definitions), self.table, sparse=True)
+
+    @functools.lru_cache(maxsize=8)
+    def page(self, list_schema: Type[BaseModel]) -> Type[BaseModel]:
+        """`list_schema`, a paginated list of this read model's full schema, holding this schema instead"""
+        if not self.sparse:
+            return list_schema
+        return create_model(list_schema.__name__, __base__=list_schema, items=(List[self.schema], ...))
+
+
+asset_rows = ReadModel(AssetResponse, Asset.__table__)
+maintenance_rows = ReadModel(MaintenanceLogResponse, MaintenanceLog.__table__)
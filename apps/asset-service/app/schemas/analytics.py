@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Dict, Optional
+from datetime import date, datetime
 
 class DashboardStatsResponse(BaseModel):
     total_assets: int
@@ -13,3 +14,23 @@ class EmployeeAssetCount(BaseModel):
     employee_id: int
     asset_count: int
     last_assigned_date: Optional[str] = None
+
+class PivotRow(BaseModel):
+    # Only the dimensions this row is grouped by; the others are rolled up
+    dimensions: Dict[str, Optional[str]]
+    measures: Dict[str, int]
+
+class PivotResponse(BaseModel):
+    dims: List[str]
+    measures: List[str]
+    grouping: str
+    rows: List[PivotRow]
+    truncated: bool = False
+    generated_at: datetime
+
+class StatusTimeSeries(BaseModel):
+    """Assets per status at the end of each day; None where no snapshot exists"""
+    start: date
+    end: date
+    days: List[date]
+    series: Dict[str, List[Optional[int]]]
@@ -54,7 +54,10 @@ class AssetResponse(AssetBase):
 class AssetList(BaseModel):
     """Paginated list of assets"""
     items: List[AssetResponse]
-    total: int
+    # None with count=none; a lower bound or planner estimate when total_is_estimate
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    has_more: bool = False
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
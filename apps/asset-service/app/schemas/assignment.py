@@ -1 +1,17 @@
+"""
+Pydantic schemas for assigning and returning assets
+"""
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
 
+class AssetAssign(BaseModel):
+    """Hand an asset to an employee"""
+    employee_id: int
+    assigned_date: Optional[datetime] = None
+    notes: Optional[str] = None
+
+class AssetReturn(BaseModel):
+    """Take an asset back"""
+    return_date: Optional[datetime] = None
+    notes: Optional[str] = None
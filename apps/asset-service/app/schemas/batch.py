@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import Any, List, Literal, Optional
+
+class BatchSubRequest(BaseModel):
+    # Echoed back so clients can match responses without relying on order
+    id: Optional[str] = None
+    method: Literal["GET"] = "GET"
+    # API path with optional query string, e.g. "/api/v1/assets/42?fields=asset_id,status"
+    path: str = Field(..., min_length=1, max_length=2000)
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest] = Field(..., min_length=1)
+
+class BatchSubResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    body: Any = None
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse]
@@ -1 +1,18 @@
+"""
+Pydantic schemas for asset assignment history
+"""
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import datetime
 
+class AssignmentHistory(BaseModel):
+    """One assignment of an asset, open while return_date is null"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    asset_id: int
+    employee_id: Optional[int] = None
+    assigned_by: Optional[int] = None
+    assigned_date: Optional[datetime] = None
+    return_date: Optional[datetime] = None
+    notes: Optional[str] = None
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Dict, Optional
+
+class ProfileSummary(BaseModel):
+    id: str
+    method: str
+    path: str
+    route: Optional[str] = None
+    status: Optional[int] = None
+    # "requested" (X-Profile header or ?profile=1) or "sampled" (PROFILE_SAMPLE_EVERY)
+    trigger: str
+    at: datetime
+    total_ms: float
+    db_ms: float
+    serialization_ms: float
+    cpu_ms: float
+    # Wall time not accounted for by the above: other tasks, network, pool waits
+    other_ms: float
+    db_statements: int
+    samples: int
+    interval_ms: float
+
+class ProfileDetail(ProfileSummary):
+    # Folded stacks ("frame;frame;frame") -> sample count
+    stacks: Dict[str, int] = {}
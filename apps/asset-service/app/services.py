@@ -9,11 +9,31 @@ from typing import Optional
 
 from app.models.asset import Asset
 from app.models.assignment import AssetAssignment
-from app.models.history import AssetHistory, AssetEventType
+from app.models.history import AssetHistory, AssetEventType, AssetStatusHistory
 from app.schemas.asset import AssetCreate, AssetUpdate
 from app.core.security import TokenData
 
 
+def record_status_change(
+    db: AsyncSession,
+    asset: Asset,
+    to_status: str,
+    reason: Optional[str] = None,
+    changed_by: Optional[str] = None,
+) -> None:
+    """Move an asset to `to_status`, logging the change to asset_status_history in the same transaction"""
+    if to_status == asset.status:
+        return
+    db.add(AssetStatusHistory(
+        asset_id=asset.id,
+        from_status=asset.status,
+        to_status=to_status,
+        reason=reason,
+        changed_by=changed_by,
+    ))
+    asset.status = to_status
+
+
 class AssetService:
     """Service for asset management operations"""
     
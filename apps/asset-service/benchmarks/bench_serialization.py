@@ -0,0 +1,46 @@
+"""
+Response building for GET /assets: ORM rows to schemas, then FastAPI's
+response_model pass and JSON encoding, for a full page of rows.
+"""
+from conftest import PAGE_SIZE, fastapi_response
+
+from app.core.responses import PydanticJSONResponse
+from app.schemas.asset import AssetList, AssetResponse
+
+render_asset_list = fastapi_response(AssetList)
+
+
+def _page(rows):
+    return AssetList(
+        items=[AssetResponse.model_validate(a) for a in rows],
+        total=10_000, page=1, size=PAGE_SIZE, pages=100,
+    )
+
+
+def test_rows_to_schema(benchmark, asset_rows):
+    """AssetResponse.model_validate per row, as list_assets does"""
+    benchmark(lambda: [AssetResponse.model_validate(a) for a in asset_rows])
+
+
+def test_response_model_pass(benchmark, asset_rows):
+    """FastAPI's re-validation and encoding of an already built AssetList"""
+    page = _page(asset_rows)
+    benchmark(render_asset_list, page)
+
+
+def test_list_response_total(benchmark, asset_rows):
+    """Both passes together: the current per-request cost of a page"""
+    benchmark(lambda: render_asset_list(_page(asset_rows)))
+
+
+def test_model_dump_json(benchmark, asset_rows):
+    """Encoding a validated AssetList directly (lower bound for the encoding step)"""
+    page = _page(asset_rows)
+    benchmark(page.model_dump_json)
+
+
+def test_fast_response(benchmark, asset_rows):
+    """FAST_JSON_RESPONSES: PydanticJSONResponse rendering, byte-identical to the default path"""
+    page = _page(asset_rows)
+    assert PydanticJSONResponse(page).body == render_asset_list(page)
+    benchmark(lambda: PydanticJSONResponse(_page(asset_rows)))
@@ -0,0 +1,101 @@
+"""
+Shared fixtures for the micro-benchmarks: import the service without a
+database or environment, build detached ORM rows and a signed token.
+Read-path benchmarks load those rows from an in-memory SQLite table.
+"""
+import json
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DB_PASSWORD", "benchmark")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+from jose import jwt  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db import query_stats  # noqa: E402
+from app.models.asset import Asset  # noqa: E402
+
+PAGE_SIZE = 100
+
+
+def fastapi_response(model):
+    """
+    What FastAPI does with an endpoint's return value for `response_model=model`:
+    validate it against the model, dump it to JSON-able data, json.dumps it
+    (as JSONResponse.render does).
+    """
+    adapter = TypeAdapter(model)
+
+    def render(content) -> bytes:
+        value = adapter.validate_python(content, from_attributes=True)
+        return json.dumps(
+            adapter.dump_python(value, mode="json"),
+            ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+        ).encode("utf-8")
+
+    return render
+
+
+def peak_kib(fn) -> int:
+    """Peak memory allocated while running fn once, in KiB"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+
+
+def sqlite_session(objects) -> Session:
+    """
+    A session on an in-memory SQLite copy of the objects' table, holding those
+    rows, with the query counting hooks so tests can use assert_query_budget
+    """
+    table = type(objects[0]).__table__
+    engine = create_engine("sqlite://", execution_options={"schema_translate_map": {table.schema: None}})
+    query_stats.install(engine)
+    table.create(engine)
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [{c.name: getattr(o, c.key) for c in table.columns} for o in objects])
+    return Session(engine)
+
+
+@pytest.fixture(scope="session")
+def asset_rows():
+    now = datetime(2026, 1, 1)
+    return [
+        Asset(
+            id=i, asset_id=f"TBA{i:07d}", asset_type="Laptop", asset_class="System",
+            serial_number=f"SN{i:08d}", manufacturer="LENOVO", model="ThinkPad T470s",
+            os_installed="Windows 11", processor="Intel Core i7 Gen 10", ram_size_gb="16",
+            hard_drive_size="512 GB", battery_condition="Good", status="assigned",
+            assigned_employee_id=i % 500, created_at=now - timedelta(days=i), updated_at=now,
+        )
+        for i in range(1, PAGE_SIZE + 1)
+    ]
+
+
+@pytest.fixture(scope="session")
+def asset_db(asset_rows):
+    session = sqlite_session(asset_rows)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def token():
+    return jwt.encode(
+        {"sub": "42", "email": "bench@trustybytes.in", "roles": ["asset_manager"]},
+        settings.JWT_SECRET,
+        algorithm=settings.JWT_ALGORITHM,
+    )
@@ -0,0 +1,138 @@
+"""
+Shared fixtures for the asset-service tests: the service app served
+in-process over httpx, with get_db pointed at an in-memory SQLite database.
+From the service directory:
+
+    pytest tests
+
+Tests that need Postgres itself (its SQL has no SQLite equivalent) run when
+TEST_DATABASE_URL points at a scratch database, and are skipped otherwise.
+The app's own engine is pointed there, so jobs run against it too.
+"""
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DB_PASSWORD", "test")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+import httpx  # noqa: E402
+from fastapi import Request  # noqa: E402
+from jose import jwt  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db import query_stats, slow_queries  # noqa: E402
+from app.db.session import AsyncSessionLocal, Base, engine, get_db, shared_session  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.asset import Asset, MaintenanceLog  # noqa: E402
+from app.models.assignment import AssetAssignment  # noqa: E402
+from app.models.history import AssetHistory, AssetStatusHistory, AssignmentHistory  # noqa: E402
+
+# Tables that SQLite can hold (asset_categories uses JSONB)
+TABLES = [
+    table.__table__
+    for table in (Asset, MaintenanceLog, AssetHistory, AssetAssignment, AssignmentHistory, AssetStatusHistory)
+]
+
+
+def bearer(roles) -> dict:
+    token = jwt.encode(
+        {"sub": "42", "email": "test@trustybytes.in", "roles": roles},
+        settings.JWT_SECRET,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+async def db_sessions():
+    """Session factory on a fresh in-memory database, with the query counting hooks"""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://", execution_options={"schema_translate_map": {"assets": None}}
+    )
+    query_stats.install(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync: Base.metadata.create_all(sync, tables=TABLES))
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def seeded(db_sessions):
+    """A page of active assets, each with a few maintenance logs"""
+    async with db_sessions() as db:
+        db.add_all([
+            Asset(id=i, asset_id=f"AST-{i:05d}", asset_type="Laptop", manufacturer="Dell", status="active")
+            for i in range(1, 31)
+        ])
+        db.add_all([
+            MaintenanceLog(asset_id=i, maintenance_type="Inspection", performed_at=datetime(2026, 1, n + 1))
+            for i in range(1, 31)
+            for n in range(3)
+        ])
+        await db.commit()
+    return db_sessions
+
+
+async def _client(sessions):
+    async def override_get_db(request: Request):
+        # As get_db: a batch's sub-requests share its session
+        session = shared_session.get()
+        if session is not None:
+            yield session
+            return
+        async with sessions() as session:
+            session.info["statement_timeout_ms"] = slow_queries.statement_timeout_ms(request.url.path)
+            yield session
+            await session.commit()
+
+    app.dependency_overrides[get_db] = override_get_db
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        client.headers.update(bearer(["admin"]))
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def client(seeded):
+    async for client in _client(seeded):
+        yield client
+
+
+@pytest.fixture
+async def pg_sessions():
+    """
+    Session factory on a fresh assets schema in the scratch Postgres database
+    at TEST_DATABASE_URL, dropped after the test
+    """
+    if not TEST_DATABASE_URL:
+        pytest.skip("set TEST_DATABASE_URL to a scratch Postgres database")
+    async with engine.begin() as conn:
+        if (await conn.execute(text("SELECT to_regnamespace('assets')"))).scalar() is not None:
+            pytest.skip("TEST_DATABASE_URL already has an assets schema; use a scratch database")
+        await conn.execute(text("CREATE SCHEMA assets"))
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        yield AsyncSessionLocal
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP SCHEMA assets CASCADE"))
+        # The pool's connections belong to this test's event loop
+        await engine.dispose()
+
+
+@pytest.fixture
+async def pg_client(pg_sessions):
+    async for client in _client(pg_sessions):
+        yield client
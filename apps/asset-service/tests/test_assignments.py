@@ -0,0 +1,45 @@
+from sqlalchemy import select
+
+from app.clients import employee_directory
+from app.models.assignment import AssetAssignment
+from app.models.history import AssignmentHistory
+
+
+async def test_assign_and_return(client, seeded, monkeypatch):
+    async def lookup(employee_id, authorization):
+        return {"id": employee_id, "is_active": True}
+
+    monkeypatch.setattr(employee_directory, "get", lookup)
+
+    response = await client.post("/api/v1/assignments/1/assign", json={"employee_id": 7, "notes": "onboarding"})
+    assert response.status_code == 200
+    assert response.json()["status"] == "assigned"
+    assert response.json()["assigned_employee_id"] == 7
+
+    response = await client.post("/api/v1/assignments/1/assign", json={"employee_id": 8})
+    assert response.status_code == 400
+
+    response = await client.post("/api/v1/assignments/1/return", json={"notes": "offboarding"})
+    assert response.status_code == 200
+    assert response.json()["assigned_employee_id"] is None
+
+    async with seeded() as db:
+        assignment = (await db.execute(select(AssetAssignment))).scalar_one()
+        history = (await db.execute(select(AssignmentHistory))).scalar_one()
+    assert assignment.employee_id == 7 and assignment.unassigned_at is not None
+    assert history.assigned_by == 42 and history.return_date is not None
+    assert history.notes == "onboarding [Return Note: offboarding]"
+
+    response = await client.get("/api/v1/history/1")
+    assert response.status_code == 200
+    assert [entry["employee_id"] for entry in response.json()] == [7]
+
+
+async def test_unknown_employee_is_rejected(client, monkeypatch):
+    async def lookup(employee_id, authorization):
+        return None
+
+    monkeypatch.setattr(employee_directory, "get", lookup)
+
+    response = await client.post("/api/v1/assignments/1/assign", json={"employee_id": 999})
+    assert response.status_code == 422
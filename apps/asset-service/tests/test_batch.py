@@ -0,0 +1,105 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import admission, security
+from app.core.config import settings
+from app.db.query_stats import assert_query_budget
+from app.models.asset import Asset
+
+
+async def batch(client, *paths):
+    response = await client.post("/api/v1/batch", json={"requests": [{"id": str(n), "path": p} for n, p in enumerate(paths)]})
+    assert response.status_code == 200, response.text
+    return [(sub["status"], sub["body"]) for sub in response.json()["responses"]]
+
+
+async def active_admission(client, monkeypatch, **limits):
+    """The app's AdmissionMiddleware (built on the first request), with test limits"""
+    await client.get("/health")
+    middleware = admission._active
+    for name, value in limits.items():
+        monkeypatch.setattr(middleware, name, value)
+    return middleware
+
+
+async def test_sub_requests_run_in_order(client):
+    responses = await batch(client, "/api/v1/assets/3", "/api/v1/maintenance/3", "/api/v1/assets/999")
+    assert [status for status, _ in responses] == [200, 200, 404]
+    assert responses[0][1]["asset_id"] == "AST-00003"
+    assert len(responses[1][1]) == 3
+
+
+async def test_too_many_sub_requests(client):
+    response = await client.post("/api/v1/batch", json={
+        "requests": [{"path": "/api/v1/assets/1"}] * (settings.BATCH_MAX_REQUESTS + 1),
+    })
+    assert response.status_code == 413
+
+
+async def test_only_this_api_can_be_batched(client):
+    responses = await batch(client, "/api/v1/batch", "/api/v1/batch/", "/health", "/docs", "/api/v1/no-such-thing")
+    assert [status for status, _ in responses] == [400, 400, 400, 400, 404]
+    assert responses[0][1]["detail"] == "Batches cannot be nested"
+
+
+async def test_sub_requests_share_the_batch_identity(client, monkeypatch):
+    decoded = []
+    decode = security.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        decoded.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    responses = await batch(client, "/api/v1/assets/1", "/api/v1/assets/2", "/api/v1/maintenance/2")
+    assert [status for status, _ in responses] == [200, 200, 200]
+    # The batch authenticated once; its sub-requests reused that identity
+    assert len(decoded) == 1
+
+
+async def test_failed_sub_request_rolls_back_the_shared_session(client, monkeypatch):
+    rollbacks = []
+    rollback = AsyncSession.rollback
+
+    async def counting_rollback(self):
+        rollbacks.append(self)
+        await rollback(self)
+
+    monkeypatch.setattr(AsyncSession, "rollback", counting_rollback)
+    # count=estimate on an unfiltered list reads pg_class, which SQLite lacks:
+    # the statement fails inside the shared transaction
+    responses = await batch(client, "/api/v1/assets?count=estimate", "/api/v1/assets/4")
+    assert [status for status, _ in responses] == [500, 200]
+    assert len(rollbacks) == 1
+
+
+async def test_each_sub_request_is_charged_to_the_rate_bucket(client, monkeypatch):
+    middleware = await active_admission(client, monkeypatch, rate=0.001, burst=4, buckets=type(admission._active.buckets)())
+    responses = await batch(client, *["/api/v1/assets/1"] * 5)
+    # The batch took one token, three sub-requests the rest
+    assert [status for status, _ in responses] == [200, 200, 200, 429, 429]
+    assert middleware.rejected["rate"] >= 2
+
+
+async def test_sub_requests_respect_route_limits(client, monkeypatch):
+    await active_admission(
+        client, monkeypatch,
+        route_limits=[("/api/v1/maintenance", 0)],
+        route_in_flight={"/api/v1/maintenance": 0},
+    )
+    responses = await batch(client, "/api/v1/maintenance/1", "/api/v1/assets/1")
+    assert [status for status, _ in responses] == [503, 200]
+    assert admission._active.route_in_flight == {"/api/v1/maintenance": 0}
+
+
+async def test_sub_requests_get_their_own_statement_timeout(pg_client, pg_sessions):
+    async with pg_sessions() as db:
+        await db.execute(Asset.__table__.insert(), [{"id": 1, "asset_id": "AST-1"}])
+        await db.commit()
+    with assert_query_budget(100) as stats:
+        responses = await batch(pg_client, "/api/v1/assets/1", "/api/v1/maintenance/1")
+    assert [status for status, _ in responses] == [200, 200]
+    timeouts = [sql for sql in stats.by_sql if sql.startswith("SET LOCAL statement_timeout")]
+    assert sorted(timeouts) == sorted({
+        f"SET LOCAL statement_timeout = {settings.STATEMENT_TIMEOUTS['/api/v1/assets']}",
+        f"SET LOCAL statement_timeout = {settings.STATEMENT_TIMEOUT_MS}",
+    })
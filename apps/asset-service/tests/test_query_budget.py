@@ -0,0 +1,60 @@
+"""
+Statement budgets of the read endpoints: a list is one statement per page
+plus one for its count, and a detail is one statement however many rows it
+returns, so a relationship that starts lazy-loading fails here first.
+"""
+import pytest
+
+from app.db.query_stats import assert_query_budget
+
+
+@pytest.mark.parametrize("count, budget", [("exact", 2), ("none", 1)])
+async def test_list_assets(client, count, budget):
+    with assert_query_budget(budget, max_repeats=1):
+        response = await client.get(f"/api/v1/assets?count={count}&page=2&size=10")
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["items"]) == 10
+    assert body["has_more"] is True
+    assert body["total"] == (30 if count == "exact" else None)
+
+
+async def test_list_assets_filtered_estimate(client):
+    # A filtered list cannot use planner statistics; it counts up to LIST_COUNT_CAP
+    with assert_query_budget(2, max_repeats=1):
+        response = await client.get("/api/v1/assets?count=estimate&status=active&size=50")
+    assert response.status_code == 200
+    assert response.json()["total"] == 30
+    assert len(response.json()["items"]) == 30
+
+
+async def test_list_assigned_assets(client):
+    with assert_query_budget(2, max_repeats=1):
+        response = await client.get("/api/v1/assets/assigned")
+    assert response.status_code == 200
+    assert response.json()["total"] == 0
+
+
+async def test_get_asset(client):
+    with assert_query_budget(1):
+        response = await client.get("/api/v1/assets/3")
+    assert response.status_code == 200
+    assert response.json()["asset_id"] == "AST-00003"
+
+    with assert_query_budget(1):
+        response = await client.get("/api/v1/assets/999")
+    assert response.status_code == 404
+
+
+async def test_get_asset_maintenance_logs(client):
+    with assert_query_budget(2, max_repeats=1):
+        response = await client.get("/api/v1/maintenance/3")
+    assert response.status_code == 200
+    logs = response.json()
+    assert len(logs) == 3
+    assert [log["performed_at"][:10] for log in logs] == ["2026-01-03", "2026-01-02", "2026-01-01"]
+
+    # An unknown asset stops at the existence check
+    with assert_query_budget(1):
+        response = await client.get("/api/v1/maintenance/999")
+    assert response.status_code == 404
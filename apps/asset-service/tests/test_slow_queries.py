@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.db import slow_queries
+from app.db.slow_queries import SlowQueryLog, _explain, has_side_effects, parameter_shape, statement_timeout_ms
+
+
+def entry(sql, duration_ms, route="/api/v1/assets", timed_out=False, plan=None, second=0):
+    return {
+        "sql": sql,
+        "route": route,
+        "parameters": {"id": "int"},
+        "duration_ms": duration_ms,
+        "timed_out": timed_out,
+        "at": datetime(2026, 5, 1, 12, 0, second, tzinfo=timezone.utc),
+        "plan": plan,
+    }
+
+
+def test_parameter_shape_keeps_types_not_values():
+    assert parameter_shape({"id": 7, "ids": [1, 2, 3], "name": "secret"}) == {
+        "id": "int", "ids": "list[3]", "name": "str",
+    }
+    assert parameter_shape((7, ("a", "b"), None)) == ["int", "tuple[2]", "NoneType"]
+    assert parameter_shape(None) is None
+    assert parameter_shape([{"id": 1}, {"id": 2}], executemany=True) == {"rows": 2, "row": {"id": "int"}}
+    assert parameter_shape([], executemany=True) == {"rows": 0, "row": None}
+
+
+def test_report_groups_by_statement():
+    log = SlowQueryLog(size=10)
+    log.record(entry("SELECT a", 300, second=1))
+    log.record(entry("SELECT b", 900, route="/api/v1/analytics/summary", second=2))
+    log.record(entry("SELECT a", 500, route="/api/v1/batch", timed_out=True, plan=[{"Plan": {}}], second=3))
+    log.record(entry("SELECT a", 400, second=4))
+
+    report = log.report()
+    assert report["recorded"] == report["retained"] == 4
+    first, second = report["statements"]
+    assert (first["sql"], second["sql"]) == ("SELECT a", "SELECT b")
+    assert first["calls"] == 3 and first["timeouts"] == 1
+    assert (first["total_ms"], first["max_ms"], first["mean_ms"]) == (1200.0, 500, 400.0)
+    assert first["routes"] == ["/api/v1/assets", "/api/v1/batch"]
+    # The latest plan is kept even when later entries have none
+    assert first["plan"] == [{"Plan": {}}]
+    assert first["last_seen"].second == 4
+    assert [e["duration_ms"] for e in report["recent"]] == [400, 500, 900, 300]
+
+
+def test_report_filters_and_limits():
+    log = SlowQueryLog(size=3)
+    for n in range(5):
+        log.record(entry(f"SELECT {n}", 100 * (n + 1), route="/api/v1/analytics" if n % 2 else "/api/v1/assets"))
+    assert (log.recorded, len(log.entries)) == (5, 3)
+    assert [s["sql"] for s in log.report()["statements"]] == ["SELECT 4", "SELECT 3", "SELECT 2"]
+    assert [s["sql"] for s in log.report(route="/api/v1/analytics")["statements"]] == ["SELECT 3"]
+    assert [s["sql"] for s in log.report(min_ms=350)["statements"]] == ["SELECT 4", "SELECT 3"]
+    assert [s["sql"] for s in log.report(limit=1)["recent"]] == ["SELECT 4"]
+    log.clear()
+    assert log.report()["statements"] == [] and log.recorded == 0
+
+
+def test_statement_timeout_takes_the_longest_matching_prefix(monkeypatch):
+    monkeypatch.setattr(slow_queries, "_TIMEOUTS", sorted(
+        {"/api/v1/assets": 5000, "/api/v1/assets/search": 2000, "/api/v1/analytics": 20000}.items(),
+        key=lambda item: -len(item[0]),
+    ))
+    monkeypatch.setattr(slow_queries.settings, "STATEMENT_TIMEOUT_MS", 10000)
+    assert statement_timeout_ms("/api/v1/assets/search") == 2000
+    assert statement_timeout_ms("/api/v1/assets/search/suggest") == 2000
+    assert statement_timeout_ms("/api/v1/assets/42") == 5000
+    assert statement_timeout_ms("/api/v1/analytics/summary") == 20000
+    assert statement_timeout_ms("/api/v1/maintenance/1") == 10000
+    assert statement_timeout_ms("/api") == 10000
+
+
+@pytest.mark.parametrize("statement, side_effects", [
+    ("SELECT * FROM assets.assets WHERE id = $1", False),
+    ("SELECT updated_at, deleted FROM assets.assets", False),
+    ("SELECT nextval('assets.asset_number_seq')", True),
+    ("SELECT * FROM assets.assets WHERE status = 'retired' FOR UPDATE SKIP LOCKED", True),
+    ("SELECT * FROM assets.assets FOR NO KEY UPDATE", True),
+    ("SELECT * FROM assets.assets FOR SHARE", True),
+    ("SELECT pg_advisory_xact_lock(42)", True),
+])
+def test_side_effects(statement, side_effects):
+    assert has_side_effects(statement) is side_effects
+
+
+async def test_explain_does_not_rerun_side_effects(pg_sessions):
+    async with pg_sessions() as db:
+        await db.execute(text("CREATE SEQUENCE assets.explain_seq"))
+        connection = await db.connection()
+        plain = await connection.run_sync(_explain, "SELECT 1", ())
+        sequence = await connection.run_sync(_explain, "SELECT nextval('assets.explain_seq')", ())
+        assert "Actual Total Time" in plain[0]["Plan"]
+        assert "Actual Total Time" not in sequence[0]["Plan"]
+        assert (await db.execute(text("SELECT nextval('assets.explain_seq')"))).scalar() == 1
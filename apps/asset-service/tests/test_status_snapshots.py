@@ -0,0 +1,137 @@
+import re
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.clients import employee_directory
+from app.jobs.status_snapshots import DISPOSED_DETAILS, STATUS_FROM_PATTERN, STATUS_TO_PATTERN, snapshot_days
+from app.models.analytics import AssetStatusDaily
+from app.models.asset import Asset
+from app.models.history import AssetEventType, AssetHistory, AssetStatusHistory
+
+
+def audit_event(details: str):
+    """What REPLAY_SQL reads from a status_changed entry, with Python's re"""
+    from_match = re.search(STATUS_FROM_PATTERN, details)
+    to_match = re.search(STATUS_TO_PATTERN, details)
+    to_status = "disposed" if details == DISPOSED_DETAILS else to_match and to_match.group(1)
+    return from_match and from_match.group(1), to_status
+
+
+# Details as AssetService writes them (change_status, update_asset, delete_asset)
+@pytest.mark.parametrize("details, expected", [
+    ("Status changed: active -> maintenance", ("active", "maintenance")),
+    ("Status changed: maintenance -> retired (Reason: end of life)", ("maintenance", "retired")),
+    ("status: active -> maintenance", ("active", "maintenance")),
+    ("location: Chennai -> Pune; status: assigned -> active; model: X1 -> X2", ("assigned", "active")),
+    ("model: status: a -> b", (None, None)),
+    ("name: Laptop -> Laptop 2", (None, None)),
+    ("serial_number: None -> SN-1", (None, None)),
+    (DISPOSED_DETAILS, (None, "disposed")),
+])
+def test_status_is_parsed_from_audit_details(details, expected):
+    assert audit_event(details) == expected
+
+
+async def test_replay_follows_status_changes_only(pg_sessions):
+    d1 = date(2026, 3, 2)
+    at = lambda day, hour=10: datetime.combine(d1 + timedelta(days=day), datetime.min.time()) + timedelta(hours=hour)  # noqa: E731
+    async with pg_sessions() as db:
+        await db.execute(Asset.__table__.insert(), [
+            {"id": 1, "asset_id": "A-1", "status": "disposed", "created_at": at(-1), "updated_at": at(2)},
+            {"id": 2, "asset_id": "A-2", "status": "assigned", "created_at": at(-1), "updated_at": at(1)},
+            {"id": 3, "asset_id": "A-3", "status": "assigned", "created_at": at(-1), "updated_at": at(1)},
+        ])
+        events = [
+            # A field edit: not a status event, must not break the active interval
+            (1, at(0), AssetEventType.STATUS_CHANGED, "name: Laptop -> Laptop 2"),
+            (1, at(1), AssetEventType.STATUS_CHANGED, "location: Chennai -> Pune; status: active -> maintenance"),
+            (1, at(2), AssetEventType.STATUS_CHANGED, DISPOSED_DETAILS),
+            (2, at(1), AssetEventType.STATUS_CHANGED, "Status changed: active -> assigned (Reason: onboarding)"),
+            # An assignment takes the status before it from the previous event
+            (3, at(0), AssetEventType.STATUS_CHANGED, "Status changed: active -> maintenance"),
+            (3, at(1), AssetEventType.ASSIGNED, "Assigned to employee 7"),
+        ]
+        await db.execute(AssetHistory.__table__.insert(), [
+            {"asset_id": asset_id, "event_type": event_type, "event_time": when, "details": details}
+            for asset_id, when, event_type, details in events
+        ])
+        await db.commit()
+    await snapshot_days(d1, d1 + timedelta(days=2))
+
+    assert await snapshots(pg_sessions) == [
+        (d1, "active", 2),
+        (d1, "maintenance", 1),
+        (d1 + timedelta(days=1), "assigned", 2),
+        (d1 + timedelta(days=1), "maintenance", 1),
+        (d1 + timedelta(days=2), "assigned", 2),
+        (d1 + timedelta(days=2), "disposed", 1),
+    ]
+
+
+async def snapshots(sessions):
+    async with sessions() as db:
+        rows = await db.execute(
+            select(AssetStatusDaily.day, AssetStatusDaily.status, AssetStatusDaily.asset_count)
+            .order_by(AssetStatusDaily.day, AssetStatusDaily.status)
+        )
+        return [tuple(row) for row in rows]
+
+
+async def end_of_day(sessions):
+    """Move everything recorded so far back by a day, as if the day had ended"""
+    async with sessions() as db:
+        await db.execute(update(Asset).values(created_at=Asset.created_at - timedelta(days=1)))
+        await db.execute(
+            update(AssetStatusHistory).values(changed_at=AssetStatusHistory.changed_at - timedelta(days=1))
+        )
+        await db.commit()
+
+
+async def test_endpoint_changes_are_replayed(pg_client, pg_sessions, monkeypatch):
+    async def lookup(employee_id, authorization):
+        return {"id": employee_id, "is_active": True}
+
+    monkeypatch.setattr(employee_directory, "get", lookup)
+    async with pg_sessions() as db:
+        today = (await db.execute(select(func.localtimestamp()))).scalar().date()
+
+    ids = []
+    for n in range(3):
+        response = await pg_client.post("/api/v1/assets", json={"asset_id": f"AST-{n}", "asset_type": "Laptop"})
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+    await end_of_day(pg_sessions)
+
+    assert (await pg_client.post(f"/api/v1/assignments/{ids[0]}/assign", json={"employee_id": 7})).status_code == 200
+    assert (await pg_client.put(f"/api/v1/assets/{ids[1]}", json={"status": "maintenance"})).status_code == 200
+    await end_of_day(pg_sessions)
+
+    assert (await pg_client.post(f"/api/v1/assignments/{ids[0]}/return", json={})).status_code == 200
+    # Edits that leave the status alone are not status events
+    assert (await pg_client.put(f"/api/v1/assets/{ids[1]}", json={"asset_class": "Dev"})).status_code == 200
+    assert (await pg_client.put(f"/api/v1/assets/{ids[2]}", json={"status": "retired"})).status_code == 200
+
+    async with pg_sessions() as db:
+        changes = (await db.execute(
+            select(AssetStatusHistory.asset_id, AssetStatusHistory.from_status, AssetStatusHistory.to_status)
+            .order_by(AssetStatusHistory.id)
+        )).all()
+    assert [tuple(change) for change in changes] == [
+        (ids[0], "active", "assigned"),
+        (ids[1], "active", "maintenance"),
+        (ids[0], "assigned", "in_stock"),
+        (ids[2], "active", "retired"),
+    ]
+
+    await snapshot_days(today - timedelta(days=2), today)
+    assert await snapshots(pg_sessions) == [
+        (today - timedelta(days=2), "active", 3),
+        (today - timedelta(days=1), "active", 1),
+        (today - timedelta(days=1), "assigned", 1),
+        (today - timedelta(days=1), "maintenance", 1),
+        (today, "in_stock", 1),
+        (today, "maintenance", 1),
+        (today, "retired", 1),
+    ]
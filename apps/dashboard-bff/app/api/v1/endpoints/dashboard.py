@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.security import HTTPAuthorizationCredentials
+from datetime import datetime
+import asyncio
+import uuid
+
+from app.clients import service_clients
+from app.core.config import settings
+from app.core.security import security, get_current_user, TokenData
+from app.schemas.dashboard import DashboardResponse, SourceStatus
+
+router = APIRouter()
+
+# section -> (service, path, query params)
+SECTIONS = {
+    "assets": ("asset", "/api/v1/analytics/dashboard-stats", None),
+    "invoice_aging": ("invoice", "/api/v1/invoices/analytics/aging", None),
+    "invoice_revenue": ("invoice", "/api/v1/invoices/analytics/revenue", {"months": settings.DASHBOARD_REVENUE_MONTHS}),
+    "headcount": ("employee", "/api/v1/employees/analytics/headcount", None),
+}
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """
+    Combined landing dashboard. All backend calls run concurrently over pooled
+    connections; a slow or failing service only blanks its own section.
+    """
+    headers = {
+        "Authorization": f"Bearer {credentials.credentials}",
+        "X-Request-ID": request.headers.get("X-Request-ID") or str(uuid.uuid4()),
+    }
+    results = await asyncio.gather(*[
+        service_clients.get_json(service, path, headers, params)
+        for service, path, params in SECTIONS.values()
+    ])
+
+    sections = dict(zip(SECTIONS, results))
+    if not any(r.ok for r in results):
+        raise HTTPException(status_code=503, detail="All dashboard services are unavailable")
+
+    return DashboardResponse(
+        generated_at=datetime.utcnow(),
+        partial=not all(r.ok for r in results),
+        sources={
+            name: SourceStatus(ok=r.ok, status_code=r.status_code, elapsed_ms=r.elapsed_ms, error=r.error)
+            for name, r in sections.items()
+        },
+        **{name: r.data for name, r in sections.items()},
+    )
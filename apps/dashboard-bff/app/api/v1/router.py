@@ -0,0 +1,13 @@
+"""
+API Router configuration for the Dashboard BFF
+"""
+from fastapi import APIRouter
+from app.api.v1.endpoints import dashboard
+
+api_router = APIRouter()
+
+api_router.include_router(
+    dashboard.router,
+    prefix="/dashboard",
+    tags=["dashboard"]
+)
@@ -0,0 +1,95 @@
+"""
+Pooled HTTP access to the backend services
+
+Each backend gets one long-lived client (app.core.service_client) shared by
+every request in the process, so calls reuse keep-alive connections instead
+of paying a TCP (and TLS) handshake per downstream call, and get retries,
+hedging and circuit breaking. Calls made here never raise: a failing service
+turns into an error entry, not a failed dashboard.
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.service_client import DeadlineExceeded, ServiceClient, ServiceError
+
+
+@dataclass
+class CallResult:
+    """Outcome of one downstream call"""
+    service: str
+    data: Optional[Any] = None
+    error: Optional[str] = None
+    status_code: Optional[int] = None
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ServiceClients:
+    """Shared clients for the asset, invoice and employee services"""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_urls = {
+            "asset": settings.ASSET_SERVICE_URL,
+            "invoice": settings.INVOICE_SERVICE_URL,
+            "employee": settings.EMPLOYEE_SERVICE_URL,
+        }
+        # Stand-in transports (e.g. httpx.ASGITransport) can be passed for local runs
+        self._transport = transport
+        self._clients: Dict[str, ServiceClient] = {}
+
+    async def start(self) -> None:
+        for service, base_url in self.base_urls.items():
+            self._clients[service] = ServiceClient(
+                f"{service}-service",
+                base_url,
+                timeout=settings.DOWNSTREAM_TIMEOUT_SECONDS,
+                connect_timeout=settings.DOWNSTREAM_CONNECT_TIMEOUT_SECONDS,
+                retries=settings.DOWNSTREAM_RETRIES,
+                hedge_after=settings.DOWNSTREAM_HEDGE_AFTER_SECONDS,
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                transport=self._transport,
+            )
+
+    async def close(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+    async def get_json(
+        self,
+        service: str,
+        path: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> CallResult:
+        if not self._clients:
+            await self.start()
+        started = time.perf_counter()
+        result = CallResult(service=service)
+        try:
+            response = await self._clients[service].get(path, headers=headers, params=params, timeout=timeout)
+            result.status_code = response.status_code
+            if response.is_success:
+                result.data = response.json()
+            else:
+                result.error = f"{service} service returned {response.status_code}"
+        except DeadlineExceeded:
+            result.error = f"{service} service timed out"
+        except ServiceError as e:
+            result.error = f"{service} service unavailable: {e}"
+        except ValueError:
+            result.error = f"{service} service returned invalid JSON"
+        result.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+
+service_clients = ServiceClients()
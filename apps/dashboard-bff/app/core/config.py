@@ -0,0 +1,55 @@
+"""
+Application configuration using Pydantic Settings
+"""
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import lru_cache
+from typing import Optional
+from pathlib import Path
+
+# Identify the root of the monorepo
+# Path is: apps/dashboard-bff/app/core/config.py -> need to go up 5 levels to reach project root
+ROOT_DIR = Path(__file__).parent.parent.parent.parent.parent
+
+class Settings(BaseSettings):
+    """Application settings loaded from environment variables"""
+    
+    # Environment
+    ENVIRONMENT: str = "development"
+    DEBUG: bool = True
+    
+    # Security
+    JWT_SECRET: str
+    JWT_ALGORITHM: str = "HS256"
+    
+    # CORS
+    CORS_ORIGINS: list[str] = ["http://localhost:3000"]
+    
+    # Backend services
+    ASSET_SERVICE_URL: str = "http://localhost:8001"
+    INVOICE_SERVICE_URL: str = "http://localhost:8002"
+    EMPLOYEE_SERVICE_URL: str = "http://localhost:8003"
+    
+    # Outbound HTTP (one pooled keep-alive client per process)
+    DOWNSTREAM_TIMEOUT_SECONDS: float = 2.0  # whole dashboard request, retries included
+    DOWNSTREAM_CONNECT_TIMEOUT_SECONDS: float = 0.5
+    DOWNSTREAM_RETRIES: int = 1
+    DOWNSTREAM_HEDGE_AFTER_SECONDS: Optional[float] = 0.3  # None disables hedging
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    
+    # Dashboard contents
+    DASHBOARD_REVENUE_MONTHS: int = 6
+    
+    # Pydantic Settings configuration
+    model_config = SettingsConfigDict(
+        env_file=[".env", str(ROOT_DIR / ".env")],
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        extra="ignore"
+    )
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
+
+settings = get_settings()
@@ -0,0 +1,60 @@
+"""
+JWT Authentication and Authorization
+"""
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from jose import jwt, JWTError
+from pydantic import BaseModel
+from typing import List, Optional
+
+from app.core.config import settings
+
+security = HTTPBearer()
+
+class TokenData(BaseModel):
+    """Decoded JWT token data"""
+    sub: str
+    email: Optional[str] = None
+    roles: List[str] = []
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> TokenData:
+    """Extract and validate JWT token from request"""
+    token = credentials.credentials
+    
+    try:
+        payload = jwt.decode(
+            token,
+            settings.JWT_SECRET,
+            algorithms=[settings.JWT_ALGORITHM]
+        )
+        
+        return TokenData(
+            sub=payload.get("sub", ""),
+            email=payload.get("email"),
+            roles=payload.get("roles", [])
+        )
+    except JWTError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+def require_roles(required_roles: List[str]):
+    """Dependency to check if user has required roles"""
+    async def role_checker(
+        current_user: TokenData = Depends(get_current_user)
+    ) -> TokenData:
+        if "admin" in current_user.roles:
+            return current_user
+        
+        if not any(role in current_user.roles for role in required_roles):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions"
+            )
+        return current_user
+    
+    return role_checker
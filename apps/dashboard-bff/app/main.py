@@ -0,0 +1,47 @@
+"""
+TB ERP - Dashboard BFF
+Backend-for-frontend that fans out to the asset, invoice and employee services
+and returns one combined dashboard payload
+"""
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+
+from app.api.v1.router import api_router
+from app.clients import service_clients
+from app.core.config import settings
+from app.core.service_client import DeadlineMiddleware
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await service_clients.start()
+    yield
+    await service_clients.close()
+
+app = FastAPI(
+    title="Dashboard BFF",
+    description="Aggregates dashboard data from the backend services in one call",
+    version="1.0.0",
+    docs_url="/docs",
+    redoc_url="/redoc",
+    openapi_url="/openapi.json",
+    lifespan=lifespan,
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=settings.CORS_ORIGINS,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Every dashboard request gets a deadline (or inherits the caller's) that
+# bounds all downstream calls, retries and hedges included
+app.add_middleware(DeadlineMiddleware, default_timeout=settings.DOWNSTREAM_TIMEOUT_SECONDS)
+
+app.include_router(api_router, prefix="/api/v1")
+
+@app.get("/health")
+async def health_check():
+    return {"status": "healthy", "service": "dashboard-bff"}
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+class SourceStatus(BaseModel):
+    ok: bool
+    status_code: Optional[int] = None
+    elapsed_ms: float
+    error: Optional[str] = None
+
+class DashboardResponse(BaseModel):
+    """Landing dashboard; sections whose service failed are null and listed in `sources`"""
+    generated_at: datetime
+    partial: bool
+    assets: Optional[Dict[str, Any]] = None
+    invoice_aging: Optional[Dict[str, Any]] = None
+    invoice_revenue: Optional[Dict[str, Any]] = None
+    headcount: Optional[Dict[str, Any]] = None
+    sources: Dict[str, SourceStatus]
@@ -0,0 +1,82 @@
+"""
+Shared fixtures for the dashboard tests: the BFF served in-process over
+httpx, fanning out through ServiceClients(transport=...) to one stand-in
+FastAPI app that plays the asset, invoice and employee services. Each
+stand-in route answers as its entry in `StandIn.behaviour` says and records
+the requests it received.
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("JWT_SECRET", "test-secret")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from jose import jwt  # noqa: E402
+
+from app.api.v1.endpoints import dashboard  # noqa: E402
+from app.clients import ServiceClients  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+
+PATHS = {path: section for section, (_, path, _) in dashboard.SECTIONS.items()}
+
+
+class StandIn:
+    """Answers every dashboard path; behaviour[section] = (status, delay in seconds)"""
+
+    def __init__(self):
+        self.behaviour: Dict[str, tuple] = {}
+        self.calls: List[Dict[str, Any]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.app = FastAPI()
+        self.app.add_api_route("/{path:path}", self.handle)
+
+    async def handle(self, request: Request):
+        section = PATHS.get(request.url.path)
+        if section is None:
+            return JSONResponse({"detail": "Not Found"}, status_code=404)
+        self.calls.append({"section": section, "headers": dict(request.headers)})
+        status_code, delay = self.behaviour.get(section, (200, 0.0))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+        return JSONResponse({"section": section}, status_code=status_code)
+
+    def headers_for(self, section: str) -> List[Dict[str, str]]:
+        return [call["headers"] for call in self.calls if call["section"] == section]
+
+
+def bearer(roles: Optional[List[str]] = None) -> Dict[str, str]:
+    token = jwt.encode(
+        {"sub": "42", "email": "test@trustybytes.in", "roles": roles or ["admin"]},
+        settings.JWT_SECRET,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def stand_in():
+    return StandIn()
+
+
+@pytest.fixture
+async def client(stand_in, monkeypatch):
+    clients = ServiceClients(transport=httpx.ASGITransport(app=stand_in.app))
+    monkeypatch.setattr(dashboard, "service_clients", clients)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=bearer()) as client:
+        yield client
+    await clients.close()
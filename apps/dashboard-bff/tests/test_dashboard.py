@@ -0,0 +1,83 @@
+import time
+
+from app.api.v1.endpoints import dashboard
+from app.core.service_client import DEADLINE_HEADER
+
+SECTIONS = sorted(dashboard.SECTIONS)
+
+
+async def test_fans_out_to_every_service_concurrently(client, stand_in):
+    for section in SECTIONS:
+        stand_in.behaviour[section] = (200, 0.05)
+
+    response = await client.get("/api/v1/dashboard", headers={"X-Request-ID": "req-1"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["partial"] is False
+    assert all(body[section] == {"section": section} for section in SECTIONS)
+    assert all(body["sources"][section]["ok"] for section in SECTIONS)
+    assert sorted(call["section"] for call in stand_in.calls) == SECTIONS
+    assert stand_in.max_in_flight == len(SECTIONS)
+    for call in stand_in.calls:
+        assert call["headers"]["x-request-id"] == "req-1"
+        assert call["headers"]["authorization"] == client.headers["Authorization"]
+
+
+async def test_failing_service_only_blanks_its_sections(client, stand_in):
+    stand_in.behaviour["invoice_aging"] = (500, 0.0)
+    stand_in.behaviour["invoice_revenue"] = (404, 0.0)
+
+    response = await client.get("/api/v1/dashboard")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["partial"] is True
+    assert body["invoice_aging"] is None and body["invoice_revenue"] is None
+    assert body["assets"] == {"section": "assets"} and body["headcount"] == {"section": "headcount"}
+    aging, revenue = body["sources"]["invoice_aging"], body["sources"]["invoice_revenue"]
+    assert not aging["ok"] and "unavailable" in aging["error"]
+    assert not revenue["ok"] and revenue["status_code"] == 404
+    assert revenue["error"] == "invoice service returned 404"
+    # 5xx is retried, 4xx is not
+    assert len(stand_in.headers_for("invoice_aging")) == 2
+    assert len(stand_in.headers_for("invoice_revenue")) == 1
+
+
+async def test_all_services_failing_is_503(client, stand_in):
+    for section in SECTIONS:
+        stand_in.behaviour[section] = (503, 0.0)
+
+    response = await client.get("/api/v1/dashboard")
+
+    assert response.status_code == 503
+
+
+async def test_caller_deadline_is_passed_downstream(client, stand_in):
+    response = await client.get("/api/v1/dashboard", headers={DEADLINE_HEADER: "800"})
+
+    assert response.status_code == 200
+    for call in stand_in.calls:
+        assert 0 < int(call["headers"][DEADLINE_HEADER.lower()]) <= 800
+
+
+async def test_slow_service_is_cut_off_at_the_deadline(client, stand_in):
+    stand_in.behaviour["headcount"] = (200, 5.0)
+
+    started = time.perf_counter()
+    response = await client.get("/api/v1/dashboard", headers={DEADLINE_HEADER: "400"})
+    elapsed = time.perf_counter() - started
+
+    assert response.status_code == 200
+    body = response.json()
+    assert elapsed < 1.0
+    assert body["partial"] is True and body["headcount"] is None
+    assert body["sources"]["headcount"]["error"] == "employee service timed out"
+    assert body["assets"] == {"section": "assets"}
+
+
+async def test_spent_deadline_skips_downstream_calls(client, stand_in):
+    response = await client.get("/api/v1/dashboard", headers={DEADLINE_HEADER: "0"})
+
+    assert response.status_code == 503
+    assert stand_in.calls == []
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.service_client import (
+    CircuitBreaker, DeadlineExceeded, ServiceClient, ServiceUnavailable, request_deadline,
+)
+
+
+def half_open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    breaker.opened_at -= breaker.reset_timeout
+    assert breaker.state == "half_open"
+    return breaker
+
+
+def client_for(handler, breaker: CircuitBreaker, **options) -> ServiceClient:
+    return ServiceClient(
+        "stand-in", "http://stand-in", retries=0, breaker=breaker,
+        transport=httpx.MockTransport(handler), **options,
+    )
+
+
+async def ok(request):
+    return httpx.Response(200, json={"ok": True})
+
+
+async def test_spent_deadline_does_not_take_the_probe():
+    breaker = half_open_breaker()
+    client = client_for(ok, breaker)
+    token = request_deadline.set(time.monotonic() - 1)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            await client.get("/")
+    finally:
+        request_deadline.reset(token)
+
+    response = await client.get("/")
+    assert response.status_code == 200
+    assert breaker.state == "closed"
+    await client.aclose()
+
+
+@pytest.mark.parametrize("hedge_after", [None, 0.01])
+async def test_cancelled_probe_releases_the_breaker(hedge_after):
+    started = asyncio.Event()
+    calls = []
+
+    async def hang_once(request):
+        calls.append(request)
+        if len(calls) == 1:
+            started.set()
+            await asyncio.sleep(60)
+        return await ok(request)
+
+    breaker = half_open_breaker()
+    client = client_for(hang_once, breaker, hedge_after=hedge_after, timeout=60)
+    probe = asyncio.ensure_future(client.get("/"))
+    await started.wait()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert breaker.state == "half_open"
+    response = await client.get("/")
+    assert response.status_code == 200
+    assert breaker.state == "closed"
+    await client.aclose()
+
+
+async def test_failed_probe_reopens_the_breaker():
+    async def fail(request):
+        return httpx.Response(503)
+
+    breaker = half_open_breaker()
+    client = client_for(fail, breaker)
+    with pytest.raises(ServiceUnavailable):
+        await client.get("/")
+    assert breaker.state == "open"
+    await client.aclose()
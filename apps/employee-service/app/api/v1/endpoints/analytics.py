@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from datetime import datetime
+
+from app.cache import headcount_cache
+from app.db.session import get_db
+from app.models.department import Department
+from app.models.employee import Employee
+from app.schemas.analytics import HeadcountReport, DepartmentHeadcount, LocationHeadcount
+from app.core.security import get_current_user, TokenData
+
+router = APIRouter()
+
+async def _headcount(db: AsyncSession) -> HeadcountReport:
+    # One grouped pass; the full join keeps empty departments and employees
+    # without a department in the report
+    is_active = func.coalesce(Employee.is_active, True)
+    query = (
+        select(
+            Department.id,
+            Department.name,
+            Department.code,
+            Employee.department_id,
+            Employee.location,
+            func.count(Employee.id).filter(is_active).label("active"),
+            func.count(Employee.id).filter(~is_active).label("inactive"),
+        )
+        .select_from(Department)
+        .join(Employee, Employee.department_id == Department.id, full=True)
+        .group_by(Department.id, Department.name, Department.code, Employee.department_id, Employee.location)
+        .order_by(Department.name, Employee.location)
+    )
+    result = await db.execute(query)
+
+    departments = {}
+    for dept_id, name, code, employee_dept_id, location, active, inactive in result:
+        key = dept_id if dept_id is not None else employee_dept_id
+        entry = departments.get(key)
+        if entry is None:
+            entry = departments[key] = DepartmentHeadcount(
+                department_id=key, name=name, code=code, active=0, inactive=0, locations=[],
+            )
+        if active or inactive:
+            entry.active += active
+            entry.inactive += inactive
+            entry.locations.append(LocationHeadcount(location=location, active=active, inactive=inactive))
+
+    items = list(departments.values())
+    return HeadcountReport(
+        generated_at=datetime.utcnow(),
+        total_active=sum(d.active for d in items),
+        total_inactive=sum(d.inactive for d in items),
+        departments=items,
+    )
+
+@router.get("/headcount", response_model=HeadcountReport)
+async def headcount(
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """Active and inactive headcount per department and location (cached)"""
+    return await headcount_cache.get(lambda: _headcount(db))
@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.cache import invalidate_employee_caches
+from app.core.compression import PrecompressedCache
+from app.core.config import settings
+from app.db.session import get_db
+from app.models.department import Department
+from app.repositories import department_rows
+from app.schemas.department import (
+    DepartmentCreate,
+    DepartmentUpdate,
+    DepartmentResponse,
+    DepartmentList,
+)
+from app.core.security import get_current_user, require_roles, TokenData
+
+router = APIRouter()
+
+# The department list rarely changes: compress it once per version, not per request
+precompressed = PrecompressedCache(minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+@router.get("", response_model=DepartmentList)
+async def list_departments(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """List all departments"""
+    departments = await department_rows.all(db, department_rows.select().order_by(Department.name))
+    payload = DepartmentList(
+        items=departments,
+        total=len(departments),
+    )
+    if not settings.COMPRESSION_ENABLED:
+        return payload
+    return precompressed.response(request, payload.model_dump_json().encode())
+
+@router.get("/{id}", response_model=DepartmentResponse)
+async def get_department(
+    id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """Get a specific department by ID"""
+    department = await db.get(Department, id)
+    if not department:
+        raise HTTPException(status_code=404, detail="Department not found")
+    return DepartmentResponse.model_validate(department)
+
+@router.post("", response_model=DepartmentResponse, status_code=201)
+async def create_department(
+    department_data: DepartmentCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(require_roles(["hr_manager", "admin"])),
+):
+    """Create a new department (HR/Admin only)"""
+    existing = await db.execute(select(Department.id).where(Department.code == department_data.code))
+    if existing.scalar_one_or_none():
+        raise HTTPException(status_code=400, detail="Department code already exists")
+
+    department = Department(**department_data.model_dump())
+    db.add(department)
+    await db.commit()
+    await db.refresh(department)
+    invalidate_employee_caches()
+    return DepartmentResponse.model_validate(department)
+
+@router.put("/{id}", response_model=DepartmentResponse)
+async def update_department(
+    id: int,
+    department_data: DepartmentUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(require_roles(["hr_manager", "admin"])),
+):
+    """Rename or describe a department (HR/Admin only)"""
+    department = await db.get(Department, id)
+    if not department:
+        raise HTTPException(status_code=404, detail="Department not found")
+    for field, value in department_data.model_dump(exclude_unset=True).items():
+        setattr(department, field, value)
+    await db.commit()
+    await db.refresh(department)
+    invalidate_employee_caches()
+    return DepartmentResponse.model_validate(department)
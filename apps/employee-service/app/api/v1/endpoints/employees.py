@@ -1,37 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from typing import List, Optional
 import math
 
+from app.api.v1.fieldsets import fieldset
+from app.cache import invalidate_employee_caches
+from app.core.config import settings
+from app.core.responses import model_response
+from app.db.counting import CountMode, count_rows
 from app.db.session import get_db
+from app.ingest import read_records, chunked
 from app.models.employee import Employee
+from app.repositories import ReadModel, employee_rows
 from app.schemas.employee import (
     EmployeeCreate,
     EmployeeUpdate,
     EmployeeResponse,
     EmployeeList,
+    EmployeeSuggestion,
+    EmployeeSuggestList,
+    BulkReport,
 )
-from app.core.security import get_current_user, require_roles, TokenData
+from app.clients import asset_service
+from app.core.security import security, get_current_user, require_roles, TokenData
+from app.core.service_client import ServiceError
+from app.services import EmployeeService
+from app.typeahead import Entry, employee_index, index_sync, suggest_from_db
 
 router = APIRouter()
 
+def _employee_changed(employee: Employee) -> None:
+    # Visible to this process right away; other processes hear it via NOTIFY
+    invalidate_employee_caches()
+    if employee_index.ready:
+        employee_index.upsert(Entry(
+            employee.id, employee.employee_id, employee.full_name,
+            employee.email, employee.department_id, employee.is_active,
+        ))
+
+def _bulk_report(results) -> BulkReport:
+    succeeded = sum(1 for r in results if r.status in ("created", "updated"))
+    return BulkReport(total=len(results), succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
 @router.get("", response_model=EmployeeList)
 async def list_employees(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     department_id: Optional[int] = None,
     search: Optional[str] = None,
+    count: CountMode = Query(CountMode.EXACT, description="exact | estimate | none"),
+    rows: ReadModel = Depends(fieldset(employee_rows)),
     db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user),
 ):
     """List all employees with pagination and searching"""
-    query = select(Employee)
-    count_query = select(func.count(Employee.id))
+    query = rows.select()
     
     if department_id:
         query = query.where(Employee.department_id == department_id)
-        count_query = count_query.where(Employee.department_id == department_id)
     
     if search:
         search_filter = f"%{search}%"
@@ -40,46 +68,141 @@ async def list_employees(
             (Employee.employee_id.ilike(search_filter)) |
             (Employee.email.ilike(search_filter))
         )
-        count_query = count_query.where(
-            (Employee.full_name.ilike(search_filter)) |
-            (Employee.employee_id.ilike(search_filter)) |
-            (Employee.email.ilike(search_filter))
-        )
     
     # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    total, total_is_estimate = await count_rows(db, query, count, settings.LIST_COUNT_CAP)
     
-    # Apply pagination
+    # Apply pagination; one extra row tells whether another page exists
     offset = (page - 1) * size
-    query = query.offset(offset).limit(size).order_by(Employee.created_at.desc())
+    query = query.offset(offset).limit(size + 1).order_by(Employee.created_at.desc())
     
     # Execute query
-    result = await db.execute(query)
-    employees = result.scalars().all()
+    employees = await rows.all(db, query)
     
-    return EmployeeList(
-        items=[EmployeeResponse.model_validate(e) for e in employees],
+    return model_response(rows.page(EmployeeList)(
+        items=employees[:size],
         total=total,
+        total_is_estimate=total_is_estimate,
+        has_more=len(employees) > size,
         page=page,
         size=size,
-        pages=math.ceil(total / size) if total > 0 else 0,
+        pages=math.ceil(total / size) if total is not None else None,
+    ), sparse=rows.sparse)
+
+@router.get("/suggest", response_model=EmployeeSuggestList)
+async def suggest_employees(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+    department_id: Optional[int] = None,
+    include_inactive: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """Ranked employee typeahead for pickers, served from the in-memory index"""
+    if employee_index.ready:
+        matches = employee_index.suggest(q, limit, include_inactive, department_id)
+        source = "index"
+    else:
+        matches = await suggest_from_db(db, q, limit, include_inactive, department_id)
+        source = "database"
+    return EmployeeSuggestList(
+        items=[EmployeeSuggestion(**entry._asdict(), score=round(score, 3)) for entry, score in matches],
+        source=source,
     )
 
+@router.post("/import", response_model=BulkReport)
+async def import_employees(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(require_roles(["hr_manager", "admin"])),
+):
+    """
+    Bulk create employees from a streamed CSV (with header) or NDJSON body (HR/Admin only).
+    Each chunk of rows is committed on its own; the report has one entry per row.
+    """
+    try:
+        records = read_records(request)
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    service = EmployeeService(db)
+    seen_codes, seen_emails = set(), set()
+    results = []
+    async for chunk in chunked(records, settings.EMPLOYEE_BULK_CHUNK_SIZE):
+        chunk_results = await service.import_chunk(chunk, seen_codes, seen_emails)
+        written = [r.id for r in chunk_results if r.id is not None]
+        if written:
+            invalidate_employee_caches()
+            await index_sync.refresh(written)
+        results.extend(chunk_results)
+    return _bulk_report(results)
+
+@router.patch("/bulk", response_model=BulkReport)
+async def bulk_update_employees(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(require_roles(["hr_manager", "admin"])),
+):
+    """
+    Bulk patch employees (department and location moves, deactivations) matched on
+    employee_id, from a streamed CSV or NDJSON body (HR/Admin only). Empty CSV cells
+    leave a field unchanged; send null in NDJSON to clear one.
+    """
+    try:
+        records = read_records(request)
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    service = EmployeeService(db)
+    seen_codes = set()
+    results = []
+    async for chunk in chunked(records, settings.EMPLOYEE_BULK_CHUNK_SIZE):
+        chunk_results = await service.update_chunk(chunk, seen_codes)
+        written = [r.id for r in chunk_results if r.id is not None]
+        if written:
+            invalidate_employee_caches()
+            await index_sync.refresh(written)
+        results.extend(chunk_results)
+    return _bulk_report(results)
+
 @router.get("/{id}", response_model=EmployeeResponse)
 async def get_employee(
     id: int,
+    rows: ReadModel = Depends(fieldset(employee_rows)),
     db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user),
 ):
     """Get a specific employee by ID"""
-    result = await db.execute(select(Employee).where(Employee.id == id))
-    employee = result.scalar_one_or_none()
+    employee = await rows.first(db, rows.select().where(Employee.id == id))
     
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
         
-    return EmployeeResponse.model_validate(employee)
+    return model_response(employee, sparse=rows.sparse)
+
+@router.get("/{id}/assets")
+async def list_employee_assets(
+    id: int,
+    page: int = Query(1, ge=1),
+    size: int = Query(100, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """Assets currently assigned to an employee, from asset-service (e.g. for offboarding)"""
+    if not await db.get(Employee, id):
+        raise HTTPException(status_code=404, detail="Employee not found")
+    try:
+        response = await asset_service.get(
+            "/api/v1/assets",
+            params={"assigned_employee_id": id, "page": page, "size": size},
+            headers={"Authorization": f"Bearer {credentials.credentials}"},
+        )
+    except ServiceError as e:
+        raise HTTPException(status_code=503, detail=f"Asset service unavailable: {e}")
+    if response.status_code != 200:
+        raise HTTPException(status_code=502, detail=f"Asset service returned {response.status_code}")
+    return response.json()
 
 @router.post("", response_model=EmployeeResponse, status_code=201)
 async def create_employee(
@@ -97,4 +220,22 @@ async def create_employee(
     db.add(employee)
     await db.commit()
     await db.refresh(employee)
+    _employee_changed(employee)
+    return EmployeeResponse.model_validate(employee)
+
+@router.put("/{id}", response_model=EmployeeResponse)
+async def update_employee(
+    id: int,
+    employee_data: EmployeeUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(require_roles(["hr_manager", "admin"])),
+):
+    """Update an employee (HR/Admin only)"""
+    try:
+        employee = await EmployeeService(db).update_employee(id, employee_data)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    _employee_changed(employee)
     return EmployeeResponse.model_validate(employee)
@@ -2,12 +2,30 @@
 API Router configuration for Employee Service
 """
 from fastapi import APIRouter
-from app.api.v1.endpoints import employees
+from app.api.v1.endpoints import admin, analytics, departments, employees
 
 api_router = APIRouter()
 
+api_router.include_router(
+    analytics.router,
+    prefix="/employees/analytics",
+    tags=["analytics"]
+)
+
 api_router.include_router(
     employees.router,
     prefix="/employees",
     tags=["employees"]
 )
+
+api_router.include_router(
+    departments.router,
+    prefix="/departments",
+    tags=["departments"]
+)
+
+api_router.include_router(
+    admin.router,
+    prefix="/admin",
+    tags=["admin"]
+)
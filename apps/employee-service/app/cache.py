@@ -0,0 +1,53 @@
+"""
+In-process caching for derived reports
+
+A cached value is dropped whenever employees change: directly by the write
+endpoints of this process, and through the employees_changed notifications
+for writes made elsewhere. The TTL only bounds staleness when notifications
+are not available.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from app.core.config import settings
+
+
+class CachedValue:
+    """A single lazily computed value with explicit invalidation"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._value: Any = None
+        self._expires = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._expires = 0.0
+
+    def _fresh(self) -> bool:
+        return time.monotonic() < self._expires
+
+    async def get(self, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if self._fresh():
+            return self._value
+        # Concurrent misses wait for one load instead of all querying
+        async with self._lock:
+            if self._fresh():
+                return self._value
+            generation = self._generation
+            value = await loader()
+            # An invalidation during the load means the value may already be stale
+            if generation == self._generation:
+                self._value = value
+                self._expires = time.monotonic() + self.ttl
+            return value
+
+
+headcount_cache = CachedValue(ttl=settings.HEADCOUNT_CACHE_TTL_SECONDS)
+
+
+def invalidate_employee_caches() -> None:
+    headcount_cache.invalidate()
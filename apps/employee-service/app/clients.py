@@ -0,0 +1,13 @@
+"""
+Clients for the services employee-service depends on
+"""
+from app.core.config import settings
+from app.core.service_client import register_client
+
+asset_service = register_client(
+    "asset-service",
+    settings.ASSET_SERVICE_URL,
+    timeout=settings.SERVICE_CALL_TIMEOUT_SECONDS,
+    retries=settings.SERVICE_CALL_RETRIES,
+    hedge_after=settings.SERVICE_HEDGE_AFTER_SECONDS,
+)
@@ -0,0 +1,279 @@
+"""
+Inter-service HTTP client
+
+Each target service gets one long-lived httpx.AsyncClient (HTTP/1.1 with
+keep-alive), so a call reuses a warm connection instead of opening a new TCP
+connection. On top of that:
+
+- deadlines: the caller's remaining time budget travels in the
+  X-Request-Deadline header (milliseconds left) and bounds every outgoing call
+- retries: idempotent calls are retried on connection errors and 5xx
+  responses with jittered exponential backoff, within the deadline
+- hedging: if an idempotent call has not answered after `hedge_after`
+  seconds, a second identical request is sent and the first answer wins
+- circuit breaking: after repeated failures calls fail fast for a while
+  instead of piling up on a struggling service
+
+This module is kept identical in every service that calls another one.
+"""
+import asyncio
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+import httpx
+
+DEADLINE_HEADER = "X-Request-Deadline"
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Absolute time.monotonic() by which the current request must be answered
+request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class ServiceError(Exception):
+    """Base class for inter-service call failures"""
+
+
+class ServiceUnavailable(ServiceError):
+    """The target failed, timed out or its circuit is open"""
+
+
+class DeadlineExceeded(ServiceError):
+    """The caller's deadline passed before the call could complete"""
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left before the current request's deadline, if it has one"""
+    deadline = request_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class DeadlineMiddleware:
+    """ASGI middleware that picks up an incoming X-Request-Deadline header"""
+
+    def __init__(self, app, default_timeout: Optional[float] = None):
+        self.app = app
+        self.default_timeout = default_timeout
+        self._header = DEADLINE_HEADER.lower().encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        budget = self.default_timeout
+        for name, value in scope["headers"]:
+            if name == self._header:
+                try:
+                    budget = max(0.0, float(value) / 1000)
+                except ValueError:
+                    pass
+                break
+        token = request_deadline.set(time.monotonic() + budget if budget is not None else None)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_deadline.reset(token)
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures; lets one probe through after `reset_timeout`"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def release(self) -> None:
+        """Give back the probe slot of a call that ended without an outcome, e.g. cancelled"""
+        self._probing = False
+
+
+class ServiceClient:
+    """Pooled client for one target service"""
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        timeout: float = 2.0,
+        connect_timeout: float = 0.5,
+        retries: int = 2,
+        backoff: float = 0.05,
+        hedge_after: Optional[float] = None,
+        max_connections: int = 50,
+        max_keepalive: int = 20,
+        breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge_after = hedge_after
+        self.breaker = breaker or CircuitBreaker()
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            transport=transport,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=30.0,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    def _budget(self, timeout: Optional[float]) -> float:
+        budget = timeout if timeout is not None else self.timeout
+        remaining = remaining_budget()
+        if remaining is not None:
+            budget = min(budget, remaining)
+        if budget <= 0:
+            raise DeadlineExceeded(f"No time left to call {self.name}")
+        return budget
+
+    async def _send(self, method: str, path: str, budget: float, **kwargs) -> httpx.Response:
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers[DEADLINE_HEADER] = str(int(budget * 1000))
+        return await asyncio.wait_for(
+            self._client.request(method, path, headers=headers, **kwargs), budget
+        )
+
+    async def _send_hedged(self, method: str, path: str, budget: float, **kwargs) -> httpx.Response:
+        primary = asyncio.ensure_future(self._send(method, path, budget, **kwargs))
+        pending = {primary}
+        error: Optional[BaseException] = None
+        try:
+            done, _ = await asyncio.wait(pending, timeout=min(self.hedge_after, budget))
+            if done:
+                return primary.result()
+
+            hedge = asyncio.ensure_future(self._send(method, path, budget - self.hedge_after, **kwargs))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        idempotent: Optional[bool] = None,
+    ) -> httpx.Response:
+        """
+        Send a request and return the response for any status below 500.
+        Raises ServiceUnavailable or DeadlineExceeded otherwise.
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        attempts = self.retries + 1 if idempotent else 1
+        last_error = "no attempt made"
+
+        for attempt in range(attempts):
+            # Before allow(), which may hand out the half-open probe slot
+            budget = self._budget(timeout)
+            if not self.breaker.allow():
+                raise ServiceUnavailable(f"{self.name} circuit is open")
+            try:
+                if idempotent and self.hedge_after is not None and self.hedge_after < budget:
+                    response = await self._send_hedged(method, path, budget, params=params, json=json, headers=headers)
+                else:
+                    response = await self._send(method, path, budget, params=params, json=json, headers=headers)
+            except (asyncio.TimeoutError, httpx.TimeoutException):
+                last_error = "timed out"
+            except httpx.TransportError as e:
+                last_error = e.__class__.__name__
+            except BaseException:
+                # Cancelled or failed unexpectedly: a probe must not hold the breaker open
+                self.breaker.release()
+                raise
+            else:
+                if response.status_code < 500:
+                    self.breaker.record_success()
+                    return response
+                last_error = f"returned {response.status_code}"
+            self.breaker.record_failure()
+
+            if attempt + 1 < attempts:
+                # Full jitter keeps retries from many callers from synchronizing
+                delay = random.uniform(0, self.backoff * (2 ** attempt))
+                remaining = remaining_budget()
+                if remaining is not None and delay >= remaining:
+                    break
+                await asyncio.sleep(delay)
+
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded(f"{self.name} did not answer before the deadline ({last_error})")
+        raise ServiceUnavailable(f"{self.name} {last_error}")
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+
+_clients: Dict[str, ServiceClient] = {}
+
+
+def register_client(name: str, base_url: str, **options) -> ServiceClient:
+    """Create (once) the shared client for a target service"""
+    if name not in _clients:
+        _clients[name] = ServiceClient(name, base_url, **options)
+    return _clients[name]
+
+
+def get_client(name: str) -> ServiceClient:
+    return _clients[name]
+
+
+async def close_clients() -> None:
+    for client in _clients.values():
+        await client.aclose()
+    _clients.clear()
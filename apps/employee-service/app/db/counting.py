@@ -0,0 +1,51 @@
+"""
+Row counts for paginated list endpoints
+
+count=exact     count(*) over the filtered query
+count=estimate  planner statistics (pg_class.reltuples) for unfiltered lists,
+                otherwise a count that stops after LIST_COUNT_CAP rows
+count=none      no count at all; clients page on has_more instead
+"""
+from enum import Enum
+from typing import Optional, Tuple
+
+from sqlalchemy import Select, func, select, literal_column, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ESTIMATE_SQL = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+
+
+class CountMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
+def _count_of(query: Select) -> Select:
+    rows = query.with_only_columns(literal_column("1"), maintain_column_froms=True)
+    return select(func.count()).select_from(rows.subquery())
+
+
+async def count_rows(db: AsyncSession, query: Select, mode: CountMode, cap: int) -> Tuple[Optional[int], bool]:
+    """
+    Count the rows `query` returns without pagination.
+    Returns (total, total_is_estimate); total is None for count=none.
+    """
+    if mode == CountMode.NONE:
+        return None, False
+    query = query.order_by(None).limit(None).offset(None)
+
+    if mode == CountMode.ESTIMATE:
+        if query.whereclause is None:
+            table = query.get_final_froms()[0]
+            name = f"{table.schema}.{table.name}" if table.schema else table.name
+            estimate = (await db.execute(ESTIMATE_SQL, {"table": name})).scalar()
+            # -1 (or NULL) means the table has never been analyzed
+            if estimate is not None and estimate >= 0:
+                return int(estimate), True
+        total = (await db.execute(_count_of(query.limit(cap + 1)))).scalar() or 0
+        if total > cap:
+            return cap, True
+        return total, False
+
+    return (await db.execute(_count_of(query))).scalar() or 0, False
@@ -0,0 +1,93 @@
+"""
+Streaming readers for bulk employee uploads
+
+Request bodies are parsed as they arrive, CSV (with a header row) or NDJSON
+depending on the Content-Type, so a file with tens of thousands of people is
+never held in memory as a whole.
+"""
+import csv
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi import Request
+
+CSV_TYPES = ("text/csv", "application/csv")
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+async def _lines(request: Request) -> AsyncIterator[str]:
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig").rstrip("\r")
+
+
+async def _csv_records(request: Request) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    header: Optional[List[str]] = None
+    pending = ""
+    row = 0
+    async for line in _lines(request):
+        # A quoted field may span lines; a record is complete once its quotes balance
+        pending = f"{pending}\n{line}" if pending else line
+        if pending.count('"') % 2:
+            continue
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, None, f"expected {len(header)} columns, got {len(values)}"
+            continue
+        # Empty cells mean "not provided"
+        yield row, {k: v.strip() for k, v in zip(header, values) if v.strip() != ""}, None
+    if pending:
+        yield row + 1, None, "unterminated quoted field"
+
+
+async def _ndjson_records(request: Request) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    row = 0
+    async for line in _lines(request):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row, None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "each line must be a JSON object"
+            continue
+        yield row, record, None
+
+
+def read_records(request: Request) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Yield (row number, record, parse error) for each record in the body.
+    Raises ValueError for unsupported content types.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in CSV_TYPES:
+        return _csv_records(request)
+    if content_type in NDJSON_TYPES:
+        return _ndjson_records(request)
+    raise ValueError("Upload CSV (text/csv) or NDJSON (application/x-ndjson)")
+
+
+async def chunked(records: AsyncIterator, size: int) -> AsyncIterator[list]:
+    chunk = []
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
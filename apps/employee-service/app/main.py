@@ -2,18 +2,33 @@
 TB ERP - Employee Management Service
 FastAPI-based microservice for employee and HR management
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import DBAPIError
 from contextlib import asynccontextmanager
 
 from app.api.v1.router import api_router
+from app.core.admission import AdmissionMiddleware, admission_stats
 from app.core.config import settings
-from app.db.session import init_db
+from app.core.compression import CompressionMiddleware
+from app.core.service_client import DeadlineMiddleware, close_clients
+from app.db.query_stats import QueryStatsMiddleware, query_metrics
+from app.db.session import init_db, pool_status
+from app.db.slow_queries import QUERY_CANCELED
+from app.cache import invalidate_employee_caches
+from app.typeahead import index_sync
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    # Loads in the background; /suggest uses the database until it is ready
+    if settings.EMPLOYEE_SUGGEST_INDEX:
+        index_sync.listeners.append(invalidate_employee_caches)
+        index_sync.start()
     yield
+    await index_sync.stop()
+    await close_clients()
 
 app = FastAPI(
     title="Employee Management Service",
@@ -25,6 +40,20 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Shed load before it queues on the connection pool. Added before CORS so
+# that 429/503 responses still carry CORS headers.
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(
+        AdmissionMiddleware,
+        pool_status=pool_status,
+        pool_capacity=settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+        max_pool_waiters=settings.ADMISSION_MAX_POOL_WAITERS,
+        route_limits=settings.ADMISSION_ROUTE_LIMITS,
+        rate=settings.RATE_LIMIT_PER_SECOND,
+        burst=settings.RATE_LIMIT_BURST,
+        retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    )
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -34,8 +63,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Honour X-Request-Deadline from callers and pass the remaining budget on
+app.add_middleware(DeadlineMiddleware)
+
+# Compress larger responses for clients on slow links
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# Count statements, rows and database time per request; headers in debug mode
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(
+        QueryStatsMiddleware,
+        headers=settings.DEBUG,
+        repeat_threshold=settings.N_PLUS_ONE_THRESHOLD,
+    )
+
+# A statement cancelled by its statement_timeout means "try again later", not a bug
+@app.exception_handler(DBAPIError)
+async def statement_timeout_handler(request: Request, exc: DBAPIError):
+    if getattr(exc.orig, "sqlstate", None) != QUERY_CANCELED:
+        raise exc
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Query exceeded its time budget"},
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+    )
+
 app.include_router(api_router, prefix="/api/v1")
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "employee-service"}
+    return {
+        "status": "healthy",
+        "service": "employee-service",
+        "db_pool": pool_status(),
+        "admission": admission_stats(),
+        "queries": query_metrics(),
+    }
@@ -0,0 +1,17 @@
+"""
+Department database model
+"""
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+class Department(Base):
+    """Organisational unit employees belong to"""
+    __tablename__ = "departments"
+    __table_args__ = {"schema": "employees"}
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    code = Column(String(20), unique=True, nullable=False)
+    description = Column(String(255), nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
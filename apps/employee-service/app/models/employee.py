@@ -1,9 +1,10 @@
 """
 Employee database models using SQLAlchemy with Schema Isolation
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
 from sqlalchemy.sql import func
 from app.db.session import Base
+from app.models.department import Department  # noqa: F401 - FK target must be registered
 
 class Employee(Base):
     """Employee model representing company staff"""
@@ -14,7 +15,7 @@ class Employee(Base):
     employee_id = Column(String(50), unique=True, nullable=False, index=True)
     full_name = Column(String(255), nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
-    department_id = Column(Integer, nullable=True)
+    department_id = Column(Integer, ForeignKey("employees.departments.id", ondelete="SET NULL"), nullable=True)
     location = Column(String(100), nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+class LocationHeadcount(BaseModel):
+    location: Optional[str] = None
+    active: int
+    inactive: int
+
+class DepartmentHeadcount(BaseModel):
+    # department_id is null for employees without a department
+    department_id: Optional[int] = None
+    name: Optional[str] = None
+    code: Optional[str] = None
+    active: int
+    inactive: int
+    locations: List[LocationHeadcount]
+
+class HeadcountReport(BaseModel):
+    generated_at: datetime
+    total_active: int
+    total_inactive: int
+    departments: List[DepartmentHeadcount]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from typing import Optional, List
 from datetime import datetime
 
@@ -14,11 +14,24 @@ class EmployeeCreate(EmployeeBase):
     pass
 
 class EmployeeUpdate(BaseModel):
-    full_name: Optional[str] = None
+    """Partial update; only department_id and location can be cleared with null"""
+    full_name: Optional[str] = Field(None, min_length=1, max_length=255)
     department_id: Optional[int] = None
     location: Optional[str] = None
     is_active: Optional[bool] = None
 
+    @field_validator("full_name", "is_active")
+    @classmethod
+    def not_null(cls, value):
+        # Omitted fields keep their value; an explicit null would violate NOT NULL
+        if value is None:
+            raise ValueError("cannot be null")
+        return value
+
+class EmployeeBulkUpdate(EmployeeUpdate):
+    """One row of a bulk patch, matched on employee_id"""
+    employee_id: str = Field(..., min_length=1, max_length=50)
+
 class EmployeeResponse(EmployeeBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
@@ -26,7 +39,39 @@ class EmployeeResponse(EmployeeBase):
 
 class EmployeeList(BaseModel):
     items: List[EmployeeResponse]
-    total: int
+    # None with count=none; a lower bound or planner estimate when total_is_estimate
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    has_more: bool = False
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+
+class EmployeeSuggestion(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    employee_id: str
+    full_name: str
+    email: str
+    department_id: Optional[int] = None
+    is_active: bool = True
+    score: float
+
+class EmployeeSuggestList(BaseModel):
+    items: List[EmployeeSuggestion]
+    # "index" when served from memory, "database" for the pg_trgm fallback
+    source: str
+
+class BulkRowResult(BaseModel):
+    row: int
+    employee_id: Optional[str] = None
+    # created | updated | conflict | not_found | invalid
+    status: str
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkReport(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BulkRowResult]
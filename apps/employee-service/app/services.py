@@ -0,0 +1,212 @@
+"""
+Service Layer: Business Logic for Employee Management
+Bulk operations work a chunk at a time with a fixed number of statements per
+chunk: one conflict lookup, one multi-row write, one commit.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, values, column, literal, or_, any_, Integer, String, Boolean
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from pydantic import ValidationError
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.models.department import Department
+from app.models.employee import Employee
+from app.schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeBulkUpdate, BulkRowResult
+
+UPDATE_COLUMN_TYPES = {
+    "full_name": String,
+    "department_id": Integer,
+    "location": String,
+    "is_active": Boolean,
+}
+
+Record = Tuple[int, Optional[dict], Optional[str]]
+
+
+def _error_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()
+    )
+
+
+def _any(col, items: Iterable, item_type):
+    """`col = ANY(:items)` with a single array parameter"""
+    return col == any_(literal(list(items), ARRAY(item_type)))
+
+
+class EmployeeService:
+    """Service for employee management operations"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _unknown_departments(self, department_ids: Iterable[Optional[int]]) -> Set[int]:
+        wanted = {d for d in department_ids if d is not None}
+        if not wanted:
+            return set()
+        result = await self.db.execute(select(Department.id).where(_any(Department.id, wanted, Integer)))
+        return wanted - set(result.scalars())
+
+    async def update_employee(self, id: int, employee_data: EmployeeUpdate) -> Employee:
+        """Apply a partial update; raises LookupError / ValueError"""
+        employee = await self.db.get(Employee, id)
+        if employee is None:
+            raise LookupError("Employee not found")
+        changes = employee_data.model_dump(exclude_unset=True)
+        if await self._unknown_departments([changes.get("department_id")]):
+            raise ValueError("Department not found")
+        for field, value in changes.items():
+            setattr(employee, field, value)
+        await self.db.commit()
+        await self.db.refresh(employee)
+        return employee
+
+    async def import_chunk(
+        self,
+        chunk: List[Record],
+        seen_codes: Set[str],
+        seen_emails: Set[str],
+    ) -> List[BulkRowResult]:
+        """
+        Create the employees in one chunk of an upload.
+
+        Rows are checked set-wise against each other (across the whole upload,
+        via `seen_codes` / `seen_emails`) and against the table, then inserted
+        with one multi-row INSERT ... ON CONFLICT DO NOTHING so a concurrent
+        insert turns into a per-row conflict instead of failing the chunk.
+        """
+        results: Dict[int, BulkRowResult] = {}
+        valid: List[Tuple[int, EmployeeCreate]] = []
+        for row, record, error in chunk:
+            if error is None:
+                try:
+                    data = EmployeeCreate.model_validate(record)
+                except ValidationError as e:
+                    error = _error_message(e)
+            if error is not None:
+                code = record.get("employee_id") if record else None
+                results[row] = BulkRowResult(row=row, employee_id=code, status="invalid", error=error)
+                continue
+            if data.employee_id in seen_codes:
+                results[row] = BulkRowResult(row=row, employee_id=data.employee_id, status="conflict",
+                                             error="Duplicate employee_id in upload")
+            elif data.email in seen_emails:
+                results[row] = BulkRowResult(row=row, employee_id=data.employee_id, status="conflict",
+                                             error="Duplicate email in upload")
+            else:
+                valid.append((row, data))
+            seen_codes.add(data.employee_id)
+            seen_emails.add(data.email)
+
+        if valid:
+            existing = await self.db.execute(
+                select(Employee.employee_id, Employee.email).where(or_(
+                    _any(Employee.employee_id, [d.employee_id for _, d in valid], String),
+                    _any(Employee.email, [d.email for _, d in valid], String),
+                ))
+            )
+            taken_codes, taken_emails = set(), set()
+            for code, email in existing:
+                taken_codes.add(code)
+                taken_emails.add(email)
+            unknown = await self._unknown_departments(d.department_id for _, d in valid)
+
+            to_insert = []
+            for row, data in valid:
+                if data.employee_id in taken_codes:
+                    results[row] = BulkRowResult(row=row, employee_id=data.employee_id, status="conflict",
+                                                 error="Employee ID already exists")
+                elif data.email in taken_emails:
+                    results[row] = BulkRowResult(row=row, employee_id=data.employee_id, status="conflict",
+                                                 error="Email already exists")
+                elif data.department_id in unknown:
+                    results[row] = BulkRowResult(row=row, employee_id=data.employee_id, status="invalid",
+                                                 error="Department not found")
+                else:
+                    to_insert.append((row, data))
+
+            if to_insert:
+                result = await self.db.execute(
+                    pg_insert(Employee)
+                    .values([data.model_dump() for _, data in to_insert])
+                    .on_conflict_do_nothing()
+                    .returning(Employee.id, Employee.employee_id)
+                )
+                created = {code: id for id, code in result}
+                await self.db.commit()
+                for row, data in to_insert:
+                    if data.employee_id in created:
+                        results[row] = BulkRowResult(row=row, employee_id=data.employee_id, status="created",
+                                                     id=created[data.employee_id])
+                    else:
+                        results[row] = BulkRowResult(row=row, employee_id=data.employee_id, status="conflict",
+                                                     error="Conflicts with a concurrently created employee")
+
+        return [results[row] for row in sorted(results)]
+
+    async def update_chunk(self, chunk: List[Record], seen_codes: Set[str]) -> List[BulkRowResult]:
+        """
+        Patch the employees in one chunk of an upload, matched on employee_id.
+
+        Rows touching the same set of fields share one
+        UPDATE ... FROM (VALUES ...) statement, so a department move of
+        thousands of people is a single write.
+        """
+        results: Dict[int, BulkRowResult] = {}
+        valid: List[Tuple[int, str, dict]] = []
+        for row, record, error in chunk:
+            if error is None:
+                try:
+                    data = EmployeeBulkUpdate.model_validate(record)
+                except ValidationError as e:
+                    error = _error_message(e)
+            if error is not None:
+                code = record.get("employee_id") if record else None
+                results[row] = BulkRowResult(row=row, employee_id=code, status="invalid", error=error)
+                continue
+            changes = data.model_dump(exclude_unset=True, exclude={"employee_id"})
+            if not changes:
+                results[row] = BulkRowResult(row=row, employee_id=data.employee_id, status="invalid",
+                                             error="No fields to update")
+            elif data.employee_id in seen_codes:
+                results[row] = BulkRowResult(row=row, employee_id=data.employee_id, status="conflict",
+                                             error="Duplicate employee_id in upload")
+            else:
+                valid.append((row, data.employee_id, changes))
+            seen_codes.add(data.employee_id)
+
+        unknown = await self._unknown_departments(c.get("department_id") for _, _, c in valid)
+        groups: Dict[Tuple[str, ...], List[Tuple[int, str, dict]]] = {}
+        for row, code, changes in valid:
+            if changes.get("department_id") in unknown:
+                results[row] = BulkRowResult(row=row, employee_id=code, status="invalid", error="Department not found")
+                continue
+            groups.setdefault(tuple(sorted(changes)), []).append((row, code, changes))
+
+        updated: Dict[str, int] = {}
+        for fields, rows in groups.items():
+            v = values(
+                column("employee_id", String),
+                *[column(field, UPDATE_COLUMN_TYPES[field]) for field in fields],
+                name="v",
+            ).data([(code, *[changes[field] for field in fields]) for _, code, changes in rows])
+            result = await self.db.execute(
+                update(Employee)
+                .where(Employee.employee_id == v.c.employee_id)
+                .values({field: v.c[field] for field in fields})
+                .returning(Employee.id, Employee.employee_id)
+                .execution_options(synchronize_session=False)
+            )
+            updated.update({code: id for id, code in result})
+        if groups:
+            await self.db.commit()
+
+        for rows in groups.values():
+            for row, code, _ in rows:
+                if code in updated:
+                    results[row] = BulkRowResult(row=row, employee_id=code, status="updated", id=updated[code])
+                else:
+                    results[row] = BulkRowResult(row=row, employee_id=code, status="not_found",
+                                                 error="Employee not found")
+
+        return [results[row] for row in sorted(results)]
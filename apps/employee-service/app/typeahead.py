@@ -0,0 +1,464 @@
+"""
+In-memory typeahead index for the employee directory
+
+Every employee is broken into normalized tokens (name words, employee id,
+email local part). Tokens live in one sorted list so a prefix lookup is a
+bisect plus a short scan, and in a trigram map so mid-word queries and
+spelling variants of longer names ('jonathon', 'katharine') still find
+candidates. Trigrams do not catch transposed letters in short words ('jhon'
+shares one trigram with 'john'). The whole directory is loaded at startup and
+kept current through Postgres LISTEN/NOTIFY (see migration 05), so lookups
+never touch the database.
+
+Until the index is loaded, or when it is disabled, callers fall back to
+`suggest_from_db`, which is backed by pg_trgm indexes.
+"""
+import asyncio
+import heapq
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, OrderedDict, defaultdict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import asyncpg
+from sqlalchemy import Integer, select, func, case, literal, or_, any_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal, DATABASE_URL, connect_args
+from app.models.employee import Employee
+
+# Channel the migration 05 trigger notifies on
+NOTIFY_CHANNEL = "employees_changed"
+
+# Fuzzy (trigram) matches must share at least this share of the query's trigrams
+MIN_TRIGRAM_SIMILARITY = 0.5
+
+ENTRY_COLUMNS = (
+    Employee.id,
+    Employee.employee_id,
+    Employee.full_name,
+    Employee.email,
+    Employee.department_id,
+    Employee.is_active,
+)
+
+
+class Entry(NamedTuple):
+    id: int
+    employee_id: str
+    full_name: str
+    email: str
+    department_id: Optional[int]
+    is_active: bool
+
+
+def normalize(value: str) -> str:
+    """Lowercase and strip accents so 'José' matches 'jose'"""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower().strip()
+
+
+def _split(value: str) -> List[str]:
+    for sep in ".-_@,'":
+        value = value.replace(sep, " ")
+    return [part for part in value.split() if part]
+
+
+def tokenize(entry: Entry) -> Tuple[str, ...]:
+    name = normalize(entry.full_name)
+    code = normalize(entry.employee_id)
+    local_part = normalize(entry.email).split("@", 1)[0]
+    tokens = _split(name) + [code] + _split(code) + [local_part] + _split(local_part)
+    return tuple(dict.fromkeys(t for t in tokens if t))
+
+
+def trigrams(token: str) -> Set[str]:
+    """Trigrams padded the way pg_trgm pads words"""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class EmployeeIndex:
+    """Prefix and trigram index over the employee directory"""
+
+    def __init__(self, cache_size: int = 1024):
+        self.ready = False
+        self._cache_size = cache_size
+        self._reset()
+
+    def _reset(self) -> None:
+        self._entries: Dict[int, Entry] = {}
+        self._tokens: Dict[int, Tuple[str, ...]] = {}
+        self._order: Dict[int, Tuple[int, str]] = {}
+        # Sorted (token, id) keys with the ids alongside, so a prefix range
+        # turns into candidates with two bisects and a list slice
+        self._keys: List[Tuple[str, int]] = []
+        self._ids: List[int] = []
+        # Same again for the first token of each name only
+        self._first_keys: List[Tuple[str, int]] = []
+        self._first_ids: List[int] = []
+        self._trigrams: Dict[str, Set[int]] = defaultdict(set)
+        self._codes: Dict[str, int] = {}
+        self._inactive: Set[int] = set()
+        self._departments: Dict[Optional[int], Set[int]] = defaultdict(set)
+        # Short prefixes match large parts of the directory; their rankings are
+        # cached until the next change
+        self._cache: "OrderedDict[tuple, List[Tuple[Entry, float]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _add(self, entry: Entry, tokens: Tuple[str, ...]) -> None:
+        self._entries[entry.id] = entry
+        self._tokens[entry.id] = tokens
+        self._order[entry.id] = (len(entry.full_name), normalize(entry.full_name))
+        self._codes[normalize(entry.employee_id)] = entry.id
+        self._departments[entry.department_id].add(entry.id)
+        if not entry.is_active:
+            self._inactive.add(entry.id)
+        for token in tokens:
+            for gram in trigrams(token):
+                self._trigrams[gram].add(entry.id)
+
+    @classmethod
+    def build(cls, entries: Iterable[Entry]) -> "EmployeeIndex":
+        """Index a full directory; CPU-bound, so callers run it off the event loop"""
+        index = cls()
+        keys, first_keys = [], []
+        for entry in entries:
+            tokens = tokenize(entry)
+            index._add(entry, tokens)
+            keys.extend((token, entry.id) for token in tokens)
+            if tokens:
+                first_keys.append((tokens[0], entry.id))
+        keys.sort()
+        first_keys.sort()
+        index._keys, index._ids = keys, [i for _, i in keys]
+        index._first_keys, index._first_ids = first_keys, [i for _, i in first_keys]
+        index.ready = True
+        return index
+
+    def replace(self, other: "EmployeeIndex") -> None:
+        """Take over another index's contents in one step"""
+        cache_size = self._cache_size
+        self.__dict__.update(vars(other))
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+
+    @staticmethod
+    def _delete(keys: List[Tuple[str, int]], ids: List[int], key: Tuple[str, int]) -> None:
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            del keys[i]
+            del ids[i]
+
+    @staticmethod
+    def _insert(keys: List[Tuple[str, int]], ids: List[int], key: Tuple[str, int]) -> None:
+        i = bisect_left(keys, key)
+        keys.insert(i, key)
+        ids.insert(i, key[1])
+
+    def remove(self, employee_id: int) -> None:
+        entry = self._entries.pop(employee_id, None)
+        if entry is None:
+            return
+        tokens = self._tokens.pop(employee_id)
+        self._order.pop(employee_id)
+        self._codes.pop(normalize(entry.employee_id), None)
+        self._departments[entry.department_id].discard(employee_id)
+        self._inactive.discard(employee_id)
+        for token in tokens:
+            self._delete(self._keys, self._ids, (token, employee_id))
+            for gram in trigrams(token):
+                self._trigrams[gram].discard(employee_id)
+        if tokens:
+            self._delete(self._first_keys, self._first_ids, (tokens[0], employee_id))
+        self._cache.clear()
+
+    def upsert(self, entry: Entry) -> None:
+        self.remove(entry.id)
+        tokens = tokenize(entry)
+        self._add(entry, tokens)
+        for token in tokens:
+            self._insert(self._keys, self._ids, (token, entry.id))
+        if tokens:
+            self._insert(self._first_keys, self._first_ids, (tokens[0], entry.id))
+        self._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _range(keys: List[Tuple[str, int]], term: str) -> Tuple[int, int, int]:
+        """Bounds of the tokens equal to `term` ([lo, exact)) and starting with it ([lo, hi))"""
+        lo = bisect_left(keys, (term,))
+        exact = bisect_left(keys, (term + "\0",), lo)
+        hi = bisect_left(keys, (term + "\uffff",), exact)
+        return lo, exact, hi
+
+    def _prefix_matches(self, term: str, within: Optional[Dict[int, float]] = None) -> Dict[int, float]:
+        """id -> weight; whole-token matches outrank plain prefixes"""
+        lo, exact, hi = self._range(self._keys, term)
+        if within is not None and len(within) < hi - lo:
+            # Few candidates left: checking their own tokens beats slicing a huge range
+            matches = {}
+            for employee_id in within:
+                tokens = self._tokens[employee_id]
+                if term in tokens:
+                    matches[employee_id] = 3.0
+                elif any(token.startswith(term) for token in tokens):
+                    matches[employee_id] = 2.0
+            return matches
+        matches = dict.fromkeys(self._ids[exact:hi], 2.0)
+        matches.update(dict.fromkeys(self._ids[lo:exact], 3.0))
+        return matches
+
+    def _fuzzy_matches(self, term: str) -> Dict[int, float]:
+        grams = trigrams(term)
+        counts = Counter()
+        for gram in grams:
+            counts.update(self._trigrams.get(gram, ()))
+        needed = len(grams) * MIN_TRIGRAM_SIMILARITY
+        return {i: n / len(grams) for i, n in counts.items() if n >= needed}
+
+    def suggest(
+        self,
+        q: str,
+        limit: int = 10,
+        include_inactive: bool = False,
+        department_id: Optional[int] = None,
+    ) -> List[Tuple[Entry, float]]:
+        normalized = normalize(q)
+        cache_key = (normalized, limit, include_inactive, department_id)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            return cached
+
+        ranked = self._rank(normalized, limit, include_inactive, department_id)
+        self._cache[cache_key] = ranked
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return ranked
+
+    def _rank(
+        self,
+        normalized: str,
+        limit: int,
+        include_inactive: bool,
+        department_id: Optional[int],
+    ) -> List[Tuple[Entry, float]]:
+        terms = _split(normalized)
+        if not terms:
+            return []
+
+        scores: Optional[Dict[int, float]] = None
+        # Longest term first keeps the intersections small
+        for term in sorted(terms, key=len, reverse=True):
+            matches = self._prefix_matches(term, scores)
+            if len(matches) < limit and len(term) >= 3:
+                for employee_id, weight in self._fuzzy_matches(term).items():
+                    matches.setdefault(employee_id, weight)
+            if scores is None:
+                scores = matches
+            else:
+                scores = {i: s + matches[i] for i, s in scores.items() if i in matches}
+            if not scores:
+                return []
+
+        candidates = set(scores)
+        if not include_inactive:
+            candidates -= self._inactive
+        if department_id is not None:
+            candidates &= self._departments.get(department_id, set())
+
+        # Query starts like the name does
+        lo, _, hi = self._range(self._first_keys, terms[0])
+        for employee_id in candidates.intersection(self._first_ids[lo:hi]):
+            scores[employee_id] += 1.0
+        code_match = self._codes.get(normalized)
+        if code_match in candidates:
+            scores[code_match] += 10.0
+
+        order = self._order
+        top = heapq.nsmallest(limit, candidates, key=lambda i: (-scores[i], order[i]))
+        return [(self._entries[i], scores[i]) for i in top]
+
+
+class EmployeeIndexSync:
+    """Loads the index and keeps it current from database change notifications"""
+
+    def __init__(self, index: EmployeeIndex, channel: str):
+        self.index = index
+        self.channel = channel
+        self._pending: Set[int] = set()
+        self._rebuild_requested = False
+        # Changes that arrive while a rebuild is loading, replayed once it is in
+        self._building = False
+        self._builds = 0
+        self._queued: Set[int] = set()
+        self._flush: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+        # Called on every change notification, e.g. to drop derived caches
+        self.listeners: List[Callable[[], None]] = []
+
+    async def rebuild(self) -> None:
+        self._building = True
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.stream(select(*ENTRY_COLUMNS).execution_options(yield_per=5000))
+                entries = [Entry(*row) async for row in result]
+            self.index.replace(await asyncio.to_thread(EmployeeIndex.build, entries))
+            self._builds += 1
+        finally:
+            self._building = False
+        print(f"--- TYPEAHEAD: indexed {len(entries)} employees ---")
+        # The snapshot may predate changes notified while it loaded
+        queued, self._queued = self._queued, set()
+        await self.refresh(queued)
+
+    async def refresh(self, ids: Iterable[int]) -> None:
+        """Reload specific employees; ids that no longer exist are dropped"""
+        ids = list(ids)
+        if not ids:
+            return
+        if self._building or not self.index.ready:
+            self._queued.update(ids)
+            return
+        builds = self._builds
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(*ENTRY_COLUMNS).where(Employee.id == any_(literal(ids, ARRAY(Integer))))
+            )
+            found = {row.id: Entry(*row) for row in result}
+        if self._building or self._builds != builds:
+            # A rebuild started meanwhile and may be loading older rows than these
+            return await self.refresh(ids)
+        for employee_id in ids:
+            if employee_id in found:
+                self.index.upsert(found[employee_id])
+            else:
+                self.index.remove(employee_id)
+
+    def _notify_listeners(self) -> None:
+        for listener in self.listeners:
+            listener()
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        self._notify_listeners()
+        if payload == "*":
+            self._rebuild_requested = True
+        else:
+            try:
+                self._pending.add(int(payload))
+            except ValueError:
+                return
+        if self._flush is None or self._flush.done():
+            self._flush = asyncio.create_task(self._apply_pending())
+
+    async def _apply_pending(self) -> None:
+        # Coalesce bursts (bulk imports) into a handful of queries
+        await asyncio.sleep(0.05)
+        try:
+            if self._rebuild_requested:
+                self._rebuild_requested = False
+                self._pending.clear()
+                await self.rebuild()
+            while self._pending:
+                batch = list(self._pending)[:1000]
+                self._pending.difference_update(batch)
+                await self.refresh(batch)
+        except Exception as e:
+            print(f"--- TYPEAHEAD: applying changes FAILED: {e} ---")
+
+    async def _listen(self) -> None:
+        url = make_url(DATABASE_URL)
+        backoff = 1
+        while True:
+            try:
+                conn = await asyncpg.connect(
+                    user=url.username,
+                    password=url.password,
+                    host=url.host,
+                    port=url.port,
+                    database=url.database,
+                    ssl=connect_args.get("ssl"),
+                )
+                closed = asyncio.Event()
+                conn.add_termination_listener(lambda c: closed.set())
+                try:
+                    await conn.add_listener(self.channel, self._on_notify)
+                    # Load only once listening so no change can slip in between
+                    await self.rebuild()
+                    # Changes made while disconnected were missed
+                    self._notify_listeners()
+                    backoff = 1
+                    await closed.wait()
+                finally:
+                    if not conn.is_closed():
+                        await conn.close()
+                print("--- TYPEAHEAD: notification connection lost, reconnecting ---")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"--- TYPEAHEAD: listener FAILED: {e} ---")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Cancel the listener and any pending flush, and wait for both to finish"""
+        tasks = [task for task in (self._task, self._flush) if task and not task.done()]
+        for task in tasks:
+            task.cancel()
+        # Their connections must be closed before the engine is disposed
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.index.ready = False
+
+
+async def suggest_from_db(
+    db: AsyncSession,
+    q: str,
+    limit: int = 10,
+    include_inactive: bool = False,
+    department_id: Optional[int] = None,
+) -> List[Tuple[Entry, float]]:
+    """Ranked lookup served by the pg_trgm indexes from migration 05"""
+    term = q.strip().lower()
+    prefix = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    name = func.lower(Employee.full_name)
+    score = (
+        case((func.lower(Employee.employee_id) == term, 10.0), else_=0.0)
+        + case((name.like(prefix), 3.0), else_=0.0)
+        + func.similarity(name, term) * 2
+    )
+    query = (
+        select(*ENTRY_COLUMNS, score.label("score"))
+        .where(or_(
+            name.like(prefix),
+            func.lower(Employee.employee_id).like(prefix),
+            func.lower(Employee.email).like(prefix),
+            name.op("%")(term),
+        ))
+        .order_by(score.desc(), func.length(Employee.full_name), Employee.full_name)
+        .limit(limit)
+    )
+    if not include_inactive:
+        query = query.where(Employee.is_active.is_(True))
+    if department_id is not None:
+        query = query.where(Employee.department_id == department_id)
+    result = await db.execute(query)
+    return [(Entry(*row[:-1]), float(row.score)) for row in result]
+
+
+employee_index = EmployeeIndex()
+index_sync = EmployeeIndexSync(employee_index, NOTIFY_CHANNEL)
@@ -0,0 +1,46 @@
+"""
+Response building for GET /employees: ORM rows to schemas, then FastAPI's
+response_model pass and JSON encoding, for a full page of rows.
+"""
+from conftest import PAGE_SIZE, fastapi_response
+
+from app.core.responses import PydanticJSONResponse
+from app.schemas.employee import EmployeeList, EmployeeResponse
+
+render_employee_list = fastapi_response(EmployeeList)
+
+
+def _page(rows):
+    return EmployeeList(
+        items=[EmployeeResponse.model_validate(e) for e in rows],
+        total=10_000, page=1, size=PAGE_SIZE, pages=100,
+    )
+
+
+def test_rows_to_schema(benchmark, employee_rows):
+    """EmployeeResponse.model_validate per row, as list_employees does"""
+    benchmark(lambda: [EmployeeResponse.model_validate(e) for e in employee_rows])
+
+
+def test_response_model_pass(benchmark, employee_rows):
+    """FastAPI's re-validation and encoding of an already built EmployeeList"""
+    page = _page(employee_rows)
+    benchmark(render_employee_list, page)
+
+
+def test_list_response_total(benchmark, employee_rows):
+    """Both passes together: the current per-request cost of a page"""
+    benchmark(lambda: render_employee_list(_page(employee_rows)))
+
+
+def test_model_dump_json(benchmark, employee_rows):
+    """Encoding a validated EmployeeList directly (lower bound for the encoding step)"""
+    page = _page(employee_rows)
+    benchmark(page.model_dump_json)
+
+
+def test_fast_response(benchmark, employee_rows):
+    """FAST_JSON_RESPONSES: PydanticJSONResponse rendering, byte-identical to the default path"""
+    page = _page(employee_rows)
+    assert PydanticJSONResponse(page).body == render_employee_list(page)
+    benchmark(lambda: PydanticJSONResponse(_page(employee_rows)))
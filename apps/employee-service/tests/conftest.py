@@ -0,0 +1,81 @@
+"""
+Shared fixtures for the endpoint tests: the service app served in-process
+over httpx, with get_db pointed at an in-memory SQLite database. From the
+service directory:
+
+    pytest tests
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DB_PASSWORD", "test")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+
+import httpx  # noqa: E402
+from jose import jwt  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db import query_stats  # noqa: E402
+from app.db.session import Base, get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.department import Department  # noqa: E402
+from app.models.employee import Employee  # noqa: E402
+
+
+def bearer(roles) -> dict:
+    token = jwt.encode(
+        {"sub": "42", "email": "test@trustybytes.in", "roles": roles},
+        settings.JWT_SECRET,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+async def db_sessions():
+    """Session factory on a fresh in-memory database, with the query counting hooks"""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://", execution_options={"schema_translate_map": {"employees": None}}
+    )
+    query_stats.install(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def seeded(db_sessions):
+    """Two departments and a page of employees"""
+    async with db_sessions() as db:
+        db.add_all([Department(id=1, name="Engineering", code="ENG"), Department(id=2, name="Finance", code="FIN")])
+        db.add_all([
+            Employee(
+                id=i, employee_id=f"EMP-{i:05d}", full_name=f"Employee Number {i}",
+                email=f"employee{i}@trustybytes.in", department_id=i % 2 + 1, location="Chennai",
+                is_active=True,
+            )
+            for i in range(1, 31)
+        ])
+        await db.commit()
+    return db_sessions
+
+
+@pytest.fixture
+async def client(seeded):
+    async def override_get_db():
+        async with seeded() as session:
+            yield session
+            await session.commit()
+
+    app.dependency_overrides[get_db] = override_get_db
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        client.headers.update(bearer(["hr_manager"]))
+        yield client
+    app.dependency_overrides.clear()
@@ -0,0 +1,34 @@
+from app.schemas.employee import EmployeeBulkUpdate, EmployeeUpdate
+from app.services import EmployeeService
+
+
+async def test_put_rejects_null_for_required_fields(client):
+    for field in ("full_name", "is_active"):
+        response = await client.put("/api/v1/employees/1", json={field: None})
+        assert response.status_code == 422, field
+        assert response.json()["detail"][0]["loc"] == ["body", field]
+
+
+async def test_put_clears_optional_fields(client):
+    response = await client.put("/api/v1/employees/1", json={"department_id": None, "location": None})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["department_id"] is None and body["location"] is None
+    assert body["full_name"] == "Employee Number 1"
+
+
+def test_omitted_fields_are_left_alone():
+    assert EmployeeUpdate.model_validate({"location": "Pune"}).model_dump(exclude_unset=True) == {"location": "Pune"}
+
+
+async def test_bulk_patch_reports_null_required_fields_per_row(seeded):
+    chunk = [
+        (1, {"employee_id": "EMP-00001", "full_name": None}, None),
+        (2, {"employee_id": "EMP-00002", "is_active": None}, None),
+    ]
+    async with seeded() as db:
+        results = await EmployeeService(db).update_chunk(chunk, set())
+    assert [(r.row, r.status) for r in results] == [(1, "invalid"), (2, "invalid")]
+    assert results[0].error.startswith("full_name:")
+    assert results[1].error.startswith("is_active:")
+    assert EmployeeBulkUpdate.model_validate({"employee_id": "EMP-00003", "location": None}).location is None
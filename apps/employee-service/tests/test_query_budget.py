@@ -0,0 +1,38 @@
+"""
+Statement budgets of the read endpoints: a list is one statement per page
+plus one for its count, and a detail is a single statement.
+"""
+import pytest
+
+from app.db.query_stats import assert_query_budget
+
+
+@pytest.mark.parametrize("count, budget", [("exact", 2), ("none", 1)])
+async def test_list_employees(client, count, budget):
+    with assert_query_budget(budget, max_repeats=1):
+        response = await client.get(f"/api/v1/employees?count={count}&page=2&size=10")
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["items"]) == 10
+    assert body["has_more"] is True
+    assert body["total"] == (30 if count == "exact" else None)
+
+
+async def test_list_employees_filtered_estimate(client):
+    # A filtered list cannot use planner statistics; it counts up to LIST_COUNT_CAP
+    with assert_query_budget(2, max_repeats=1):
+        response = await client.get("/api/v1/employees?count=estimate&department_id=1&size=50")
+    assert response.status_code == 200
+    assert response.json()["total"] == 15
+    assert all(item["department_id"] == 1 for item in response.json()["items"])
+
+
+async def test_get_employee(client):
+    with assert_query_budget(1):
+        response = await client.get("/api/v1/employees/3")
+    assert response.status_code == 200
+    assert response.json()["employee_id"] == "EMP-00003"
+
+    with assert_query_budget(1):
+        response = await client.get("/api/v1/employees/999")
+    assert response.status_code == 404
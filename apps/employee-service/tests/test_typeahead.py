@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from app.typeahead import EmployeeIndex, EmployeeIndexSync, Entry, normalize, tokenize
+
+DIRECTORY = [
+    Entry(1, "EMP-00001", "John Smith", "john.smith@trustybytes.in", 1, True),
+    Entry(2, "EMP-00002", "Jonathan Doe", "jdoe@trustybytes.in", 1, True),
+    Entry(3, "EMP-00003", "Mary Johnson", "mary.johnson@trustybytes.in", 2, True),
+    Entry(4, "EMP-00004", "José Álvarez", "jose.alvarez@trustybytes.in", 2, True),
+    Entry(5, "EMP-00005", "Katharine Jones", "kjones@trustybytes.in", 2, False),
+    Entry(6, "EMP-00006", "Jo Li", "jo.li@trustybytes.in", None, True),
+]
+
+
+def ids(results):
+    return [entry.id for entry, _ in results]
+
+
+@pytest.fixture
+def index():
+    return EmployeeIndex.build(DIRECTORY)
+
+
+def test_tokens_cover_name_code_and_email(index):
+    assert normalize("  José ÁLVAREZ ") == "jose alvarez"
+    assert tokenize(DIRECTORY[0]) == ("john", "smith", "emp-00001", "emp", "00001", "john.smith")
+    assert tokenize(DIRECTORY[1])[-1] == "jdoe"
+
+
+def test_prefix_ranks_whole_tokens_and_name_starts_first(index):
+    # "Jo Li" is the whole token; then names starting with the prefix, shorter
+    # first; then names with a later word starting with it
+    assert ids(index.suggest("jo")) == [6, 1, 2, 4, 3]
+
+
+def test_every_term_must_match(index):
+    assert ids(index.suggest("john s")) == [1]
+    assert ids(index.suggest("mary smith")) == []
+
+
+def test_accents_and_email_local_part(index):
+    assert ids(index.suggest("jose alv")) == [4]
+    assert ids(index.suggest("Álvarez")) == [4]
+    assert ids(index.suggest("jdoe")) == [2]
+
+
+def test_employee_code_match_comes_first(index):
+    results = index.suggest("emp-00003")
+    assert ids(results)[0] == 3
+    assert results[0][1] > results[1][1]
+
+
+def test_trigrams_catch_spelling_variants_of_longer_names(index):
+    assert ids(index.suggest("jonathon")) == [2]
+    assert ids(index.suggest("katherine", include_inactive=True)) == [5]
+
+
+def test_filters(index):
+    # Katharine Jones is inactive; a fuzzy match on 'jon' is all that is left
+    assert ids(index.suggest("jones")) == [2]
+    assert ids(index.suggest("jones", include_inactive=True)) == [5, 2]
+    assert ids(index.suggest("jo", department_id=2)) == [4, 3]
+    assert ids(index.suggest("jo", limit=2)) == [6, 1]
+
+
+def test_updates_match_a_fresh_build(index):
+    index.suggest("jo")
+    index.upsert(Entry(1, "EMP-00001", "Joan Smith", "joan.smith@trustybytes.in", 2, True))
+    index.upsert(Entry(7, "EMP-00007", "Jon Snow", "jon.snow@trustybytes.in", 1, True))
+    index.remove(6)
+    index.remove(99)
+    # Cached rankings are dropped on change
+    assert ids(index.suggest("jo")) == [7, 1, 2, 4, 3]
+    assert ids(index.suggest("john")) == [3]
+
+    entries = [index._entries[i] for i in sorted(index._entries)]
+    rebuilt = EmployeeIndex.build(entries)
+    assert index._keys == rebuilt._keys and index._ids == rebuilt._ids
+    assert index._first_keys == rebuilt._first_keys and index._first_ids == rebuilt._first_ids
+    assert ids(index.suggest("s")) == ids(rebuilt.suggest("s"))
+
+
+def test_replace_takes_the_new_contents_and_drops_the_cache():
+    index = EmployeeIndex(cache_size=3)
+    assert not index.ready and index.suggest("jo") == []
+    index.replace(EmployeeIndex.build(DIRECTORY))
+    assert index.ready and len(index) == len(DIRECTORY)
+    assert index._cache_size == 3
+    assert ids(index.suggest("jo")) == [6, 1, 2, 4, 3]
+    for q in ("a", "b", "c", "d"):
+        index.suggest(q)
+    assert len(index._cache) == 3
+
+
+async def test_changes_during_a_rebuild_are_queued():
+    sync = EmployeeIndexSync(EmployeeIndex.build(DIRECTORY), "employees_changed")
+    sync._building = True
+    await sync.refresh([1, 2])
+    await sync.refresh([2, 3])
+    assert sync._queued == {1, 2, 3}
+    # Nor does an index that has not loaded yet take single changes
+    sync = EmployeeIndexSync(EmployeeIndex(), "employees_changed")
+    await sync.refresh([4])
+    assert sync._queued == {4}
+
+
+async def test_stop_waits_for_the_listener_and_flush():
+    sync = EmployeeIndexSync(EmployeeIndex.build(DIRECTORY), "employees_changed")
+    closed = []
+
+    async def hold(name):
+        try:
+            await asyncio.sleep(3600)
+        finally:
+            # Cleanup awaits, as closing a connection does
+            await asyncio.sleep(0)
+            closed.append(name)
+
+    sync._task = asyncio.create_task(hold("listener"))
+    sync._flush = asyncio.create_task(hold("flush"))
+    await asyncio.sleep(0)
+    await sync.stop()
+    assert sorted(closed) == ["flush", "listener"]
+    assert sync._task.cancelled() and sync._flush.cancelled()
+    assert not sync.index.ready
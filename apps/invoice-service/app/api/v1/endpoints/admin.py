@@ -0,0 +1,31 @@
+"""
+Admin endpoints: slow-query log
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, status
+
+from app.core.security import TokenData, require_roles
+from app.db.slow_queries import slow_queries
+from app.schemas.slow_query import SlowQueryReport
+
+router = APIRouter()
+
+
+@router.get("/slow-queries", response_model=SlowQueryReport)
+async def get_slow_queries(
+    route: Optional[str] = Query(None, description="Only statements issued by routes starting with this path"),
+    min_ms: float = Query(0.0, ge=0, description="Only entries at least this slow"),
+    limit: int = Query(20, ge=1, le=500),
+    current_user: TokenData = Depends(require_roles(["admin"])),
+):
+    """Slow and timed-out statements, grouped by SQL with the most total time first"""
+    return slow_queries.report(route=route, min_ms=min_ms, limit=limit)
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(
+    current_user: TokenData = Depends(require_roles(["admin"])),
+):
+    """Empty the slow-query log, e.g. after deploying a fix"""
+    slow_queries.clear()
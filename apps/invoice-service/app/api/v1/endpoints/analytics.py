@@ -0,0 +1,140 @@
+"""
+Invoice reporting endpoints backed by the daily rollup table
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, case, cast, literal, Date
+from datetime import date
+
+from app.core.config import settings
+from app.core.coalesce import coalesce
+from app.db.session import get_db
+from app.models.invoice import Invoice, Payment
+from app.models.analytics import InvoiceDailyRollup
+from app.schemas.analytics import (
+    AgingBucket,
+    AgingReport,
+    RevenueMonth,
+    RevenueReport,
+    TodayDelta,
+)
+from app.core.security import get_current_user, TokenData
+
+router = APIRouter()
+
+AGING_BUCKETS = ["current", "1-30", "31-60", "61-90", "90+"]
+
+async def _today_delta(db: AsyncSession) -> TodayDelta:
+    """Invoices and payments created today, via index range scans on the base tables"""
+    today = func.current_date()
+    invoices_today = (
+        select(func.count(Invoice.id), func.coalesce(func.sum(Invoice.total_amount), 0))
+        .where(Invoice.created_at >= today)
+        .subquery()
+    )
+    payments_today = (
+        select(func.count(Payment.id), func.coalesce(func.sum(Payment.amount), 0))
+        .where(Payment.payment_date >= today)
+        .subquery()
+    )
+    result = await db.execute(select(invoices_today, payments_today))
+    invoice_count, invoiced_amount, payment_count, paid_amount = result.one()
+    return TodayDelta(
+        invoice_count=invoice_count,
+        invoiced_amount=invoiced_amount,
+        payment_count=payment_count,
+        paid_amount=paid_amount,
+    )
+
+@router.get("/aging", response_model=AgingReport)
+@coalesce(ttl=settings.ANALYTICS_COALESCE_TTL_SECONDS, enabled=settings.ANALYTICS_COALESCE)
+async def get_aging_report(
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """
+    Accounts receivable aging by days past due date.
+    """
+    days_past_due = func.current_date() - InvoiceDailyRollup.due_date
+    bucket = case(
+        (days_past_due <= 0, literal("current")),
+        (days_past_due <= 30, literal("1-30")),
+        (days_past_due <= 60, literal("31-60")),
+        (days_past_due <= 90, literal("61-90")),
+        else_=literal("90+"),
+    ).label("bucket")
+
+    query = (
+        select(
+            bucket,
+            func.sum(InvoiceDailyRollup.invoice_count - InvoiceDailyRollup.settled_count),
+            # Paid invoices owe nothing, with or without payment rows
+            func.sum(
+                InvoiceDailyRollup.invoiced_amount
+                - InvoiceDailyRollup.paid_amount
+                - InvoiceDailyRollup.settled_balance
+            ),
+        )
+        .group_by(bucket)
+    )
+    result = await db.execute(query)
+    totals = {row[0]: (row[1] or 0, row[2] or 0) for row in result.all()}
+
+    buckets = [
+        AgingBucket(
+            bucket=name,
+            invoice_count=totals.get(name, (0, 0))[0],
+            outstanding_amount=totals.get(name, (0, 0))[1],
+        )
+        for name in AGING_BUCKETS
+    ]
+    return AgingReport(
+        as_of=date.today(),
+        buckets=buckets,
+        total_outstanding=sum(b.outstanding_amount for b in buckets),
+        today=await _today_delta(db),
+    )
+
+@router.get("/revenue", response_model=RevenueReport)
+@coalesce(ttl=settings.ANALYTICS_COALESCE_TTL_SECONDS, enabled=settings.ANALYTICS_COALESCE)
+async def get_revenue_report(
+    months: int = Query(12, ge=1, le=60),
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """
+    Monthly totals: invoices by issue month, payments by the month they were
+    received. outstanding_amount is invoiced minus received in that month.
+    """
+    month = cast(func.date_trunc("month", InvoiceDailyRollup.day), Date).label("month")
+    start = cast(
+        func.date_trunc("month", func.current_date()) - func.make_interval(0, months - 1),
+        Date,
+    )
+
+    query = (
+        select(
+            month,
+            func.sum(InvoiceDailyRollup.invoice_count),
+            func.sum(InvoiceDailyRollup.invoiced_amount),
+            func.sum(InvoiceDailyRollup.paid_amount),
+        )
+        .where(InvoiceDailyRollup.day >= start)
+        .group_by(month)
+        .order_by(month)
+    )
+    result = await db.execute(query)
+
+    return RevenueReport(
+        months=[
+            RevenueMonth(
+                month=row[0],
+                invoice_count=row[1],
+                invoiced_amount=row[2],
+                paid_amount=row[3],
+                outstanding_amount=row[2] - row[3],
+            )
+            for row in result.all()
+        ],
+        today=await _today_delta(db),
+    )
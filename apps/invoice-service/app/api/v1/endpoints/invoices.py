@@ -1,17 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 import math
 
+from app.api.v1.fieldsets import fieldset
+from app.db.counting import CountMode, count_rows
 from app.db.session import get_db
 from app.models.invoice import Invoice
+from app.repositories import ReadModel, invoice_rows
 from app.schemas.invoice import (
     InvoiceCreate,
     InvoiceUpdate,
     InvoiceResponse,
+    InvoiceDetail,
     InvoiceList,
+    InvoiceStatusTransition,
+    InvoiceStatusTransitionResult,
+    LineItemCreate,
+    LineItemResponse,
+    PaymentCreate,
+    PaymentResponse,
 )
+from app.services import InvoiceService
+from app.core.config import settings
+from app.core.responses import model_response
 from app.core.security import get_current_user, require_roles, TokenData
 
 router = APIRouter()
@@ -21,51 +34,66 @@ async def list_invoices(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     status: Optional[str] = None,
+    count: CountMode = Query(CountMode.EXACT, description="exact | estimate | none"),
+    rows: ReadModel = Depends(fieldset(invoice_rows)),
     db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user),
 ):
     """List all invoices with pagination"""
-    query = select(Invoice)
-    count_query = select(func.count(Invoice.id))
+    query = rows.select()
     
     if status:
         query = query.where(Invoice.status == status)
-        count_query = count_query.where(Invoice.status == status)
     
     # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    total, total_is_estimate = await count_rows(db, query, count, settings.LIST_COUNT_CAP)
     
-    # Apply pagination
+    # Apply pagination; one extra row tells whether another page exists
     offset = (page - 1) * size
-    query = query.offset(offset).limit(size).order_by(Invoice.created_at.desc())
+    query = query.offset(offset).limit(size + 1).order_by(Invoice.created_at.desc())
     
     # Execute query
-    result = await db.execute(query)
-    invoices = result.scalars().all()
+    invoices = await rows.all(db, query)
     
-    return InvoiceList(
-        items=[InvoiceResponse.model_validate(i) for i in invoices],
+    return model_response(rows.page(InvoiceList)(
+        items=invoices[:size],
         total=total,
+        total_is_estimate=total_is_estimate,
+        has_more=len(invoices) > size,
         page=page,
         size=size,
-        pages=math.ceil(total / size) if total > 0 else 0,
-    )
+        pages=math.ceil(total / size) if total is not None else None,
+    ), sparse=rows.sparse)
 
-@router.get("/{id}", response_model=InvoiceResponse)
+@router.get("/{id}", response_model=InvoiceDetail)
 async def get_invoice(
     id: int,
+    rows: ReadModel = Depends(fieldset(invoice_rows)),
     db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user),
 ):
-    """Get a specific invoice by ID"""
-    result = await db.execute(select(Invoice).where(Invoice.id == id))
-    invoice = result.scalar_one_or_none()
+    """
+    Get a specific invoice with its line items, payments and balance.
+    With fields=, only those invoice columns are returned.
+    """
+    if rows.sparse:
+        invoice = await rows.first(db, rows.select().where(Invoice.id == id))
+        if not invoice:
+            raise HTTPException(status_code=404, detail="Invoice not found")
+        return model_response(invoice, sparse=True)
+
+    detail = await InvoiceService(db).get_invoice_detail(id)
     
-    if not invoice:
+    if not detail:
         raise HTTPException(status_code=404, detail="Invoice not found")
         
-    return InvoiceResponse.model_validate(invoice)
+    return model_response(InvoiceDetail(
+        **InvoiceResponse.model_validate(detail["invoice"]).model_dump(),
+        line_items=detail["line_items"],
+        payments=detail["payments"],
+        amount_paid=detail["amount_paid"],
+        balance_due=detail["balance_due"],
+    ))
 
 @router.post("", response_model=InvoiceResponse, status_code=201)
 async def create_invoice(
@@ -73,9 +101,128 @@ async def create_invoice(
     db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(require_roles(["invoice_manager", "admin"])),
 ):
-    """Create a new invoice (Manager/Admin only)"""
-    invoice = Invoice(**invoice_data.model_dump())
-    db.add(invoice)
-    await db.commit()
-    await db.refresh(invoice)
+    """Create a new invoice, optionally with line items (Manager/Admin only)"""
+    try:
+        invoice = await InvoiceService(db).create_invoice(invoice_data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except IntegrityError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Invoice number already exists")
+    return InvoiceResponse.model_validate(invoice)
+
+@router.post("/bulk", response_model=List[InvoiceResponse], status_code=201)
+async def create_invoices_bulk(
+    invoices_data: List[InvoiceCreate],
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(require_roles(["invoice_manager", "admin"])),
+):
+    """
+    Create many invoices in one request, e.g. for a billing run (Manager/Admin only).
+    Invoice numbers are allocated server-side for entries that omit them.
+    """
+    if not invoices_data:
+        raise HTTPException(status_code=400, detail="No invoices supplied")
+    if len(invoices_data) > settings.INVOICE_BULK_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.INVOICE_BULK_MAX} invoices per request",
+        )
+    try:
+        invoices = await InvoiceService(db).create_invoices(invoices_data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except IntegrityError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Invoice number already exists")
+    return [InvoiceResponse.model_validate(i) for i in invoices]
+
+@router.post("/status-transitions", response_model=InvoiceStatusTransitionResult)
+async def transition_invoice_status(
+    transition: InvoiceStatusTransition,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(require_roles(["invoice_manager", "admin"])),
+):
+    """
+    Move many invoices to a new status in one statement (Manager/Admin only).
+    Invoices whose current status does not allow the transition are skipped.
+    """
+    try:
+        updated = await InvoiceService(db).transition_status(
+            transition.target_status,
+            invoice_ids=transition.ids,
+            filters=transition.filter,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    skipped = sorted(set(transition.ids) - set(updated)) if transition.ids else []
+    return InvoiceStatusTransitionResult(
+        target_status=transition.target_status,
+        updated=updated,
+        skipped=skipped,
+    )
+
+@router.put("/{id}", response_model=InvoiceResponse)
+async def update_invoice(
+    id: int,
+    invoice_data: InvoiceUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(require_roles(["invoice_manager", "admin"])),
+):
+    """Update an existing invoice (Manager/Admin only)"""
+    try:
+        invoice = await InvoiceService(db).update_invoice(id, invoice_data)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
     return InvoiceResponse.model_validate(invoice)
+
+@router.get("/{id}/line-items", response_model=List[LineItemResponse])
+async def list_line_items(
+    id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """List the line items of an invoice"""
+    return await InvoiceService(db).list_line_items(id)
+
+@router.post("/{id}/line-items", response_model=List[LineItemResponse], status_code=201)
+async def add_line_items(
+    id: int,
+    items: List[LineItemCreate],
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(require_roles(["invoice_manager", "admin"])),
+):
+    """Bulk add line items to an invoice; the invoice total is recomputed (Manager/Admin only)"""
+    if not items:
+        raise HTTPException(status_code=400, detail="No line items supplied")
+    try:
+        return await InvoiceService(db).add_line_items(id, items)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+@router.get("/{id}/payments", response_model=List[PaymentResponse])
+async def list_payments(
+    id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """List the payments recorded against an invoice"""
+    return await InvoiceService(db).list_payments(id)
+
+@router.post("/{id}/payments", response_model=PaymentResponse, status_code=201)
+async def record_payment(
+    id: int,
+    payment_data: PaymentCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(require_roles(["invoice_manager", "admin"])),
+):
+    """Record a payment against an invoice (Manager/Admin only)"""
+    try:
+        return await InvoiceService(db).record_payment(id, payment_data)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
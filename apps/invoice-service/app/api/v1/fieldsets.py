@@ -0,0 +1,25 @@
+"""
+Sparse fieldsets: the fields= query parameter of list and detail endpoints
+"""
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Query, status
+
+from app.repositories import ReadModel
+
+
+def fieldset(read_model: ReadModel) -> Callable[..., ReadModel]:
+    """Dependency resolving ?fields= to `read_model` narrowed to those fields"""
+    description = (
+        "Comma-separated fields to return, from: "
+        + ", ".join(read_model.fields)
+        + ". id is always included; omit for all fields."
+    )
+
+    def dependency(fields: Optional[str] = Query(None, description=description)) -> ReadModel:
+        try:
+            return read_model.narrowed(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    return dependency
@@ -2,12 +2,24 @@
 API Router configuration for Invoice Service
 """
 from fastapi import APIRouter
-from app.api.v1.endpoints import invoices
+from app.api.v1.endpoints import admin, invoices, analytics
 
 api_router = APIRouter()
 
+api_router.include_router(
+    analytics.router,
+    prefix="/invoices/analytics",
+    tags=["analytics"]
+)
+
 api_router.include_router(
     invoices.router,
     prefix="/invoices",
     tags=["invoices"]
 )
+
+api_router.include_router(
+    admin.router,
+    prefix="/admin",
+    tags=["admin"]
+)
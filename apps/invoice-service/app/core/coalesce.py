@@ -0,0 +1,131 @@
+"""
+Request coalescing (single-flight) for read-only endpoints
+
+When many identical requests arrive together, only the first one (the
+leader) runs the handler; the others wait for its result instead of each
+taking a database connection for the same aggregate query. The result is
+kept for a short TTL so a burst that arrives just after the leader finished
+is served without querying either.
+
+Requests are identical when they hit the same endpoint with the same
+parameters. Dependency values (the db session, the current user) are not
+part of the key, so only use this on endpoints whose response does not
+depend on who is asking.
+"""
+import asyncio
+import functools
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Tuple
+
+IGNORED_PARAMS = ("db", "current_user")
+
+
+class SingleFlight:
+    """Shares one in-flight call, and its result for `ttl` seconds, per key"""
+
+    def __init__(self, ttl: float = 0.0):
+        self.ttl = ttl
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def invalidate(self) -> None:
+        self._results.clear()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            cached = self._results.get(key)
+            if cached is not None:
+                if time.monotonic() < cached[0]:
+                    self.shared += 1
+                    return cached[1]
+                del self._results[key]
+
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            try:
+                # shield: a follower giving up must not cancel the shared result
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # The leader was cancelled (e.g. its client went away); try again
+                    continue
+                raise
+            self.shared += 1
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.calls += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            # Errors are shared with the waiting requests but never cached
+            future.set_exception(e)
+            # Retrieve it so an error nobody waited for is not logged as unhandled
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            if self.ttl > 0:
+                self._results[key] = (time.monotonic() + self.ttl, result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._inflight)}
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def _key_part(value: Any) -> Hashable:
+    if isinstance(value, (list, set, tuple)):
+        return tuple(_key_part(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _key_part(v)) for k, v in value.items()))
+    return value
+
+
+def coalesce(ttl: float = 5.0, ignore: Iterable[str] = IGNORED_PARAMS, enabled: bool = True):
+    """
+    Decorator for FastAPI endpoints: concurrent calls with the same
+    parameters share one execution, and its result is reused for `ttl`
+    seconds. Parameters named in `ignore` are left out of the key.
+    With `enabled=False` the endpoint is returned unchanged.
+    Place it below the @router decorator.
+    """
+    ignored = set(ignore)
+
+    def decorator(fn: Callable[..., Awaitable[Any]]):
+        if not enabled:
+            return fn
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        group = _groups.setdefault(name, SingleFlight(ttl))
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = tuple(sorted((k, _key_part(v)) for k, v in kwargs.items() if k not in ignored))
+            return await group.do(key, lambda: fn(*args, **kwargs))
+
+        wrapper.single_flight = group
+        return wrapper
+
+    return decorator
+
+
+def invalidate(*names: str) -> None:
+    """Drop cached results, for the given endpoints (module.qualname) or all"""
+    for name, group in _groups.items():
+        if not names or name in names:
+            group.invalidate()
+
+
+def coalescing_stats() -> Dict[str, Dict[str, int]]:
+    return {name: group.stats() for name, group in _groups.items()}
@@ -3,7 +3,7 @@ Application configuration using Pydantic Settings
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, Optional
 from pathlib import Path
 import os
 
@@ -41,6 +41,74 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000"]
     
+    # Invoice numbering (app.numbering)
+    INVOICE_NUMBER_PREFIX: str = "INV"
+    INVOICE_NUMBER_FORMAT: str = "{prefix}-{fiscal_year}-{sequence:06d}"
+    INVOICE_NUMBER_BLOCK_SIZE: int = 100  # numbers reserved per sequence call
+    FISCAL_YEAR_START_MONTH: int = 4
+    INVOICE_BULK_MAX: int = 1000
+    
+    # Batch document rendering (app.jobs.render_invoices)
+    RENDER_OUTPUT: str = "artifacts/invoices"  # local directory or gs://bucket/prefix
+    RENDER_WORKERS: Optional[int] = None  # defaults to the number of CPU cores
+    RENDER_CHUNK_SIZE: int = 200
+    
+    # Overdue sweep (app.jobs.overdue_sweep); 0 disables the in-process scheduler
+    OVERDUE_SWEEP_INTERVAL_SECONDS: int = 0
+    OVERDUE_SWEEP_BATCH_SIZE: int = 500
+    
+    # Analytics request coalescing (app.core.coalesce): identical concurrent
+    # requests share one query, and its result is reused for this long
+    # ANALYTICS_COALESCE=false serves every request itself, for comparison runs
+    ANALYTICS_COALESCE: bool = True
+    ANALYTICS_COALESCE_TTL_SECONDS: float = 5.0
+    
+    # List endpoints (app.db.counting): count=estimate counts at most this many rows
+    LIST_COUNT_CAP: int = 10000
+    
+    # Read endpoints (app.core.responses): serialize schemas with pydantic-core and
+    # skip FastAPI's response_model re-validation
+    FAST_JSON_RESPONSES: bool = False
+    
+    # Response compression (app.core.compression): gzip or Brotli for bodies of at least
+    # COMPRESSION_MINIMUM_SIZE bytes; disable when a proxy in front already compresses
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    
+    # Database connection pool (app.db.session)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    
+    # Admission control (app.core.admission): reject with 503/429 and Retry-After instead of queueing
+    ADMISSION_ENABLED: bool = True
+    # Requests allowed in flight beyond the pool's capacity while every connection is checked out
+    ADMISSION_MAX_POOL_WAITERS: int = 20
+    # Path prefix -> maximum concurrent requests
+    ADMISSION_ROUTE_LIMITS: Dict[str, int] = {"/api/v1/invoices/analytics": 8, "/api/v1/invoices/bulk": 2, "/api/v1/invoices/status-transitions": 2}
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    # Per-user token bucket; 0 disables rate limiting
+    RATE_LIMIT_PER_SECOND: float = 0.0
+    RATE_LIMIT_BURST: int = 40
+    
+    # Statement timeouts in milliseconds (app.db.slow_queries); 0 disables
+    STATEMENT_TIMEOUT_MS: int = 10000
+    # Path prefix -> timeout, for routes that need a tighter or looser budget
+    STATEMENT_TIMEOUTS: Dict[str, int] = {"/api/v1/invoices": 5000, "/api/v1/invoices/analytics": 20000, "/api/v1/invoices/bulk": 60000, "/api/v1/invoices/status-transitions": 60000}
+    
+    # Slow-query log (app.db.slow_queries), served at /api/v1/admin/slow-queries
+    SLOW_QUERY_THRESHOLD_MS: float = 250.0
+    SLOW_QUERY_LOG_SIZE: int = 500
+    # Fraction of slow SELECTs re-run under EXPLAIN (ANALYZE, BUFFERS); 0 disables
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0
+    
+    # Per-request query statistics (app.db.query_stats); response headers only with DEBUG
+    QUERY_STATS_ENABLED: bool = True
+    # The same SQL this many times in one request is reported as a likely N+1
+    N_PLUS_ONE_THRESHOLD: int = 5
+    
     # Pydantic Settings configuration
     model_config = SettingsConfigDict(
         env_file=[".env", str(ROOT_DIR / ".env")],
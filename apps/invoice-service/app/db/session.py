@@ -1,12 +1,15 @@
 """
 Database session management with async SQLAlchemy
 """
+from fastapi import Request
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict
 import ssl
 
 from app.core.config import settings
+from app.core.routes import route_template
+from app.db import query_stats, slow_queries
 
 # Convert sync URL to async URL
 DATABASE_URL = settings.DATABASE_URL.replace(
@@ -31,12 +34,17 @@ engine = create_async_engine(
     DATABASE_URL,
     echo=settings.DEBUG,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
     connect_args=connect_args,
 )
 
+# Slow-query capture, and the statement_timeout get_db asks for per route
+slow_queries.install(engine)
+# Statement, row and time counts per request
+query_stats.install(engine)
+
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
@@ -47,9 +55,21 @@ AsyncSessionLocal = async_sessionmaker(
 
 Base = declarative_base()
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+def pool_status() -> Dict[str, int]:
+    """Connection pool usage, for /health and load tests"""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "idle": pool.checkedin(),
+    }
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get database session"""
     async with AsyncSessionLocal() as session:
+        session.info["statement_timeout_ms"] = slow_queries.statement_timeout_ms(request.url.path)
+        session.info["route"] = route_template(request.scope)
         try:
             yield session
             await session.commit()
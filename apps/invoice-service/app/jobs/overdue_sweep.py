@@ -0,0 +1,92 @@
+"""
+Overdue invoice sweep
+
+Moves invoices past their due date to 'overdue' in small batches. Each batch
+locks at most `batch_size` rows (FOR UPDATE SKIP LOCKED) found through the
+(status, due_date) index and commits on its own, so the sweep never holds a
+long table-wide lock and several processes can run it at once.
+
+Usage:
+    python -m app.jobs.overdue_sweep            # single pass
+    python -m app.jobs.overdue_sweep --loop     # keep sweeping every interval
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select, update, func
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, engine
+from app.models.invoice import Invoice, InvoiceStatus
+from app.services import allowed_sources
+
+
+async def sweep_overdue(batch_size: int = None, pause: float = 0.05) -> int:
+    """Run one sweep to completion; returns the number of invoices marked overdue"""
+    batch_size = batch_size or settings.OVERDUE_SWEEP_BATCH_SIZE
+    target = InvoiceStatus.OVERDUE.value
+
+    candidates = (
+        select(Invoice.id)
+        .where(Invoice.status.in_(allowed_sources(target)))
+        .where(Invoice.due_date < func.current_date())
+        .order_by(Invoice.status, Invoice.due_date)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(Invoice)
+        .where(Invoice.id.in_(candidates))
+        .values(status=target)
+        .returning(Invoice.id)
+        .execution_options(synchronize_session=False)
+    )
+
+    total = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(stmt)
+            swept = len(result.all())
+            await db.commit()
+        total += swept
+        if swept < batch_size:
+            return total
+        # Let other transactions in between batches
+        await asyncio.sleep(pause)
+
+
+async def run_periodically(interval: float, batch_size: int = None) -> None:
+    """Background loop used by the service lifespan when a sweep interval is configured"""
+    while True:
+        try:
+            swept = await sweep_overdue(batch_size)
+            if swept:
+                print(f"--- SWEEP: marked {swept} invoice(s) overdue ---")
+        except Exception as e:
+            print(f"--- SWEEP: overdue sweep FAILED: {e} ---")
+        await asyncio.sleep(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mark past-due invoices as overdue")
+    parser.add_argument("--batch-size", type=int, default=settings.OVERDUE_SWEEP_BATCH_SIZE)
+    parser.add_argument("--loop", action="store_true", help="Keep sweeping every --interval seconds")
+    parser.add_argument("--interval", type=float, default=settings.OVERDUE_SWEEP_INTERVAL_SECONDS or 3600)
+    args = parser.parse_args()
+
+    async def _main():
+        try:
+            if args.loop:
+                await run_periodically(args.interval, args.batch_size)
+            else:
+                swept = await sweep_overdue(args.batch_size)
+                print(f"Marked {swept} invoice(s) overdue")
+        finally:
+            await engine.dispose()
+
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Batch invoice document rendering
+
+Streams invoice details out of Postgres in keyset-paginated chunks and fans
+the CPU-bound HTML/PDF rendering out over a process pool, so month-end runs
+scale with cores and never touch the API event loop.
+
+Progress is checkpointed in the artifact store; re-running the same command
+resumes after the last fully rendered chunk.
+
+Usage:
+    python -m app.jobs.render_invoices --output gs://bucket/invoices --workers 8
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import select, func
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, engine
+from app.models.invoice import Invoice
+from app.rendering.documents import RENDERERS
+from app.rendering.storage import open_store, read_json, write_json
+from app.rendering.worker import render_chunk
+from app.services import InvoiceService
+
+CHECKPOINT_KEY = "_checkpoint.json"
+
+
+class Progress:
+    """Throttled progress reporter with throughput and ETA"""
+
+    def __init__(self, total: int, interval: float = 5.0):
+        self.total = total
+        self.done = 0
+        self.written = 0
+        self.skipped = 0
+        self.interval = interval
+        self.started = time.monotonic()
+        self._last_report = 0.0
+
+    def update(self, invoices: int, written: int, skipped: int) -> None:
+        self.done += invoices
+        self.written += written
+        self.skipped += skipped
+        now = time.monotonic()
+        if now - self._last_report >= self.interval or self.done >= self.total:
+            self._last_report = now
+            self.report()
+
+    def report(self) -> None:
+        elapsed = time.monotonic() - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = (self.total - self.done) / rate if rate > 0 else 0.0
+        pct = 100.0 * self.done / self.total if self.total else 100.0
+        print(
+            f"[render] {self.done}/{self.total} invoices ({pct:.1f}%) "
+            f"written={self.written} skipped={self.skipped} "
+            f"{rate:.0f}/s eta={remaining:.0f}s",
+            flush=True,
+        )
+
+
+async def run(
+    output: str,
+    workers: int,
+    formats: List[str],
+    chunk_size: int,
+    status: Optional[str] = None,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+    resume: bool = True,
+    skip_existing: bool = False,
+) -> Progress:
+    store = open_store(output)
+    filters = {
+        "status": status,
+        "created_from": created_from.isoformat() if created_from else None,
+        "created_to": created_to.isoformat() if created_to else None,
+        "formats": formats,
+    }
+
+    after_id = 0
+    checkpoint = read_json(store, CHECKPOINT_KEY) if resume else None
+    if checkpoint and checkpoint.get("filters") == filters:
+        after_id = checkpoint["last_id"]
+        print(f"[render] resuming after invoice id {after_id}", flush=True)
+    elif checkpoint:
+        print("[render] checkpoint was written for different filters, starting over", flush=True)
+
+    loop = asyncio.get_running_loop()
+    # Chunks complete out of order; the checkpoint only advances past a chunk
+    # once every earlier chunk has been written too.
+    inflight = deque()
+    max_inflight = workers * 2
+
+    async def drain(block: bool) -> None:
+        nonlocal after_id
+        if block:
+            await asyncio.wait([f for _, _, f in inflight], return_when=asyncio.FIRST_COMPLETED)
+        while inflight and inflight[0][2].done():
+            last_id, count, future = inflight.popleft()
+            written, skipped = future.result()
+            progress.update(count, written, skipped)
+            after_id = last_id
+            write_json(store, CHECKPOINT_KEY, {
+                "last_id": after_id,
+                "filters": filters,
+                "updated_at": datetime.utcnow(),
+            })
+
+    async with AsyncSessionLocal() as db:
+        count_query = select(func.count(Invoice.id)).where(Invoice.id > after_id)
+        if status:
+            count_query = count_query.where(Invoice.status == status)
+        if created_from:
+            count_query = count_query.where(Invoice.created_at >= created_from)
+        if created_to:
+            count_query = count_query.where(Invoice.created_at < created_to)
+        progress = Progress((await db.execute(count_query)).scalar() or 0)
+        print(f"[render] {progress.total} invoices to render with {workers} workers", flush=True)
+
+        # spawn: workers only import app.rendering, never the inherited DB connections
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            chunks = InvoiceService(db).iter_invoice_details(
+                chunk_size=chunk_size,
+                after_id=after_id,
+                status=status,
+                created_from=created_from,
+                created_to=created_to,
+            )
+            async for chunk in chunks:
+                future = loop.run_in_executor(pool, render_chunk, output, formats, chunk, skip_existing)
+                inflight.append((chunk[-1]["id"], len(chunk), future))
+                while len(inflight) >= max_inflight:
+                    await drain(block=True)
+                await drain(block=False)
+
+            while inflight:
+                await drain(block=True)
+
+    progress.report()
+    return progress
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render invoices to printable documents")
+    parser.add_argument("--output", default=settings.RENDER_OUTPUT,
+                        help="Local directory or gs://bucket/prefix")
+    parser.add_argument("--workers", type=int, default=settings.RENDER_WORKERS or os.cpu_count() or 1)
+    parser.add_argument("--formats", default="html,pdf", help="Comma separated: html,pdf")
+    parser.add_argument("--chunk-size", type=int, default=settings.RENDER_CHUNK_SIZE)
+    parser.add_argument("--status", default=None, help="Only render invoices with this status")
+    parser.add_argument("--from", dest="created_from", type=date.fromisoformat, default=None,
+                        help="Only invoices created on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="created_to", type=date.fromisoformat, default=None,
+                        help="Only invoices created before this date (YYYY-MM-DD)")
+    parser.add_argument("--restart", action="store_true", help="Ignore any saved checkpoint")
+    parser.add_argument("--skip-existing", action="store_true",
+                        help="Do not overwrite documents that are already archived")
+    args = parser.parse_args()
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = set(formats) - set(RENDERERS)
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(sorted(unknown))}")
+
+    async def _main():
+        try:
+            await run(
+                output=args.output,
+                workers=max(1, args.workers),
+                formats=formats,
+                chunk_size=args.chunk_size,
+                status=args.status,
+                created_from=args.created_from,
+                created_to=args.created_to,
+                resume=not args.restart,
+                skip_existing=args.skip_existing,
+            )
+        finally:
+            await engine.dispose()
+
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
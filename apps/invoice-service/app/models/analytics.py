@@ -0,0 +1,28 @@
+"""
+Reporting rollups maintained incrementally by the invoice service
+"""
+from sqlalchemy import Column, Integer, Float, Date
+from app.db.session import Base
+
+class InvoiceDailyRollup(Base):
+    """
+    Invoiced and paid totals per day and due date.
+
+    Rows are upserted in the same transaction as the invoice or payment that
+    changes them, so aging and revenue reports never scan the invoice table.
+    Invoice counts and amounts are filed under the issue day, payments under
+    the day they were received. settled_balance is what paid invoices would
+    still owe by their payments (their whole total when marked paid without
+    any), so aging can treat a paid invoice as settled.
+    """
+    __tablename__ = "invoice_daily_rollups"
+    __table_args__ = {"schema": "invoices"}
+    
+    day = Column(Date, primary_key=True)
+    due_date = Column(Date, primary_key=True)
+    invoice_count = Column(Integer, default=0, nullable=False)
+    invoiced_amount = Column(Float, default=0, nullable=False)
+    payment_count = Column(Integer, default=0, nullable=False)
+    paid_amount = Column(Float, default=0, nullable=False)
+    settled_count = Column(Integer, default=0, nullable=False)
+    settled_balance = Column(Float, default=0, nullable=False)
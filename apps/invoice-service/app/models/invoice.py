@@ -1,14 +1,29 @@
 """
 Invoice database models using SQLAlchemy with Schema Isolation
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Date
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Index
 from sqlalchemy.sql import func
+import enum
+
 from app.db.session import Base
 
+class InvoiceStatus(str, enum.Enum):
+    """Invoice status enumeration"""
+    DRAFT = "draft"
+    PENDING = "pending"
+    SENT = "sent"
+    OVERDUE = "overdue"
+    PAID = "paid"
+    CANCELLED = "cancelled"
+
 class Invoice(Base):
     """Invoice model for billing"""
     __tablename__ = "invoices"
-    __table_args__ = {"schema": "invoices"}
+    __table_args__ = (
+        # Drives the overdue sweep: status = ... AND due_date < today
+        Index("idx_invoices_status_due_date", "status", "due_date"),
+        {"schema": "invoices"},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     invoice_number = Column(String(50), unique=True, nullable=False, index=True)
@@ -16,3 +31,29 @@ class Invoice(Base):
     status = Column(String(50), default="draft")
     due_date = Column(Date, nullable=True)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+class LineItem(Base):
+    """Billable line on an invoice"""
+    __tablename__ = "line_items"
+    __table_args__ = {"schema": "invoices"}
+
+    id = Column(Integer, primary_key=True, index=True)
+    invoice_id = Column(Integer, ForeignKey("invoices.invoices.id", ondelete="CASCADE"), nullable=False, index=True)
+    description = Column(String(255), nullable=False)
+    quantity = Column(Integer, default=1, nullable=False)
+    unit_price = Column(Float, nullable=False)
+    total_price = Column(Float, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+class Payment(Base):
+    """Payment received against an invoice"""
+    __tablename__ = "payments"
+    __table_args__ = {"schema": "invoices"}
+
+    id = Column(Integer, primary_key=True, index=True)
+    invoice_id = Column(Integer, ForeignKey("invoices.invoices.id", ondelete="CASCADE"), nullable=False, index=True)
+    amount = Column(Float, nullable=False)
+    payment_method = Column(String(50), nullable=True)
+    payment_date = Column(DateTime, server_default=func.now(), nullable=False)
+    reference_number = Column(String(100), nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
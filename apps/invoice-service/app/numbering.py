@@ -0,0 +1,115 @@
+"""
+Server-side invoice number allocation
+
+Numbers look like INV-2025-000123: a prefix, the fiscal year the invoice was
+issued in and a sequence value. The sequence is a Postgres SEQUENCE whose
+INCREMENT is the block size, so a single nextval() reserves a whole block of
+numbers for this process. Invoices are then numbered from memory; the next
+block is fetched in the background before the current one runs out.
+
+Numbers are unique across processes but not gap-free: blocks reserved by a
+process that restarts are simply skipped.
+"""
+import asyncio
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Sequence, text
+
+from app.core.config import settings
+from app.db.session import Base, engine
+
+invoice_number_seq = Sequence(
+    "invoice_number_seq",
+    schema="invoices",
+    start=1,
+    increment=settings.INVOICE_NUMBER_BLOCK_SIZE,
+    metadata=Base.metadata,
+)
+
+# One round trip returns as many block starts as requested plus the block
+# size actually configured on the sequence, which is authoritative.
+RESERVE_BLOCKS_SQL = text("""
+    SELECT nextval('invoices.invoice_number_seq') AS block_start, s.increment_by
+    FROM generate_series(1, :blocks),
+         pg_sequences s
+    WHERE s.schemaname = 'invoices' AND s.sequencename = 'invoice_number_seq'
+""")
+
+
+def fiscal_year(day: date) -> int:
+    """Fiscal years are labelled by the calendar year they start in"""
+    return day.year if day.month >= settings.FISCAL_YEAR_START_MONTH else day.year - 1
+
+
+def format_invoice_number(sequence: int, day: Optional[date] = None) -> str:
+    return settings.INVOICE_NUMBER_FORMAT.format(
+        prefix=settings.INVOICE_NUMBER_PREFIX,
+        fiscal_year=fiscal_year(day or date.today()),
+        sequence=sequence,
+    )
+
+
+class InvoiceNumberAllocator:
+    """Per-process allocator handing out numbers from pre-reserved sequence blocks"""
+
+    def __init__(self, low_water: float = 0.2):
+        self._blocks: List[Tuple[int, int]] = []  # [next value, end) ranges
+        self._block_size = settings.INVOICE_NUMBER_BLOCK_SIZE
+        self._low_water = low_water
+        self._lock = asyncio.Lock()
+        self._prefetch: Optional[asyncio.Task] = None
+
+    @property
+    def available(self) -> int:
+        return sum(end - start for start, end in self._blocks)
+
+    async def _reserve(self, blocks: int) -> None:
+        async with engine.connect() as conn:
+            result = await conn.execute(RESERVE_BLOCKS_SQL, {"blocks": blocks})
+            rows = result.all()
+        for block_start, increment in rows:
+            self._block_size = increment
+            self._blocks.append((block_start, block_start + increment))
+        self._blocks.sort()
+
+    async def _ensure(self, count: int) -> None:
+        # Loop because other coroutines may consume numbers while we wait on the lock
+        while self.available < count:
+            async with self._lock:
+                missing = count - self.available
+                if missing > 0:
+                    await self._reserve(-(-missing // self._block_size))
+
+    def _maybe_prefetch(self) -> None:
+        running = self._prefetch is not None and not self._prefetch.done()
+        if running or self.available > self._block_size * self._low_water:
+            return
+        self._prefetch = asyncio.create_task(self._ensure(self.available + self._block_size))
+
+    def _take(self, count: int) -> List[int]:
+        values = []
+        while len(values) < count:
+            start, end = self._blocks[0]
+            n = min(count - len(values), end - start)
+            values.extend(range(start, start + n))
+            if start + n == end:
+                self._blocks.pop(0)
+            else:
+                self._blocks[0] = (start + n, end)
+        return values
+
+    async def allocate_many(self, count: int, day: Optional[date] = None) -> List[str]:
+        """Allocate `count` invoice numbers, touching the database at most once"""
+        if count <= 0:
+            return []
+        await self._ensure(count)
+        values = self._take(count)
+        self._maybe_prefetch()
+        return [format_invoice_number(value, day) for value in values]
+
+    async def allocate(self, day: Optional[date] = None) -> str:
+        return (await self.allocate_many(1, day))[0]
+
+
+invoice_numbers = InvoiceNumberAllocator()
@@ -0,0 +1,175 @@
+"""
+Printable invoice documents (HTML and PDF)
+
+Pure functions over plain dicts so they can run inside worker processes
+without a database session or the FastAPI app.
+"""
+from html import escape
+from string import Template
+from typing import List
+
+HTML_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Invoice $invoice_number</title>
+<style>
+body { font-family: Helvetica, Arial, sans-serif; font-size: 12px; margin: 40px; }
+table { width: 100%; border-collapse: collapse; margin-top: 16px; }
+th, td { border-bottom: 1px solid #ddd; padding: 6px; text-align: left; }
+td.num, th.num { text-align: right; }
+.totals td { font-weight: bold; }
+</style>
+</head>
+<body>
+<h1>Invoice $invoice_number</h1>
+<p>Status: $status<br>Issued: $issued<br>Due: $due_date</p>
+<table>
+<thead><tr><th>Description</th><th class="num">Qty</th><th class="num">Unit price</th><th class="num">Total</th></tr></thead>
+<tbody>
+$line_rows
+</tbody>
+</table>
+<table>
+<thead><tr><th>Payment date</th><th>Method</th><th>Reference</th><th class="num">Amount</th></tr></thead>
+<tbody>
+$payment_rows
+</tbody>
+</table>
+<table class="totals">
+<tr><td>Total</td><td class="num">$total_amount</td></tr>
+<tr><td>Paid</td><td class="num">$amount_paid</td></tr>
+<tr><td>Balance due</td><td class="num">$balance_due</td></tr>
+</table>
+</body>
+</html>
+""")
+
+PAGE_WIDTH = 595   # A4 in points
+PAGE_HEIGHT = 842
+LINES_PER_PAGE = 60
+
+
+def _money(value) -> str:
+    return f"{float(value or 0):,.2f}"
+
+
+def _date(value) -> str:
+    return str(value)[:10] if value else "-"
+
+
+def render_html(invoice: dict) -> bytes:
+    """Render an invoice detail dict (as produced by InvoiceService) to HTML"""
+    line_rows = "\n".join(
+        "<tr><td>{}</td><td class=\"num\">{}</td><td class=\"num\">{}</td><td class=\"num\">{}</td></tr>".format(
+            escape(item["description"]),
+            item["quantity"],
+            _money(item["unit_price"]),
+            _money(item["total_price"]),
+        )
+        for item in invoice["line_items"]
+    )
+    payment_rows = "\n".join(
+        "<tr><td>{}</td><td>{}</td><td>{}</td><td class=\"num\">{}</td></tr>".format(
+            _date(payment["payment_date"]),
+            escape(payment.get("payment_method") or "-"),
+            escape(payment.get("reference_number") or "-"),
+            _money(payment["amount"]),
+        )
+        for payment in invoice["payments"]
+    )
+    return HTML_TEMPLATE.substitute(
+        invoice_number=escape(invoice["invoice_number"]),
+        status=escape(invoice["status"] or "-"),
+        issued=_date(invoice["created_at"]),
+        due_date=_date(invoice["due_date"]),
+        line_rows=line_rows,
+        payment_rows=payment_rows,
+        total_amount=_money(invoice["total_amount"]),
+        amount_paid=_money(invoice["amount_paid"]),
+        balance_due=_money(invoice["balance_due"]),
+    ).encode("utf-8")
+
+
+def _text_lines(invoice: dict) -> List[str]:
+    lines = [
+        f"INVOICE {invoice['invoice_number']}",
+        "",
+        f"Status: {invoice['status'] or '-'}",
+        f"Issued: {_date(invoice['created_at'])}",
+        f"Due:    {_date(invoice['due_date'])}",
+        "",
+        f"{'Description':<48}{'Qty':>6}{'Unit price':>14}{'Total':>14}",
+    ]
+    for item in invoice["line_items"]:
+        lines.append(
+            f"{item['description'][:47]:<48}{item['quantity']:>6}"
+            f"{_money(item['unit_price']):>14}{_money(item['total_price']):>14}"
+        )
+    if invoice["payments"]:
+        lines += ["", f"{'Payment date':<14}{'Method':<16}{'Reference':<30}{'Amount':>14}"]
+        for payment in invoice["payments"]:
+            lines.append(
+                f"{_date(payment['payment_date']):<14}{(payment.get('payment_method') or '-')[:15]:<16}"
+                f"{(payment.get('reference_number') or '-')[:29]:<30}{_money(payment['amount']):>14}"
+            )
+    lines += [
+        "",
+        f"{'Total':<68}{_money(invoice['total_amount']):>14}",
+        f"{'Paid':<68}{_money(invoice['amount_paid']):>14}",
+        f"{'Balance due':<68}{_money(invoice['balance_due']):>14}",
+    ]
+    return lines
+
+
+def _pdf_escape(text: str) -> str:
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_pdf(invoice: dict) -> bytes:
+    """
+    Render an invoice to a plain-text PDF.
+
+    Uses the built-in Courier font so no PDF library is required in the
+    worker processes; layout is the same fixed-width table as the HTML.
+    """
+    lines = _text_lines(invoice)
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then (page, content) per page
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>",
+    }
+    kids = []
+    for index, page_lines in enumerate(pages):
+        page_id, content_id = 4 + index * 2, 5 + index * 2
+        kids.append(f"{page_id} 0 R")
+        text = ["BT", "/F1 9 Tf", "11 TL", f"40 {PAGE_HEIGHT - 50} Td"]
+        text += [f"({_pdf_escape(line)}) Tj T*" for line in page_lines]
+        text.append("ET")
+        stream = "\n".join(text).encode("latin-1")
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode("latin-1")
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode("latin-1")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for obj_id in range(1, len(objects) + 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (obj_id, objects[obj_id])
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+RENDERERS = {
+    "html": render_html,
+    "pdf": render_pdf,
+}
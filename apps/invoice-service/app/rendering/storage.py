@@ -0,0 +1,86 @@
+"""
+Artifact stores for rendered invoice documents
+
+Stores are addressed by URL so worker processes can open their own handle:
+a plain path (or file://) writes to the local filesystem, gs://bucket/prefix
+writes to Google Cloud Storage (requires the google-cloud-storage package).
+"""
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+CONTENT_TYPES = {
+    "html": "text/html; charset=utf-8",
+    "pdf": "application/pdf",
+    "json": "application/json",
+}
+
+
+class LocalArtifactStore:
+    """Writes artifacts below a local directory"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def exists(self, key: str) -> bool:
+        return (self.root / key).exists()
+
+    def write(self, key: str, data: bytes) -> None:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so an interrupted run never leaves a truncated file behind
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def read(self, key: str) -> Optional[bytes]:
+        path = self.root / key
+        return path.read_bytes() if path.exists() else None
+
+
+class GCSArtifactStore:
+    """Writes artifacts to a Google Cloud Storage bucket"""
+
+    def __init__(self, bucket: str, prefix: str = ""):
+        try:
+            from google.cloud import storage
+        except ImportError as e:
+            raise RuntimeError(
+                "gs:// artifact stores require the google-cloud-storage package"
+            ) from e
+        self.bucket = storage.Client().bucket(bucket)
+        self.prefix = prefix.strip("/")
+
+    def _blob(self, key: str):
+        return self.bucket.blob(f"{self.prefix}/{key}" if self.prefix else key)
+
+    def exists(self, key: str) -> bool:
+        return self._blob(key).exists()
+
+    def write(self, key: str, data: bytes) -> None:
+        ext = key.rsplit(".", 1)[-1]
+        self._blob(key).upload_from_string(data, content_type=CONTENT_TYPES.get(ext))
+
+    def read(self, key: str) -> Optional[bytes]:
+        blob = self._blob(key)
+        return blob.download_as_bytes() if blob.exists() else None
+
+
+def open_store(url: str):
+    """Open an artifact store from a path or gs:// URL"""
+    if url.startswith("gs://"):
+        bucket, _, prefix = url[len("gs://"):].partition("/")
+        return GCSArtifactStore(bucket, prefix)
+    if url.startswith("file://"):
+        url = url[len("file://"):]
+    return LocalArtifactStore(url)
+
+
+def read_json(store, key: str) -> Optional[dict]:
+    data = store.read(key)
+    return json.loads(data) if data else None
+
+
+def write_json(store, key: str, value: dict) -> None:
+    store.write(key, json.dumps(value, indent=2, default=str).encode("utf-8"))
@@ -0,0 +1,40 @@
+"""
+Process-pool worker for batch invoice rendering
+
+Kept free of database and FastAPI imports so spawned workers start quickly.
+"""
+import re
+from typing import List, Tuple
+
+from app.rendering.documents import RENDERERS
+from app.rendering.storage import open_store
+
+_worker_stores = {}
+
+
+def artifact_key(invoice: dict, fmt: str) -> str:
+    """Archive path for one rendered document, grouped by issue month"""
+    number = re.sub(r"[^A-Za-z0-9._-]", "_", invoice["invoice_number"])
+    return f"{invoice['created_at']:%Y/%m}/{number}.{fmt}"
+
+
+def render_chunk(store_url: str, formats: List[str], invoices: List[dict], skip_existing: bool) -> Tuple[int, int]:
+    """
+    Worker entry point: render and store one chunk of invoices.
+
+    Returns (documents written, documents skipped).
+    """
+    store = _worker_stores.get(store_url)
+    if store is None:
+        store = _worker_stores[store_url] = open_store(store_url)
+
+    written = skipped = 0
+    for invoice in invoices:
+        for fmt in formats:
+            key = artifact_key(invoice, fmt)
+            if skip_existing and store.exists(key):
+                skipped += 1
+                continue
+            store.write(key, RENDERERS[fmt](invoice))
+            written += 1
+    return written, skipped
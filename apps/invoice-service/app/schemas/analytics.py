@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import date
+
+class TodayDelta(BaseModel):
+    """Activity so far today, read live from the base tables"""
+    invoice_count: int
+    invoiced_amount: float
+    payment_count: int
+    paid_amount: float
+
+class AgingBucket(BaseModel):
+    bucket: str
+    invoice_count: int
+    outstanding_amount: float
+
+class AgingReport(BaseModel):
+    as_of: date
+    buckets: List[AgingBucket]
+    total_outstanding: float
+    today: TodayDelta
+
+class RevenueMonth(BaseModel):
+    month: date
+    invoice_count: int
+    invoiced_amount: float
+    paid_amount: float
+    outstanding_amount: float
+
+class RevenueReport(BaseModel):
+    months: List[RevenueMonth]
+    today: TodayDelta
@@ -1,7 +1,32 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import Optional, List
 from datetime import datetime, date
 
+class LineItemCreate(BaseModel):
+    description: str = Field(..., min_length=1, max_length=255)
+    quantity: int = Field(1, ge=1)
+    unit_price: float = Field(..., ge=0)
+
+class LineItemResponse(LineItemCreate):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    invoice_id: int
+    total_price: float
+    created_at: datetime
+
+class PaymentCreate(BaseModel):
+    amount: float = Field(..., gt=0)
+    payment_method: Optional[str] = Field(None, max_length=50)
+    payment_date: Optional[datetime] = None
+    reference_number: Optional[str] = Field(None, max_length=100)
+
+class PaymentResponse(PaymentCreate):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    invoice_id: int
+    payment_date: datetime
+    created_at: datetime
+
 class InvoiceBase(BaseModel):
     invoice_number: str
     total_amount: float
@@ -9,21 +34,60 @@ class InvoiceBase(BaseModel):
     due_date: Optional[date] = None
 
 class InvoiceCreate(InvoiceBase):
-    pass
+    # Allocated server-side when omitted
+    invoice_number: Optional[str] = Field(None, min_length=1, max_length=50)
+    # When line items are supplied the total is computed server-side from them
+    total_amount: Optional[float] = None
+    line_items: List[LineItemCreate] = []
 
 class InvoiceUpdate(BaseModel):
     total_amount: Optional[float] = None
     status: Optional[str] = None
     due_date: Optional[date] = None
 
+class InvoiceFilter(BaseModel):
+    status: Optional[str] = None
+    due_before: Optional[date] = None
+    created_from: Optional[date] = None
+    created_to: Optional[date] = None
+
+class InvoiceStatusTransition(BaseModel):
+    """Move invoices to a new status, selected either by id or by filter"""
+    target_status: str
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=50000)
+    filter: Optional[InvoiceFilter] = None
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of 'ids' or 'filter'")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("'filter' needs at least one criterion")
+        return self
+
+class InvoiceStatusTransitionResult(BaseModel):
+    target_status: str
+    updated: List[int]
+    skipped: List[int] = []
+
 class InvoiceResponse(InvoiceBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
     created_at: datetime
 
+class InvoiceDetail(InvoiceResponse):
+    """Invoice with its lines and payment totals, assembled in SQL"""
+    line_items: List[LineItemResponse] = []
+    payments: List[PaymentResponse] = []
+    amount_paid: float = 0
+    balance_due: float = 0
+
 class InvoiceList(BaseModel):
     items: List[InvoiceResponse]
-    total: int
+    # None with count=none; a lower bound or planner estimate when total_is_estimate
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    has_more: bool = False
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, List, Optional
+
+class SlowQuery(BaseModel):
+    sql: str
+    route: Optional[str] = None
+    # Types of the bind parameters, never their values
+    parameters: Any = None
+    duration_ms: float
+    timed_out: bool = False
+    at: datetime
+    # EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) output, for sampled entries
+    plan: Any = None
+
+class SlowStatement(BaseModel):
+    sql: str
+    calls: int
+    timeouts: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    routes: List[str] = []
+    parameters: Any = None
+    last_seen: datetime
+    plan: Any = None
+
+class SlowQueryReport(BaseModel):
+    threshold_ms: float
+    # Slow statements seen since start or the last clear, and how many are still in the buffer
+    recorded: int
+    retained: int
+    statements: List[SlowStatement]
+    recent: List[SlowQuery]
@@ -0,0 +1,522 @@
+"""
+Service Layer: Business Logic for Invoice Management
+Totals and balances are derived in SQL from line items and payments so the
+client never has to fetch every line to know what an invoice is worth.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, func, values, column, literal, literal_column, true, cast, any_, exists, Integer, Float, String, Numeric, Date
+from sqlalchemy.dialects.postgresql import ARRAY, JSON, aggregate_order_by, insert as pg_insert
+from typing import AsyncIterator, Iterable, List, Optional, Set, Tuple
+from datetime import date
+
+from app.models.invoice import Invoice, InvoiceStatus, LineItem, Payment
+from app.models.analytics import InvoiceDailyRollup
+from app.numbering import invoice_numbers
+from app.repositories import line_item_rows, payment_rows
+from app.schemas.invoice import InvoiceCreate, InvoiceUpdate, InvoiceFilter, LineItemCreate, LineItemResponse, PaymentCreate, PaymentResponse
+
+# Allowed status changes; paid and cancelled are terminal
+STATUS_TRANSITIONS = {
+    InvoiceStatus.DRAFT.value: {InvoiceStatus.PENDING.value, InvoiceStatus.SENT.value, InvoiceStatus.CANCELLED.value},
+    InvoiceStatus.PENDING.value: {InvoiceStatus.SENT.value, InvoiceStatus.OVERDUE.value, InvoiceStatus.PAID.value, InvoiceStatus.CANCELLED.value},
+    InvoiceStatus.SENT.value: {InvoiceStatus.OVERDUE.value, InvoiceStatus.PAID.value, InvoiceStatus.CANCELLED.value},
+    InvoiceStatus.OVERDUE.value: {InvoiceStatus.SENT.value, InvoiceStatus.PAID.value, InvoiceStatus.CANCELLED.value},
+    InvoiceStatus.PAID.value: set(),
+    InvoiceStatus.CANCELLED.value: set(),
+}
+
+ROLLUP_COLUMNS = [
+    "day", "due_date", "invoice_count", "invoiced_amount",
+    "payment_count", "paid_amount", "settled_count", "settled_balance",
+]
+
+
+def allowed_sources(target_status: str) -> List[str]:
+    """Statuses an invoice may be moved to `target_status` from"""
+    if target_status not in STATUS_TRANSITIONS:
+        raise ValueError(f"Invalid status: {target_status}")
+    return sorted(s for s, targets in STATUS_TRANSITIONS.items() if target_status in targets)
+
+
+def _id_in(ids: Iterable[int]):
+    """`invoices.id = ANY(:ids)` with a single array parameter, however many ids"""
+    return Invoice.id == any_(literal(list(ids), ARRAY(Integer)))
+
+
+def _json_row(model):
+    """json_build_object(...) over every column of a model"""
+    args = []
+    for col in model.__table__.columns:
+        args.extend([literal(col.name), col])
+    return func.json_build_object(*args)
+
+
+def _json_rows(model, order_by):
+    """Correlated JSON array of a child table's rows, '[]' when there are none"""
+    return func.coalesce(
+        func.json_agg(aggregate_order_by(_json_row(model), order_by)),
+        literal_column("'[]'::json"),
+        type_=JSON,
+    )
+
+
+class InvoiceService:
+    """Service for invoice, line item and payment operations"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _lock_invoice(self, invoice_id: int) -> Invoice:
+        result = await self.db.execute(
+            select(Invoice).where(Invoice.id == invoice_id).with_for_update()
+        )
+        invoice = result.scalar_one_or_none()
+        if not invoice:
+            raise LookupError("Invoice not found")
+        return invoice
+
+    async def _upsert_rollup(self, source) -> None:
+        """Add the rows of `source` (key columns + deltas) onto the daily rollup"""
+        stmt = pg_insert(InvoiceDailyRollup).from_select(ROLLUP_COLUMNS, source)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[InvoiceDailyRollup.day, InvoiceDailyRollup.due_date],
+            set_={
+                name: getattr(InvoiceDailyRollup, name) + getattr(stmt.excluded, name)
+                for name in ROLLUP_COLUMNS[2:]
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def _bump_rollup(
+        self,
+        invoice_id: int,
+        invoice_count: int = 0,
+        invoiced_amount: float = 0,
+        payment_count: int = 0,
+        paid_amount: float = 0,
+        settled_count: int = 0,
+        settled_balance: float = 0,
+        payment_id: Optional[int] = None,
+    ) -> None:
+        """
+        Apply a delta to the daily rollup row of the invoice's issue day, or of
+        the payment's day when `payment_id` is given
+        """
+        issue_day = cast(Invoice.created_at, Date)
+        day = cast(Payment.payment_date, Date) if payment_id is not None else issue_day
+        source = select(
+            day,
+            # Invoices without a due date are due on receipt
+            func.coalesce(Invoice.due_date, issue_day),
+            literal(invoice_count),
+            literal(invoiced_amount, Float),
+            literal(payment_count),
+            literal(paid_amount, Float),
+            literal(settled_count),
+            literal(settled_balance, Float),
+        ).select_from(Invoice).where(Invoice.id == invoice_id)
+        if payment_id is not None:
+            source = source.join(Payment, Payment.invoice_id == Invoice.id).where(Payment.id == payment_id)
+        await self._upsert_rollup(source)
+
+    async def _refresh_total(self, invoice_id: int) -> float:
+        """Recompute total_amount from the invoice's line items"""
+        line_total = (
+            select(func.coalesce(func.sum(LineItem.total_price), 0))
+            .where(LineItem.invoice_id == invoice_id)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            update(Invoice)
+            .where(Invoice.id == invoice_id)
+            .values(total_amount=line_total)
+            .returning(Invoice.total_amount)
+        )
+        return result.scalar_one()
+
+    async def _refresh_totals(self, invoice_ids: Set[int]) -> None:
+        """Recompute total_amount for many invoices with one UPDATE ... FROM"""
+        line_totals = (
+            select(LineItem.invoice_id, func.sum(LineItem.total_price).label("total"))
+            .where(LineItem.invoice_id.in_(invoice_ids))
+            .group_by(LineItem.invoice_id)
+            .subquery()
+        )
+        await self.db.execute(
+            update(Invoice)
+            .where(Invoice.id == line_totals.c.invoice_id)
+            .values(total_amount=line_totals.c.total)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _apply_rollup(
+        self,
+        invoice_ids: Iterable[int],
+        sign: int = 1,
+        settled_only: bool = False,
+        include_cancelled: bool = False,
+        with_payments: bool = True,
+    ) -> None:
+        """
+        Add (sign=1) or remove (sign=-1) the full rollup contribution of a set
+        of invoices: count and total on their issue day, whether they are
+        settled, and their payments on the days they were received.
+        `with_payments=False` skips the payments for invoices that have none.
+        """
+        invoice_ids = list(invoice_ids)
+        if not invoice_ids:
+            return
+        issue_day = cast(Invoice.created_at, Date)
+        due_date = func.coalesce(Invoice.due_date, issue_day)
+        paid = (
+            select(Payment.invoice_id, func.sum(Payment.amount).label("paid_amount"))
+            .where(Payment.invoice_id == any_(literal(invoice_ids, ARRAY(Integer))))
+            .group_by(Payment.invoice_id)
+            .subquery()
+        )
+        is_paid = Invoice.status == InvoiceStatus.PAID.value
+        settled = sign * func.count().filter(is_paid)
+        # A paid invoice owes nothing, whatever its payments add up to
+        settled_balance = sign * func.coalesce(
+            func.sum(Invoice.total_amount - func.coalesce(paid.c.paid_amount, 0)).filter(is_paid), 0
+        )
+        if settled_only:
+            deltas = [literal(0), literal(0, Float), literal(0), literal(0, Float), settled, settled_balance]
+        else:
+            deltas = [
+                sign * func.count(),
+                sign * func.sum(Invoice.total_amount),
+                literal(0),
+                literal(0, Float),
+                settled,
+                settled_balance,
+            ]
+        source = (
+            select(issue_day, due_date, *deltas)
+            .select_from(Invoice)
+            .outerjoin(paid, paid.c.invoice_id == Invoice.id)
+            .where(_id_in(invoice_ids))
+            .group_by(issue_day, due_date)
+        )
+        if not include_cancelled:
+            source = source.where(Invoice.status != InvoiceStatus.CANCELLED.value)
+        await self._upsert_rollup(source)
+
+        if settled_only or not with_payments:
+            return
+        payment_day = cast(Payment.payment_date, Date)
+        payments = (
+            select(
+                payment_day,
+                due_date,
+                literal(0),
+                literal(0, Float),
+                sign * func.count(),
+                sign * func.sum(Payment.amount),
+                literal(0),
+                literal(0, Float),
+            )
+            .select_from(Payment)
+            .join(Invoice, Invoice.id == Payment.invoice_id)
+            .where(_id_in(invoice_ids))
+            .group_by(payment_day, due_date)
+        )
+        if not include_cancelled:
+            payments = payments.where(Invoice.status != InvoiceStatus.CANCELLED.value)
+        await self._upsert_rollup(payments)
+
+    async def create_invoices(self, invoices_data: List[InvoiceCreate]) -> List[Invoice]:
+        """
+        Create many invoices with a fixed number of statements.
+
+        Missing invoice numbers come from the block allocator, invoices and
+        all of their line items are inserted with one multi-row statement
+        each, and totals and rollups are updated set-wise.
+        """
+        for invoice_data in invoices_data:
+            if not invoice_data.line_items and invoice_data.total_amount is None:
+                raise ValueError("total_amount is required when no line items are supplied")
+
+        numbers = iter(await invoice_numbers.allocate_many(
+            sum(1 for i in invoices_data if not i.invoice_number)
+        ))
+        rows = []
+        for invoice_data in invoices_data:
+            data = invoice_data.model_dump(exclude={"line_items"})
+            data["invoice_number"] = data["invoice_number"] or next(numbers)
+            if invoice_data.line_items:
+                data["total_amount"] = 0
+            rows.append(data)
+
+        result = await self.db.scalars(
+            insert(Invoice).returning(Invoice, sort_by_parameter_order=True), rows
+        )
+        invoices = list(result.all())
+        invoice_ids = [invoice.id for invoice in invoices]
+
+        lines = [
+            (invoice.id, item)
+            for invoice, invoice_data in zip(invoices, invoices_data)
+            for item in invoice_data.line_items
+        ]
+        if lines:
+            await self._insert_line_items(lines)
+            await self._refresh_totals({invoice_id for invoice_id, _ in lines})
+
+        await self._apply_rollup(invoice_ids, with_payments=False)
+
+        await self.db.commit()
+        # Reload in one query to pick up the SQL-computed totals
+        result = await self.db.execute(
+            select(Invoice)
+            .where(Invoice.id.in_(invoice_ids))
+            .execution_options(populate_existing=True)
+        )
+        by_id = {invoice.id: invoice for invoice in result.scalars()}
+        return [by_id[invoice_id] for invoice_id in invoice_ids]
+
+    async def create_invoice(self, invoice_data: InvoiceCreate) -> Invoice:
+        """Create an invoice, optionally with its line items"""
+        return (await self.create_invoices([invoice_data]))[0]
+
+    async def _insert_line_items(self, lines: List[Tuple[int, LineItemCreate]]) -> List[LineItem]:
+        # One INSERT ... SELECT FROM (VALUES ...) so total_price is computed by Postgres
+        rows = values(
+            column("invoice_id", Integer),
+            column("description", String),
+            column("quantity", Integer),
+            column("unit_price", Float),
+            name="v",
+        ).data([(invoice_id, i.description, i.quantity, i.unit_price) for invoice_id, i in lines])
+
+        stmt = (
+            insert(LineItem)
+            .from_select(
+                ["invoice_id", "description", "quantity", "unit_price", "total_price"],
+                select(
+                    rows.c.invoice_id,
+                    rows.c.description,
+                    rows.c.quantity,
+                    rows.c.unit_price,
+                    func.round((rows.c.quantity * rows.c.unit_price).cast(Numeric), 2),
+                ),
+            )
+            .returning(LineItem)
+        )
+        result = await self.db.scalars(stmt)
+        return list(result.all())
+
+    async def add_line_items(self, invoice_id: int, items: List[LineItemCreate]) -> List[LineItem]:
+        """Bulk insert line items and re-derive the invoice total; paid and cancelled invoices are closed"""
+        invoice = await self._lock_invoice(invoice_id)
+        if invoice.status in (InvoiceStatus.PAID.value, InvoiceStatus.CANCELLED.value):
+            raise ValueError(f"Cannot add line items to a {invoice.status} invoice")
+        previous_total = invoice.total_amount
+        line_items = await self._insert_line_items([(invoice_id, item) for item in items])
+        new_total = await self._refresh_total(invoice_id)
+        await self._bump_rollup(invoice_id, invoiced_amount=new_total - previous_total)
+        await self.db.commit()
+        return line_items
+
+    async def record_payment(self, invoice_id: int, payment_data: PaymentCreate) -> Payment:
+        """
+        Record a payment and mark the invoice paid once it is settled, if its
+        status allows that (a draft stays a draft). Cancelled invoices take no
+        payments.
+        """
+        invoice = await self._lock_invoice(invoice_id)
+        if invoice.status == InvoiceStatus.CANCELLED.value:
+            raise ValueError("Cannot record a payment on a cancelled invoice")
+        was_paid = invoice.status == InvoiceStatus.PAID.value
+
+        data = payment_data.model_dump(exclude_none=True)
+        payment = Payment(invoice_id=invoice_id, **data)
+        self.db.add(payment)
+        await self.db.flush()
+
+        amount_paid = (
+            select(func.coalesce(func.sum(Payment.amount), 0))
+            .where(Payment.invoice_id == invoice_id)
+            .scalar_subquery()
+        )
+        settled = await self.db.execute(
+            update(Invoice)
+            .where(Invoice.id == invoice_id)
+            .where(Invoice.status.in_(allowed_sources(InvoiceStatus.PAID.value)))
+            .where(Invoice.total_amount <= amount_paid)
+            .values(status="paid")
+            .returning(Invoice.total_amount - amount_paid)
+        )
+        settled_row = settled.first()
+        if was_paid:
+            # Already settled: the payment only moves the settled invoice's balance
+            settled_count, settled_balance = 0, -payment.amount
+        elif settled_row is not None:
+            settled_count, settled_balance = 1, settled_row[0]
+        else:
+            settled_count, settled_balance = 0, 0
+        await self._bump_rollup(invoice_id, payment_count=1, paid_amount=payment.amount, payment_id=payment.id)
+        if settled_count or settled_balance:
+            # Settlement is filed under the issue day, as _apply_rollup files it
+            await self._bump_rollup(invoice_id, settled_count=settled_count, settled_balance=settled_balance)
+
+        await self.db.commit()
+        await self.db.refresh(payment)
+        return payment
+
+    async def update_invoice(self, invoice_id: int, update_data: InvoiceUpdate) -> Invoice:
+        """Update an invoice, validating status changes and keeping rollups in step"""
+        invoice = await self._lock_invoice(invoice_id)
+        changes = update_data.model_dump(exclude_unset=True)
+
+        new_status = changes.get("status")
+        if new_status is not None and new_status != invoice.status:
+            if invoice.status not in allowed_sources(new_status):
+                raise ValueError(f"Cannot change status from {invoice.status} to {new_status}")
+
+        if changes.get("total_amount") is not None:
+            has_lines = await self.db.scalar(
+                select(exists().where(LineItem.invoice_id == invoice_id))
+            )
+            if has_lines:
+                raise ValueError("total_amount is derived from line items and cannot be set")
+
+        # Re-file the invoice in the rollup in case its total, due date or status moved
+        await self._apply_rollup([invoice_id], sign=-1)
+        for field, value in changes.items():
+            setattr(invoice, field, value)
+        await self.db.flush()
+        await self._apply_rollup([invoice_id])
+
+        await self.db.commit()
+        await self.db.refresh(invoice)
+        return invoice
+
+    async def transition_status(
+        self,
+        target_status: str,
+        invoice_ids: Optional[List[int]] = None,
+        filters: Optional[InvoiceFilter] = None,
+    ) -> List[int]:
+        """
+        Move a set of invoices to `target_status` with one UPDATE ... RETURNING.
+
+        Only invoices whose current status allows the transition are touched;
+        returns the ids that were updated.
+        """
+        stmt = (
+            update(Invoice)
+            .where(Invoice.status.in_(allowed_sources(target_status)))
+            .values(status=target_status)
+            .returning(Invoice.id)
+            .execution_options(synchronize_session=False)
+        )
+        if invoice_ids is not None:
+            stmt = stmt.where(_id_in(invoice_ids))
+        if filters is not None:
+            if filters.status:
+                stmt = stmt.where(Invoice.status == filters.status)
+            if filters.due_before:
+                stmt = stmt.where(Invoice.due_date < filters.due_before)
+            if filters.created_from:
+                stmt = stmt.where(Invoice.created_at >= filters.created_from)
+            if filters.created_to:
+                stmt = stmt.where(Invoice.created_at < filters.created_to)
+
+        result = await self.db.execute(stmt)
+        updated = [row[0] for row in result.all()]
+
+        if target_status == InvoiceStatus.PAID.value:
+            await self._apply_rollup(updated, settled_only=True)
+        elif target_status == InvoiceStatus.CANCELLED.value:
+            await self._apply_rollup(updated, sign=-1, include_cancelled=True)
+
+        await self.db.commit()
+        return updated
+
+    @staticmethod
+    def _detail_query(*invoice_columns):
+        """Invoice columns plus JSON line items, JSON payments, amount paid and balance"""
+        line_items = (
+            select(_json_rows(LineItem, LineItem.id))
+            .where(LineItem.invoice_id == Invoice.id)
+            .scalar_subquery()
+        )
+        payments = (
+            select(
+                _json_rows(Payment, Payment.payment_date).label("payments"),
+                func.coalesce(func.sum(Payment.amount), 0).label("amount_paid"),
+            )
+            .where(Payment.invoice_id == Invoice.id)
+            .lateral("p")
+        )
+        return (
+            select(
+                *invoice_columns,
+                line_items.label("line_items"),
+                payments.c.payments,
+                payments.c.amount_paid,
+                (Invoice.total_amount - payments.c.amount_paid).label("balance_due"),
+            )
+            .select_from(Invoice)
+            .join(payments, true())
+        )
+
+    async def get_invoice_detail(self, invoice_id: int) -> Optional[dict]:
+        """Invoice, line items, payments and balance in a single round trip"""
+        query = self._detail_query(Invoice).where(Invoice.id == invoice_id)
+        row = (await self.db.execute(query)).one_or_none()
+        if not row:
+            return None
+
+        invoice, line_items, payments, amount_paid, balance_due = row
+        return {
+            "invoice": invoice,
+            "line_items": line_items,
+            "payments": payments,
+            "amount_paid": amount_paid,
+            "balance_due": balance_due,
+        }
+
+    async def iter_invoice_details(
+        self,
+        chunk_size: int = 500,
+        after_id: int = 0,
+        status: Optional[str] = None,
+        created_from: Optional[date] = None,
+        created_to: Optional[date] = None,
+    ) -> AsyncIterator[List[dict]]:
+        """
+        Stream invoice details as plain dicts in id order, one chunk per query.
+
+        Uses keyset pagination on the primary key so each chunk is an index
+        range scan no matter how far into the table the caller has got.
+        """
+        base = self._detail_query(*Invoice.__table__.columns)
+        if status:
+            base = base.where(Invoice.status == status)
+        if created_from:
+            base = base.where(Invoice.created_at >= created_from)
+        if created_to:
+            base = base.where(Invoice.created_at < created_to)
+
+        last_id = after_id
+        while True:
+            result = await self.db.execute(
+                base.where(Invoice.id > last_id).order_by(Invoice.id).limit(chunk_size)
+            )
+            chunk = [dict(row) for row in result.mappings()]
+            if not chunk:
+                return
+            yield chunk
+            last_id = chunk[-1]["id"]
+
+    async def list_line_items(self, invoice_id: int) -> List[LineItemResponse]:
+        return await line_item_rows.all(
+            self.db, line_item_rows.select().where(LineItem.invoice_id == invoice_id).order_by(LineItem.id)
+        )
+
+    async def list_payments(self, invoice_id: int) -> List[PaymentResponse]:
+        return await payment_rows.all(
+            self.db, payment_rows.select().where(Payment.invoice_id == invoice_id).order_by(Payment.payment_date)
+        )
@@ -0,0 +1,40 @@
+"""
+Loading a page for GET /invoices: ORM entities through the session identity map
+versus the Core select of app.repositories.invoice_rows. SQLite stands in for
+Postgres, so absolute numbers include its driver; the difference between the
+two is the ORM bookkeeping. Peak allocation per page is in extra_info.
+"""
+from conftest import PAGE_SIZE, peak_kib
+from sqlalchemy import select
+
+from app.db.query_stats import assert_query_budget
+from app.models.invoice import Invoice
+from app.repositories import invoice_rows
+from app.schemas.invoice import InvoiceResponse
+
+
+def _orm_page(db):
+    entities = db.execute(select(Invoice).order_by(Invoice.created_at.desc()).limit(PAGE_SIZE)).scalars().all()
+    models = [InvoiceResponse.model_validate(e) for e in entities]
+    # The request's session is closed after serialization
+    db.expunge_all()
+    return models
+
+
+def _read_model_page(db):
+    query = invoice_rows.select().order_by(Invoice.created_at.desc()).limit(PAGE_SIZE)
+    return invoice_rows.to_models(db.execute(query).all())
+
+
+def test_orm_page(benchmark, invoice_db):
+    benchmark.extra_info["peak_kib"] = peak_kib(lambda: _orm_page(invoice_db))
+    benchmark(_orm_page, invoice_db)
+
+
+def test_read_model_page(benchmark, invoice_db):
+    # One SELECT per page, with no per-row follow-up queries
+    with assert_query_budget(1):
+        page = _read_model_page(invoice_db)
+    assert page == _orm_page(invoice_db)
+    benchmark.extra_info["peak_kib"] = peak_kib(lambda: _read_model_page(invoice_db))
+    benchmark(_read_model_page, invoice_db)
@@ -0,0 +1,46 @@
+"""
+Response building for GET /invoices: ORM rows to schemas, then FastAPI's
+response_model pass and JSON encoding, for a full page of rows.
+"""
+from conftest import PAGE_SIZE, fastapi_response
+
+from app.core.responses import PydanticJSONResponse
+from app.schemas.invoice import InvoiceList, InvoiceResponse
+
+render_invoice_list = fastapi_response(InvoiceList)
+
+
+def _page(rows):
+    return InvoiceList(
+        items=[InvoiceResponse.model_validate(i) for i in rows],
+        total=10_000, page=1, size=PAGE_SIZE, pages=100,
+    )
+
+
+def test_rows_to_schema(benchmark, invoice_rows):
+    """InvoiceResponse.model_validate per row, as list_invoices does"""
+    benchmark(lambda: [InvoiceResponse.model_validate(i) for i in invoice_rows])
+
+
+def test_response_model_pass(benchmark, invoice_rows):
+    """FastAPI's re-validation and encoding of an already built InvoiceList"""
+    page = _page(invoice_rows)
+    benchmark(render_invoice_list, page)
+
+
+def test_list_response_total(benchmark, invoice_rows):
+    """Both passes together: the current per-request cost of a page"""
+    benchmark(lambda: render_invoice_list(_page(invoice_rows)))
+
+
+def test_model_dump_json(benchmark, invoice_rows):
+    """Encoding a validated InvoiceList directly (lower bound for the encoding step)"""
+    page = _page(invoice_rows)
+    benchmark(page.model_dump_json)
+
+
+def test_fast_response(benchmark, invoice_rows):
+    """FAST_JSON_RESPONSES: PydanticJSONResponse rendering, byte-identical to the default path"""
+    page = _page(invoice_rows)
+    assert PydanticJSONResponse(page).body == render_invoice_list(page)
+    benchmark(lambda: PydanticJSONResponse(_page(invoice_rows)))
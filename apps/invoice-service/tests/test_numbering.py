@@ -0,0 +1,125 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.core.config import settings
+from app.numbering import InvoiceNumberAllocator, fiscal_year, format_invoice_number
+
+
+class CounterAllocator(InvoiceNumberAllocator):
+    """Allocator reserving blocks from an in-memory counter instead of the sequence"""
+
+    def __init__(self, block_size: int = 10, **kwargs):
+        super().__init__(**kwargs)
+        self._block_size = block_size
+        self.next_start = 1
+        self.reservations = []
+
+    async def _reserve(self, blocks: int) -> None:
+        # Yield like a round trip would, so that callers can interleave
+        await asyncio.sleep(0)
+        self.reservations.append(blocks)
+        for _ in range(blocks):
+            self._blocks.append((self.next_start, self.next_start + self._block_size))
+            self.next_start += self._block_size
+        self._blocks.sort()
+
+
+def sequences(numbers):
+    return [int(number.rsplit("-", 1)[1]) for number in numbers]
+
+
+@pytest.mark.parametrize("day, year", [
+    (date(2026, 3, 31), 2025),
+    (date(2026, 4, 1), 2026),
+    (date(2026, 12, 31), 2026),
+    (date(2027, 1, 1), 2026),
+])
+def test_fiscal_year_starts_in_april(day, year):
+    assert settings.FISCAL_YEAR_START_MONTH == 4
+    assert fiscal_year(day) == year
+
+
+def test_number_carries_the_fiscal_year_of_its_day():
+    assert format_invoice_number(123, date(2026, 3, 31)) == "INV-2025-000123"
+    assert format_invoice_number(124, date(2026, 4, 1)) == "INV-2026-000124"
+
+
+async def test_allocate_many_reserves_whole_blocks_once():
+    allocator = CounterAllocator(block_size=10)
+    numbers = await allocator.allocate_many(25, date(2026, 5, 1))
+    assert numbers[0] == "INV-2026-000001"
+    assert sequences(numbers) == list(range(1, 26))
+    # Three blocks in one reservation, the rest of the third left over
+    assert allocator.reservations == [3]
+    assert allocator.available == 5
+
+
+async def test_allocate_many_crosses_a_block_boundary():
+    allocator = CounterAllocator(block_size=10)
+    assert sequences(await allocator.allocate_many(7)) == list(range(1, 8))
+    # 3 left in the first block, so the next block is reserved for the rest
+    assert sequences(await allocator.allocate_many(5)) == [8, 9, 10, 11, 12]
+    assert allocator.reservations == [1, 1]
+    assert allocator._blocks == [(13, 21)]
+
+
+async def test_low_water_prefetches_the_next_block():
+    allocator = CounterAllocator(block_size=10, low_water=0.2)
+    await allocator.allocate_many(7)
+    assert allocator._prefetch is None
+    await allocator.allocate_many(1)
+    # 2 left is at the low-water mark: one block is fetched in the background
+    await allocator._prefetch
+    assert allocator.reservations == [1, 1]
+    assert allocator.available == 12
+    assert sequences(await allocator.allocate_many(12)) == list(range(9, 21))
+    assert allocator.reservations == [1, 1]
+
+
+async def test_only_one_prefetch_runs_at_a_time():
+    allocator = CounterAllocator(block_size=10)
+    await allocator.allocate_many(9)
+    prefetch = allocator._prefetch
+    allocator._maybe_prefetch()
+    assert allocator._prefetch is prefetch
+    await prefetch
+
+
+async def test_allocate_nothing_reserves_nothing():
+    allocator = CounterAllocator()
+    assert await allocator.allocate_many(0) == []
+    assert allocator.reservations == []
+
+
+async def test_concurrent_allocations_are_unique():
+    allocator = CounterAllocator(block_size=10)
+    batches = await asyncio.gather(*(allocator.allocate_many(n) for n in (3, 17, 1, 25, 9, 10, 40)))
+    numbers = [number for batch in batches for number in batch]
+    assert len(set(numbers)) == len(numbers) == 105
+    assert [len(batch) for batch in batches] == [3, 17, 1, 25, 9, 10, 40]
+
+
+async def test_sequence_blocks(db_sessions):
+    allocator = InvoiceNumberAllocator()
+    numbers = await allocator.allocate_many(settings.INVOICE_NUMBER_BLOCK_SIZE + 5, date(2026, 4, 1))
+    # nextval() returns the start of each block; the sequence increments by the block size
+    assert sequences(numbers) == list(range(1, settings.INVOICE_NUMBER_BLOCK_SIZE + 6))
+    assert allocator._block_size == settings.INVOICE_NUMBER_BLOCK_SIZE
+    assert allocator.available == settings.INVOICE_NUMBER_BLOCK_SIZE - 5
+
+
+async def test_concurrent_processes_never_share_a_number(db_sessions):
+    # Two allocators stand for two service processes drawing from one sequence
+    first, second = InvoiceNumberAllocator(), InvoiceNumberAllocator()
+    batches = await asyncio.gather(*(
+        allocator.allocate_many(n)
+        for n in (30, 120, 7, 250, 64)
+        for allocator in (first, second)
+    ))
+    for allocator in (first, second):
+        if allocator._prefetch is not None:
+            await allocator._prefetch
+    numbers = [number for batch in batches for number in batch]
+    assert len(set(numbers)) == len(numbers) == 2 * (30 + 120 + 7 + 250 + 64)
@@ -0,0 +1,118 @@
+"""
+The daily rollup is maintained by deltas; after any mix of writes it must
+equal a recomputation from the invoice, line item and payment tables.
+"""
+from sqlalchemy import text
+
+from app.core.config import settings
+
+# What the rollup should hold: cancelled invoices and their payments count
+# nowhere, invoices are filed under their issue day and payments under the
+# day they were received; a paid invoice's unpaid remainder is its settled
+# balance
+RECOMPUTE_SQL = text("""
+    WITH live AS (
+        SELECT i.*, created_at::date AS issue_day, coalesce(due_date, created_at::date) AS due,
+               coalesce((SELECT sum(amount) FROM invoices.payments p WHERE p.invoice_id = i.id), 0) AS paid
+        FROM invoices.invoices i
+        WHERE status <> 'cancelled'
+    ),
+    deltas AS (
+        SELECT issue_day AS day, due, 1 AS invoice_count, total_amount AS invoiced_amount,
+               0 AS payment_count, 0.0 AS paid_amount,
+               (status = 'paid')::int AS settled_count,
+               CASE WHEN status = 'paid' THEN total_amount - paid ELSE 0 END AS settled_balance
+        FROM live
+        UNION ALL
+        SELECT p.payment_date::date, live.due, 0, 0, 1, p.amount, 0, 0
+        FROM invoices.payments p JOIN live ON live.id = p.invoice_id
+    )
+    SELECT day, due, sum(invoice_count), round(sum(invoiced_amount)::numeric, 2),
+           sum(payment_count), round(sum(paid_amount)::numeric, 2),
+           sum(settled_count), round(sum(settled_balance)::numeric, 2)
+    FROM deltas
+    GROUP BY day, due
+    ORDER BY day, due
+""")
+
+ROLLUP_SQL = text("""
+    SELECT day, due_date, invoice_count, round(invoiced_amount::numeric, 2),
+           payment_count, round(paid_amount::numeric, 2),
+           settled_count, round(settled_balance::numeric, 2)
+    FROM invoices.invoice_daily_rollups
+    WHERE (invoice_count, invoiced_amount, payment_count, paid_amount, settled_count, settled_balance)
+          <> (0, 0, 0, 0, 0, 0)
+    ORDER BY day, due_date
+""")
+
+
+async def assert_rollup_matches(db_sessions):
+    async with db_sessions() as db:
+        expected = [tuple(row) for row in (await db.execute(RECOMPUTE_SQL)).all()]
+        actual = [tuple(row) for row in (await db.execute(ROLLUP_SQL)).all()]
+    assert actual == expected
+    return actual
+
+
+async def create(client, **fields):
+    response = await client.post("/api/v1/invoices", json=fields)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def pay(client, invoice_id, amount, day):
+    response = await client.post(
+        f"/api/v1/invoices/{invoice_id}/payments", json={"amount": amount, "payment_date": f"{day}T12:00:00"}
+    )
+    return response.status_code
+
+
+async def test_rollup_follows_every_write(client, db_sessions):
+    lines = [{"description": "Support", "quantity": 3, "unit_price": 33.33}]
+    settled = await create(client, status="sent", due_date="2026-05-01", line_items=lines)
+    partial = await create(client, status="sent", due_date="2026-05-01", total_amount=250)
+    to_cancel = await create(client, status="pending", due_date="2026-06-01", total_amount=80)
+    no_due_date = await create(client, status="draft", total_amount=40)
+    await assert_rollup_matches(db_sessions)
+
+    # Payments are filed under the day they were received, not the issue day
+    assert await pay(client, settled, 50, "2026-04-10") == 201
+    assert await pay(client, settled, 50, "2026-04-20") == 201
+    assert await pay(client, partial, 100, "2026-04-20") == 201
+    assert await pay(client, to_cancel, 30, "2026-04-21") == 201
+    # An overpayment on a settled invoice moves its settled balance
+    assert await pay(client, settled, 5, "2026-04-22") == 201
+    await assert_rollup_matches(db_sessions)
+
+    response = await client.post(f"/api/v1/invoices/{partial}/line-items", json=[
+        {"description": "Extra", "quantity": 2, "unit_price": 12.5},
+    ])
+    assert response.status_code == 201
+    await client.put(f"/api/v1/invoices/{no_due_date}", json={"due_date": "2026-07-01", "total_amount": 45})
+    await client.post("/api/v1/invoices/status-transitions", json={"target_status": "cancelled", "ids": [to_cancel]})
+    await client.post("/api/v1/invoices/status-transitions", json={"target_status": "paid", "ids": [partial]})
+    rows = await assert_rollup_matches(db_sessions)
+    assert sum(row[2] for row in rows) == 3
+
+    # Closed invoices take no more lines, and a cancelled one no payments
+    for invoice_id in (settled, to_cancel):
+        response = await client.post(f"/api/v1/invoices/{invoice_id}/line-items", json=[
+            {"description": "Late", "unit_price": 10},
+        ])
+        assert response.status_code == 409
+    assert await pay(client, to_cancel, 50, "2026-04-25") == 409
+    await assert_rollup_matches(db_sessions)
+
+
+async def test_bulk_create_fills_the_rollup(client, db_sessions):
+    response = await client.post("/api/v1/invoices/bulk", json=[
+        {"status": "sent", "due_date": f"2026-0{month}-01", "line_items": [
+            {"description": f"Line {n}", "quantity": n, "unit_price": 9.99} for n in range(1, month + 1)
+        ]}
+        for month in range(1, 6)
+    ] + [{"status": "cancelled", "total_amount": 999}])
+    assert response.status_code == 201
+    assert len({invoice["invoice_number"] for invoice in response.json()}) == 6
+    assert all(invoice["invoice_number"].startswith(settings.INVOICE_NUMBER_PREFIX) for invoice in response.json())
+    rows = await assert_rollup_matches(db_sessions)
+    assert sum(row[2] for row in rows) == 5
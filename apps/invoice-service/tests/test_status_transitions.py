@@ -0,0 +1,130 @@
+import pytest
+from sqlalchemy import select
+
+from app.jobs.overdue_sweep import sweep_overdue
+from app.models.invoice import Invoice
+
+
+async def create_invoice(client, status="pending", total=100.0, **fields):
+    response = await client.post("/api/v1/invoices", json={"total_amount": total, "status": status, **fields})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def status_of(client, invoice_id):
+    return (await client.get(f"/api/v1/invoices/{invoice_id}")).json()["status"]
+
+
+@pytest.mark.parametrize("status, settled", [
+    ("pending", "paid"),
+    ("sent", "paid"),
+    ("overdue", "paid"),
+    # A draft has not been issued; paying it does not skip it past pending
+    ("draft", "draft"),
+])
+async def test_settling_payment_marks_paid_only_from_an_issued_status(client, status, settled):
+    invoice_id = await create_invoice(client, status)
+    response = await client.post(f"/api/v1/invoices/{invoice_id}/payments", json={"amount": 100})
+    assert response.status_code == 201
+    assert await status_of(client, invoice_id) == settled
+
+
+async def test_partial_payment_leaves_the_status(client):
+    invoice_id = await create_invoice(client, "sent")
+    await client.post(f"/api/v1/invoices/{invoice_id}/payments", json={"amount": 60})
+    assert await status_of(client, invoice_id) == "sent"
+    await client.post(f"/api/v1/invoices/{invoice_id}/payments", json={"amount": 40})
+    assert await status_of(client, invoice_id) == "paid"
+
+
+async def test_cancelled_invoice_takes_no_payment(client):
+    invoice_id = await create_invoice(client, "cancelled")
+    response = await client.post(f"/api/v1/invoices/{invoice_id}/payments", json={"amount": 100})
+    assert response.status_code == 409
+    assert await status_of(client, invoice_id) == "cancelled"
+    assert (await client.get(f"/api/v1/invoices/{invoice_id}/payments")).json() == []
+
+
+@pytest.mark.parametrize("source, target, allowed", [
+    ("draft", "sent", True),
+    ("sent", "overdue", True),
+    ("overdue", "sent", True),
+    ("pending", "cancelled", True),
+    ("draft", "overdue", False),
+    ("sent", "draft", False),
+    ("paid", "sent", False),
+    ("paid", "cancelled", False),
+    ("cancelled", "pending", False),
+    ("cancelled", "paid", False),
+])
+async def test_update_validates_the_transition(client, source, target, allowed):
+    invoice_id = await create_invoice(client, source)
+    response = await client.put(f"/api/v1/invoices/{invoice_id}", json={"status": target})
+    assert response.status_code == (200 if allowed else 422)
+    assert await status_of(client, invoice_id) == (target if allowed else source)
+
+
+async def test_unknown_status_is_rejected(client):
+    invoice_id = await create_invoice(client, "sent")
+    response = await client.put(f"/api/v1/invoices/{invoice_id}", json={"status": "lost"})
+    assert response.status_code == 422
+    response = await client.post("/api/v1/invoices/status-transitions", json={"target_status": "lost", "ids": [invoice_id]})
+    assert response.status_code == 422
+
+
+async def test_bulk_transition_skips_disallowed_sources(client):
+    ids = {status: await create_invoice(client, status) for status in ("draft", "pending", "sent", "overdue", "paid", "cancelled")}
+    response = await client.post("/api/v1/invoices/status-transitions", json={
+        "target_status": "cancelled",
+        "ids": list(ids.values()) + [999999],
+    })
+    assert response.status_code == 200
+    body = response.json()
+    cancellable = [ids[status] for status in ("draft", "pending", "sent", "overdue")]
+    assert sorted(body["updated"]) == sorted(cancellable)
+    assert body["skipped"] == sorted([ids["paid"], ids["cancelled"], 999999])
+    assert await status_of(client, ids["paid"]) == "paid"
+
+
+async def test_bulk_transition_by_filter(client):
+    late = await create_invoice(client, "sent", due_date="2026-01-15")
+    on_time = await create_invoice(client, "sent", due_date="2099-01-15")
+    draft = await create_invoice(client, "draft", due_date="2026-01-15")
+    response = await client.post("/api/v1/invoices/status-transitions", json={
+        "target_status": "overdue",
+        "filter": {"due_before": "2026-02-01"},
+    })
+    assert response.json()["updated"] == [late]
+    assert [await status_of(client, i) for i in (late, on_time, draft)] == ["overdue", "sent", "draft"]
+
+
+async def test_paid_and_cancelled_stay_terminal(client):
+    paid = await create_invoice(client, "sent")
+    await client.post(f"/api/v1/invoices/{paid}/payments", json={"amount": 100})
+    cancelled = await create_invoice(client, "sent")
+    await client.put(f"/api/v1/invoices/{cancelled}", json={"status": "cancelled"})
+
+    for target in ("draft", "pending", "sent", "overdue", "paid", "cancelled"):
+        response = await client.post("/api/v1/invoices/status-transitions", json={
+            "target_status": target, "ids": [paid, cancelled],
+        })
+        assert response.json()["updated"] == []
+    # An overpayment on a paid invoice is recorded without reopening it
+    assert (await client.post(f"/api/v1/invoices/{paid}/payments", json={"amount": 5})).status_code == 201
+    assert [await status_of(client, i) for i in (paid, cancelled)] == ["paid", "cancelled"]
+
+
+async def test_sweep_skips_rows_locked_by_another_transaction(client, db_sessions):
+    past_due = [await create_invoice(client, status, due_date="2026-01-15") for status in ("pending", "sent", "sent", "overdue", "draft")]
+    paid = await create_invoice(client, "paid", due_date="2026-01-15")
+    await create_invoice(client, "sent", due_date="2099-01-15")
+
+    async with db_sessions() as holder:
+        await holder.execute(select(Invoice).where(Invoice.id == past_due[0]).with_for_update())
+        # Batches of two until a short one; the locked row is left for later
+        assert await sweep_overdue(batch_size=2, pause=0) == 2
+        await holder.commit()
+    assert await sweep_overdue(batch_size=2, pause=0) == 1
+
+    statuses = [await status_of(client, i) for i in past_due + [paid]]
+    assert statuses == ["overdue", "overdue", "overdue", "overdue", "draft", "paid"]
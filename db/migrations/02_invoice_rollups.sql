@@ -0,0 +1,79 @@
+-- ==========================================================
+-- Invoice Management - Reporting Rollups Migration
+-- ==========================================================
+
+-- 1. Daily rollup of invoiced / paid totals per day and due date: invoices
+--    under their issue day, payments under the day they were received.
+--    settled_balance is what paid invoices would still owe by their payments.
+--    Maintained incrementally by invoice-service on every invoice and payment write.
+CREATE TABLE IF NOT EXISTS invoices.invoice_daily_rollups (
+    day DATE NOT NULL,
+    due_date DATE NOT NULL,
+    invoice_count INTEGER NOT NULL DEFAULT 0,
+    invoiced_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    payment_count INTEGER NOT NULL DEFAULT 0,
+    paid_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    settled_count INTEGER NOT NULL DEFAULT 0,
+    settled_balance DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, due_date)
+);
+
+-- Tables created before settled_balance existed
+ALTER TABLE invoices.invoice_daily_rollups
+    ADD COLUMN IF NOT EXISTS settled_balance DECIMAL(14, 2) NOT NULL DEFAULT 0;
+
+-- 2. Indexes for the live "today" delta
+CREATE INDEX IF NOT EXISTS idx_invoices_created_at ON invoices.invoices(created_at);
+CREATE INDEX IF NOT EXISTS idx_payments_payment_date ON invoices.payments(payment_date);
+CREATE INDEX IF NOT EXISTS idx_payments_invoice ON invoices.payments(invoice_id);
+CREATE INDEX IF NOT EXISTS idx_line_items_invoice ON invoices.line_items(invoice_id);
+
+-- 3. Backfill from existing invoices and payments (safe to re-run)
+BEGIN;
+
+DELETE FROM invoices.invoice_daily_rollups;
+
+INSERT INTO invoices.invoice_daily_rollups
+    (day, due_date, invoice_count, invoiced_amount, payment_count, paid_amount, settled_count, settled_balance)
+SELECT day, due_date, SUM(invoice_count), SUM(invoiced_amount), SUM(payment_count),
+       SUM(paid_amount), SUM(settled_count), SUM(settled_balance)
+FROM (
+    -- Invoices under their issue day
+    SELECT
+        i.created_at::date AS day,
+        COALESCE(i.due_date, i.created_at::date) AS due_date,  -- no due date = due on receipt
+        COUNT(*) AS invoice_count,
+        SUM(i.total_amount) AS invoiced_amount,
+        0 AS payment_count,
+        0 AS paid_amount,
+        COUNT(*) FILTER (WHERE i.status = 'paid') AS settled_count,
+        COALESCE(SUM(i.total_amount - COALESCE(p.paid_amount, 0)) FILTER (WHERE i.status = 'paid'), 0) AS settled_balance
+    FROM invoices.invoices i
+    LEFT JOIN (
+        SELECT invoice_id, SUM(amount) AS paid_amount
+        FROM invoices.payments
+        GROUP BY invoice_id
+    ) p ON p.invoice_id = i.id
+    WHERE i.status <> 'cancelled'
+    GROUP BY 1, 2
+
+    UNION ALL
+
+    -- Payments under the day they were received
+    SELECT
+        p.payment_date::date,
+        COALESCE(i.due_date, i.created_at::date),
+        0,
+        0,
+        COUNT(*),
+        SUM(p.amount),
+        0,
+        0
+    FROM invoices.payments p
+    JOIN invoices.invoices i ON i.id = p.invoice_id
+    WHERE i.status <> 'cancelled'
+    GROUP BY 1, 2
+) t
+GROUP BY day, due_date;
+
+COMMIT;
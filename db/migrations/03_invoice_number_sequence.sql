@@ -0,0 +1,10 @@
+-- ==========================================================
+-- Invoice Management - Server-side Invoice Numbering
+-- ==========================================================
+
+-- Each nextval() reserves a block of INCREMENT numbers for one service process
+-- (see apps/invoice-service/app/numbering.py). Keep INCREMENT in line with
+-- INVOICE_NUMBER_BLOCK_SIZE; the service reads the value back from pg_sequences.
+CREATE SEQUENCE IF NOT EXISTS invoices.invoice_number_seq
+    START WITH 1
+    INCREMENT BY 100;
@@ -0,0 +1,8 @@
+-- ==========================================================
+-- Invoice Management - Status / Due Date Index
+-- ==========================================================
+
+-- Supports the overdue sweep and filtered status transitions:
+-- WHERE status IN (...) AND due_date < current_date
+CREATE INDEX IF NOT EXISTS idx_invoices_status_due_date
+    ON invoices.invoices (status, due_date);
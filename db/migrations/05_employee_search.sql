@@ -0,0 +1,41 @@
+-- ==========================================================
+-- Employee Management - Directory Search
+-- ==========================================================
+
+-- Trigram indexes back the /employees/suggest database fallback
+-- (prefix LIKE and fuzzy % matching on lower(...) expressions)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_employees_full_name_trgm
+    ON employees.employees USING gin (lower(full_name) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_employees_employee_id_trgm
+    ON employees.employees USING gin (lower(employee_id) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_employees_email_trgm
+    ON employees.employees USING gin (lower(email) gin_trgm_ops);
+
+-- Change notifications keep each service process's in-memory index current.
+-- Row changes send the employee id; TRUNCATE asks listeners to reload.
+-- The channel name is fixed: employee-service listens on the same one
+-- (NOTIFY_CHANNEL in app/typeahead.py).
+CREATE OR REPLACE FUNCTION employees.notify_employee_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        PERFORM pg_notify('employees_changed', '*');
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('employees_changed', OLD.id::text);
+    ELSE
+        PERFORM pg_notify('employees_changed', NEW.id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_employees_notify ON employees.employees;
+CREATE TRIGGER trg_employees_notify
+    AFTER INSERT OR UPDATE OR DELETE ON employees.employees
+    FOR EACH ROW EXECUTE FUNCTION employees.notify_employee_change();
+
+DROP TRIGGER IF EXISTS trg_employees_notify_truncate ON employees.employees;
+CREATE TRIGGER trg_employees_notify_truncate
+    AFTER TRUNCATE ON employees.employees
+    FOR EACH STATEMENT EXECUTE FUNCTION employees.notify_employee_change();
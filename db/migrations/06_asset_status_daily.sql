@@ -0,0 +1,29 @@
+-- ==========================================================
+-- Asset Management - Daily Status Snapshots Migration
+-- ==========================================================
+
+-- 1. Number of assets per status at the end of each (UTC) day.
+--    Filled by asset-service: `python -m app.jobs.status_snapshots --backfill-days 365`
+--    once, then nightly by the same job (or the in-process scheduler).
+CREATE TABLE IF NOT EXISTS assets.asset_status_daily (
+    day DATE NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    asset_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, status)
+);
+
+-- 2. Structured status history (also created by seed_asset_management.sql);
+--    replayed together with the status events in assets.asset_history
+CREATE TABLE IF NOT EXISTS assets.asset_status_history (
+    id SERIAL PRIMARY KEY,
+    asset_id INTEGER REFERENCES assets.assets(id) ON DELETE CASCADE,
+    from_status VARCHAR(50) NOT NULL,
+    to_status VARCHAR(50) NOT NULL,
+    reason TEXT,
+    changed_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    changed_by VARCHAR(255)
+);
+
+-- 3. Indexes for replaying history from a given day onwards
+CREATE INDEX IF NOT EXISTS idx_asset_history_event_time ON assets.asset_history(event_time);
+CREATE INDEX IF NOT EXISTS idx_asset_status_history_changed_at ON assets.asset_status_history(changed_at);
@@ -0,0 +1,4 @@
+"""
+Load testing for the TB ERP services: a synthetic data generator and an
+asyncio HTTP driver with scripted scenarios. See loadtest/README.md.
+"""
@@ -0,0 +1,173 @@
+"""
+Load-test command line
+
+    python -m loadtest seed --dsn postgresql://admin:pw@localhost/tb_erp_db --reset
+    python -m loadtest run dashboard-storm --concurrency 200 --duration 60 --save results/storm.json
+    python -m loadtest run list-paging --rate 300 --compare results/baseline/list-paging.json
+    python -m loadtest run dashboard-storm --concurrency 200 --pool asset --save results/storm-coalesced.json
+
+Service URLs default to the local docker-compose ports and can be overridden
+with ASSET_SERVICE_URL / INVOICE_SERVICE_URL / EMPLOYEE_SERVICE_URL /
+DASHBOARD_BFF_URL. Requests carry an admin JWT signed with JWT_SECRET.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from jose import jwt
+
+from loadtest.data import generate
+from loadtest.driver import LoadDriver
+from loadtest.scenarios import SCENARIOS
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+ROLLUPS_SQL = ROOT_DIR / "db" / "migrations" / "02_invoice_rollups.sql"
+
+DEFAULT_URLS = {
+    "asset": ("ASSET_SERVICE_URL", "http://localhost:8001"),
+    "invoice": ("INVOICE_SERVICE_URL", "http://localhost:8002"),
+    "employee": ("EMPLOYEE_SERVICE_URL", "http://localhost:8003"),
+}
+
+
+def _token(secret: str) -> str:
+    now = int(time.time())
+    claims = {"sub": "0", "email": "loadtest@trustybytes.in", "roles": ["admin"], "iat": now, "exp": now + 6 * 3600}
+    return jwt.encode(claims, secret, algorithm=os.getenv("JWT_ALGORITHM", "HS256"))
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    rate = f"{report['rate']}/s open loop" if report["rate"] else f"{report['concurrency']} workers"
+    print(f"\n{report['scenario']} ({rate}, {report['duration_s']}s)")
+    header = f"{'operation':32} {'requests':>9} {'errors':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+    print(header)
+    print("-" * len(header))
+    rows = list(report["operations"].items()) + [("TOTAL", report["total"])]
+    for name, s in rows:
+        print(f"{name:32} {s['requests']:>9} {s['errors']:>7} {s['rps']:>8} "
+              f"{s['p50_ms']:>8} {s['p95_ms']:>8} {s['p99_ms']:>8} {s['max_ms']:>8}")
+    if report.get("db_pool"):
+        print(f"\n{'db pool (checked out)':32} {'samples':>9} {'errors':>7} {'size':>8} "
+              f"{'mean':>8} {'p95':>8} {'max':>8} {'overflow':>8}")
+        for service, p in report["db_pool"].items():
+            print(f"{service:32} {p['samples']:>9} {p['errors']:>7} {p['pool_size'] or '-':>8} "
+                  f"{p['checked_out_mean']:>8} {p['checked_out_p95']:>8} {p['checked_out_max']:>8} {p['overflow_max']:>8}")
+
+
+def _regressions(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Operations whose p95/p99 grew, or throughput fell, by more than threshold percent"""
+    found = []
+    for name, current in report["operations"].items():
+        before = baseline["operations"].get(name)
+        if not before:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if before[metric] and current[metric] > before[metric] * (1 + threshold / 100):
+                found.append(f"{name}: {metric} {before[metric]} -> {current[metric]}")
+        if before["rps"] and current["rps"] < before["rps"] * (1 - threshold / 100):
+            found.append(f"{name}: rps {before['rps']} -> {current['rps']}")
+    return found
+
+
+def _seed(args) -> int:
+    dsn = args.dsn or os.getenv("DATABASE_URL")
+    if not dsn:
+        print("Pass --dsn or set DATABASE_URL", file=sys.stderr)
+        return 2
+    dsn = dsn.replace("postgresql+asyncpg://", "postgresql://")
+    started = time.perf_counter()
+    asyncio.run(generate(
+        dsn,
+        assets=args.assets,
+        employees=args.employees,
+        invoices=args.invoices,
+        seed=args.seed,
+        reset=args.reset,
+        rollups_sql=ROLLUPS_SQL.read_text() if ROLLUPS_SQL.exists() else None,
+    ))
+    print(f"Done in {time.perf_counter() - started:.0f}s")
+    return 0
+
+
+def _run(args) -> int:
+    secret = os.getenv("JWT_SECRET")
+    if not secret:
+        print("Set JWT_SECRET to the services' signing secret", file=sys.stderr)
+        return 2
+    urls = {name: os.getenv(env, default) for name, (env, default) in DEFAULT_URLS.items()}
+    if os.getenv("DASHBOARD_BFF_URL"):
+        urls["bff"] = os.environ["DASHBOARD_BFF_URL"]
+
+    unknown = [service for service in args.pool if service not in urls]
+    if unknown:
+        print(f"--pool: unknown service {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    setup, step = SCENARIOS[args.scenario]
+    driver = LoadDriver(
+        urls,
+        _token(secret),
+        concurrency=args.concurrency,
+        duration=args.duration,
+        warmup=args.warmup,
+        rate=args.rate,
+        seed=args.seed,
+        pool_services=args.pool,
+    )
+    report = asyncio.run(driver.run(args.scenario, step, setup))
+    _print_report(report)
+
+    if args.save:
+        path = Path(args.save)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = _regressions(report, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions over {args.threshold}% against {args.compare}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions over {args.threshold}% against {args.compare}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="TB ERP load testing")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="Load synthetic data with COPY")
+    seed.add_argument("--dsn", help="postgresql:// URL (default: DATABASE_URL)")
+    seed.add_argument("--assets", type=int, default=1_000_000)
+    seed.add_argument("--employees", type=int, default=50_000)
+    seed.add_argument("--invoices", type=int, default=200_000)
+    seed.add_argument("--seed", type=int, default=42)
+    seed.add_argument("--reset", action="store_true", help="Truncate the service tables first")
+    seed.set_defaults(func=_seed)
+
+    run = commands.add_parser("run", help="Run a scenario and report throughput and latency percentiles")
+    run.add_argument("scenario", choices=sorted(SCENARIOS))
+    run.add_argument("--concurrency", type=int, default=50, help="Workers (closed loop) or max in flight (open loop)")
+    run.add_argument("--rate", type=float, help="Steps per second; switches to an open-loop arrival model")
+    run.add_argument("--duration", type=float, default=60.0)
+    run.add_argument("--warmup", type=float, default=5.0)
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--pool", action="append", default=[], metavar="SERVICE",
+                     help="Sample this service's database pool from /health while recording (repeatable)")
+    run.add_argument("--save", help="Write the JSON report here")
+    run.add_argument("--compare", help="Baseline JSON report; exit 1 on regressions")
+    run.add_argument("--threshold", type=float, default=10.0, help="Allowed regression in percent")
+    run.set_defaults(func=_run)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
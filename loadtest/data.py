@@ -0,0 +1,359 @@
+"""
+Synthetic data generator
+
+Loads realistic volumes into a local Postgres with COPY: employees, assets
+with their assignment / maintenance / audit history, and invoices with line
+items and payments. Rows are generated in chunks and streamed as CSV, so a
+million assets load in minutes without holding the data set in memory.
+
+Every asset gets a consistent story: created, possibly assigned and returned
+a few times, possibly sent to maintenance or retired, and its final status
+matches the last event, so history replays (status snapshots) line up with
+the assets table. Generation is deterministic for a given --seed.
+
+Generated keys use an LT- prefix and continue after the current max ids, so
+the generator can run on top of the seed data; --reset truncates first.
+"""
+import csv
+import io
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+import asyncpg
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Arjun", "Ananya", "Bala", "Deepa", "Divya", "Gokul", "Hari", "Isha",
+    "Karthik", "Kavya", "Lakshmi", "Manoj", "Meena", "Nandini", "Naveen", "Pooja", "Pradeep",
+    "Priya", "Rahul", "Ramesh", "Revathi", "Sanjay", "Saranya", "Senthil", "Shreya", "Suresh",
+    "Swathi", "Tamil", "Uma", "Varun", "Vidya", "Vignesh", "Yamini", "Anand", "Bhavana",
+    "Chitra", "Dinesh", "Gayathri", "Harini", "Janani", "Keerthi", "Madhan", "Nithya",
+]
+LAST_NAMES = [
+    "Kumar", "Sharma", "Nair", "Reddy", "Iyer", "Menon", "Pillai", "Rao", "Singh", "Das",
+    "Krishnan", "Subramanian", "Raman", "Natarajan", "Venkatesh", "Balaji", "Murthy", "Gupta",
+    "Joseph", "Thomas", "Mohan", "Srinivasan", "Ganesan", "Rajan", "Shankar", "Prakash",
+]
+LOCATIONS = ["Chennai", "Bangalore", "Hyderabad", "Mumbai", "Kochi", "Pune", "Coimbatore", "Remote"]
+MANUFACTURERS = ["LENOVO", "DELL", "HP", "APPLE", "LOGITECH", "SAMSUNG", "TP-LINK", "PLANTRONICS"]
+
+# (asset_type, asset_class, weight, [(manufacturer, model)])
+CATALOG = [
+    ("Laptop", "System", 30, [("LENOVO", "ThinkPad T470s"), ("LENOVO", "Thinkpad T490S"), ("DELL", "Latitude 7410"),
+                              ("HP", "EliteBook 840 G7"), ("APPLE", "MacBook Air M2")]),
+    ("Monitor", "Peripheral", 20, [("HP", "P27 G5"), ("DELL", "E2421HN"), ("HP", "P24V G5"), ("DELL", "E2221HN")]),
+    ("Mouse", "Peripheral", 15, [("LOGITECH", "M185"), ("LOGITECH", "M90")]),
+    ("Keyboard", "Peripheral", 12, [("LOGITECH", "K235")]),
+    ("Headset", "Peripheral", 10, [("LOGITECH", "H390"), ("PLANTRONICS", "C3225T")]),
+    ("Mobile", "System", 6, [("APPLE", "Iphone 14"), ("APPLE", "Iphone 15"), ("SAMSUNG", "Galaxy S23")]),
+    ("Mac Mini", "System", 3, [("APPLE", "Mac mini m4")]),
+    ("Router", "Peripheral", 2, [("TP-LINK", "Archer C6U")]),
+    ("Printer", "Peripheral", 2, [("HP", "SHNGCN-1202N-01")]),
+]
+CATALOG_WEIGHTS = [entry[2] for entry in CATALOG]
+LAPTOP_SPECS = {
+    "os": ["Windows 10", "Windows 11", "MacOS"],
+    "processor": ["Intel Core i5", "Intel Core i7 Gen 7", "Intel Core i7 Gen 10", "Apple M2"],
+    "ram": ["8", "16", "24", "32"],
+    "disk": ["256 GB", "476 GB", "512 GB", "1 TB"],
+    "battery": ["Excellent", "Good", "Average", "Bad"],
+}
+MAINTENANCE_TYPES = ["Battery Replacement", "Keyboard Repair", "Screen Replacement", "OS Reinstall", "Cleaning", "Upgrade"]
+PAYMENT_METHODS = ["bank_transfer", "card", "upi", "cheque"]
+
+# Final asset status and its share of the fleet
+STATUS_MIX = [("active", 45), ("assigned", 40), ("maintenance", 8), ("retired", 5), ("disposed", 2)]
+INVOICE_STATUS_MIX = [("paid", 55), ("sent", 15), ("pending", 10), ("overdue", 10), ("draft", 7), ("cancelled", 3)]
+
+HISTORY_YEARS = 3
+CHUNK = 20000
+
+
+class Loader:
+    """Buffers rows per table as CSV and flushes them with COPY"""
+
+    def __init__(self, conn: asyncpg.Connection, tables: Dict[str, Sequence[str]]):
+        self.conn = conn
+        self.tables = tables
+        self.buffers: Dict[str, io.StringIO] = {}
+        self.writers = {}
+        self.counts: Dict[str, int] = {name: 0 for name in tables}
+
+    def add(self, table: str, row: Sequence) -> None:
+        if table not in self.tables:
+            return
+        if table not in self.writers:
+            self.buffers[table] = io.StringIO()
+            self.writers[table] = csv.writer(self.buffers[table])
+        self.writers[table].writerow(row)
+        self.counts[table] += 1
+
+    async def flush(self) -> None:
+        # In declaration order, so parents are copied before rows referencing them
+        for table in self.tables:
+            buffer = self.buffers.get(table)
+            if buffer is None:
+                continue
+            schema, name = table.split(".")
+            await self.conn.copy_to_table(
+                name,
+                schema_name=schema,
+                source=io.BytesIO(buffer.getvalue().encode()),
+                columns=list(self.tables[table]),
+                format="csv",
+            )
+        self.buffers.clear()
+        self.writers.clear()
+
+
+async def _exists(conn: asyncpg.Connection, table: str) -> bool:
+    return await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", table)
+
+
+async def _next_id(conn: asyncpg.Connection, table: str) -> int:
+    return (await conn.fetchval(f"SELECT coalesce(max(id), 0) FROM {table}")) + 1
+
+
+async def _event_labels(conn: asyncpg.Connection) -> Dict[str, str]:
+    """asset_history.event_type labels as stored (SQLAlchemy enums store member names)"""
+    labels = await conn.fetch(
+        """
+        SELECT e.enumlabel FROM pg_attribute a JOIN pg_enum e ON e.enumtypid = a.atttypid
+        WHERE a.attrelid = 'assets.asset_history'::regclass AND a.attname = 'event_type'
+        """
+    )
+    upper = any(row["enumlabel"].isupper() for row in labels)
+    names = ["created", "status_changed", "assigned", "unassigned", "maintenance"]
+    return {name: name.upper() if upper else name for name in names}
+
+
+def _weighted(rng: random.Random, mix) -> str:
+    return rng.choices([value for value, _ in mix], weights=[weight for _, weight in mix])[0]
+
+
+def _ts(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat(sep=" ") if value else None
+
+
+async def load_employees(conn, rng: random.Random, count: int) -> List[int]:
+    departments = [row["id"] for row in await conn.fetch("SELECT id FROM employees.departments")]
+    loader = Loader(conn, {"employees.employees": (
+        "id", "employee_id", "full_name", "email", "department_id", "location", "is_active", "created_at",
+    )})
+    start = await _next_id(conn, "employees.employees")
+    now = datetime.utcnow()
+    active = []
+    for id in range(start, start + count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        is_active = rng.random() < 0.94
+        if is_active:
+            active.append(id)
+        loader.add("employees.employees", (
+            id, f"LT-E{id:07d}", f"{first} {last}", f"{first}.{last}.{id}@loadtest.example".lower(),
+            rng.choice(departments) if departments else None, rng.choice(LOCATIONS), is_active,
+            _ts(now - timedelta(days=rng.randint(0, 365 * HISTORY_YEARS))),
+        ))
+        if loader.counts["employees.employees"] % CHUNK == 0:
+            await loader.flush()
+    await loader.flush()
+    print(f"  employees: {count}")
+    return active
+
+
+async def load_assets(conn, rng: random.Random, count: int, employees: List[int]) -> None:
+    tables = {
+        "assets.assets": (
+            "id", "asset_id", "asset_type", "asset_class", "serial_number", "manufacturer", "model",
+            "os_installed", "processor", "ram_size_gb", "hard_drive_size", "battery_condition",
+            "status", "assigned_employee_id", "created_at", "updated_at",
+        ),
+        "assets.maintenance_logs": (
+            "asset_id", "maintenance_type", "description", "cost", "performed_by", "performed_at",
+            "next_maintenance", "created_at",
+        ),
+    }
+    optional = {
+        "assets.asset_history": ("asset_id", "event_type", "event_time", "details", "performed_by"),
+        "assets.assignment_history": ("asset_id", "employee_id", "assigned_by", "assigned_date", "return_date", "notes"),
+        "assets.asset_assignments": ("asset_id", "employee_id", "assigned_at", "unassigned_at"),
+    }
+    for table, columns in optional.items():
+        if await _exists(conn, table):
+            tables[table] = columns
+        else:
+            print(f"  ({table} does not exist; skipped)")
+    labels = await _event_labels(conn) if "assets.asset_history" in tables else {}
+
+    loader = Loader(conn, tables)
+    start = await _next_id(conn, "assets.assets")
+    now = datetime.utcnow()
+    by = "loadtest@trustybytes.in"
+
+    for id in range(start, start + count):
+        asset_type, asset_class, _, models = rng.choices(CATALOG, weights=CATALOG_WEIGHTS)[0]
+        manufacturer, model = rng.choice(models)
+        specs = (
+            [rng.choice(LAPTOP_SPECS[key]) for key in ("os", "processor", "ram", "disk", "battery")]
+            if asset_type == "Laptop" else ["N/A"] * 5
+        )
+        created = now - timedelta(days=rng.uniform(1, 365 * HISTORY_YEARS))
+        final = _weighted(rng, STATUS_MIX)
+        loader.add("assets.asset_history", (id, labels.get("created"), _ts(created), "Asset created", by))
+
+        # Past assign / return cycles, spread between creation and now
+        t = created
+        owner = owner_since = None
+        for _ in range(rng.choice([0, 0, 1, 1, 2, 3])):
+            t += timedelta(days=rng.uniform(1, 120))
+            if t >= now:
+                break
+            owner = rng.choice(employees) if employees else None
+            if owner is None:
+                break
+            owner_since = t
+            returned = t + timedelta(days=rng.uniform(5, 200))
+            if returned >= now:
+                returned = None
+            loader.add("assets.asset_history", (id, labels.get("assigned"), _ts(t), f"Assigned to employee {owner}", by))
+            loader.add("assets.assignment_history", (id, owner, None, _ts(t), _ts(returned), None))
+            if returned is None:
+                break
+            loader.add("assets.asset_history", (id, labels.get("unassigned"), _ts(returned), f"Unassigned from employee {owner}", by))
+            loader.add("assets.asset_assignments", (id, owner, _ts(t), _ts(returned)))
+            t = returned
+            owner = None
+
+        # Bring the story to the chosen final status
+        status = "assigned" if owner else "active"
+        if final != status and (final != "assigned" or employees):
+            t = min(now - timedelta(minutes=1), t + timedelta(days=rng.uniform(1, 60)))
+            if owner and final != "assigned":
+                loader.add("assets.asset_history", (id, labels.get("unassigned"), _ts(t), f"Unassigned from employee {owner}", by))
+                loader.add("assets.asset_assignments", (id, owner, _ts(owner_since), _ts(t)))
+                owner = None
+                t += timedelta(seconds=1)
+            if final == "assigned":
+                owner, owner_since = rng.choice(employees), t
+                loader.add("assets.asset_history", (id, labels.get("assigned"), _ts(t), f"Assigned to employee {owner}", by))
+                loader.add("assets.assignment_history", (id, owner, None, _ts(t), None, None))
+            elif final != "active":
+                loader.add("assets.asset_history", (
+                    id, labels.get("status_changed"), _ts(t), f"Status changed: active -> {final}", by,
+                ))
+            status = final
+        if owner:
+            loader.add("assets.asset_assignments", (id, owner, _ts(owner_since), None))
+
+        # Maintenance visits for about a third of the fleet
+        for _ in range(rng.choice([0, 0, 0, 1, 1, 2])):
+            performed = created + timedelta(days=rng.uniform(0, (now - created).days or 1))
+            kind = rng.choice(MAINTENANCE_TYPES)
+            loader.add("assets.maintenance_logs", (
+                id, kind, f"{kind} ({model})", round(rng.uniform(200, 15000), 2), "IT Support",
+                _ts(performed), _ts(performed + timedelta(days=180)), _ts(performed),
+            ))
+
+        loader.add("assets.assets", (
+            id, f"LT-A{id:08d}", asset_type, asset_class, f"SN{rng.getrandbits(40):010X}", manufacturer, model,
+            *specs, status, owner, _ts(created), _ts(max(created, t)),
+        ))
+        if (id - start + 1) % CHUNK == 0:
+            await loader.flush()
+    await loader.flush()
+    for table, rows in loader.counts.items():
+        print(f"  {table}: {rows}")
+
+
+async def load_invoices(conn, rng: random.Random, count: int) -> None:
+    loader = Loader(conn, {
+        "invoices.invoices": ("id", "invoice_number", "total_amount", "status", "due_date", "created_at"),
+        "invoices.line_items": ("invoice_id", "description", "quantity", "unit_price", "total_price", "created_at"),
+        "invoices.payments": ("invoice_id", "amount", "payment_method", "payment_date", "reference_number", "created_at"),
+    })
+    start = await _next_id(conn, "invoices.invoices")
+    now = datetime.utcnow()
+    for id in range(start, start + count):
+        created = now - timedelta(days=rng.uniform(0, 365 * HISTORY_YEARS))
+        status = _weighted(rng, INVOICE_STATUS_MIX)
+        due = (created + timedelta(days=rng.choice([15, 30, 45, 60]))).date()
+        if status == "overdue":
+            due = min(due, (now - timedelta(days=rng.randint(1, 120))).date())
+        total = 0.0
+        for n in range(rng.randint(1, 6)):
+            quantity = rng.randint(1, 20)
+            unit_price = round(rng.uniform(50, 5000), 2)
+            total += quantity * unit_price
+            loader.add("invoices.line_items", (
+                id, f"Service line {n + 1}", quantity, unit_price, round(quantity * unit_price, 2), _ts(created),
+            ))
+        total = round(total, 2)
+        if status == "paid":
+            paid_at = min(now, created + timedelta(days=rng.uniform(1, 60)))
+            loader.add("invoices.payments", (
+                id, total, rng.choice(PAYMENT_METHODS), _ts(paid_at), f"REF{id:09d}", _ts(paid_at),
+            ))
+        loader.add("invoices.invoices", (id, f"LT-INV-{id:08d}", total, status, due.isoformat(), _ts(created)))
+        if (id - start + 1) % CHUNK == 0:
+            await loader.flush()
+    await loader.flush()
+    for table, rows in loader.counts.items():
+        print(f"  {table}: {rows}")
+
+
+RESET_TABLES = [
+    "assets.asset_status_daily", "assets.asset_history", "assets.assignment_history", "assets.asset_assignments",
+    "assets.asset_status_history", "assets.maintenance_logs", "assets.assets",
+    "invoices.invoice_daily_rollups", "invoices.payments", "invoices.line_items", "invoices.invoices",
+    "employees.employees",
+]
+SEQUENCE_TABLES = [
+    "employees.employees", "assets.assets", "assets.maintenance_logs", "assets.asset_history",
+    "assets.assignment_history", "assets.asset_assignments",
+    "invoices.invoices", "invoices.line_items", "invoices.payments",
+]
+
+
+async def generate(
+    dsn: str,
+    assets: int,
+    employees: int,
+    invoices: int,
+    seed: int = 42,
+    reset: bool = False,
+    rollups_sql: Optional[str] = None,
+) -> None:
+    rng = random.Random(seed)
+    conn = await asyncpg.connect(dsn)
+    try:
+        try:
+            # Skips the per-row employee NOTIFY trigger during the load (needs superuser)
+            await conn.execute("SET session_replication_role = replica")
+        except asyncpg.PostgresError:
+            pass
+        if reset:
+            existing = [t for t in RESET_TABLES if await _exists(conn, t)]
+            print(f"Truncating {', '.join(existing)}")
+            await conn.execute(f"TRUNCATE {', '.join(existing)} RESTART IDENTITY CASCADE")
+
+        print("Loading employees")
+        active = await load_employees(conn, rng, employees)
+        if not active:
+            active = [row["id"] for row in await conn.fetch("SELECT id FROM employees.employees WHERE is_active")]
+        print("Loading assets")
+        await load_assets(conn, rng, assets, active)
+        print("Loading invoices")
+        await load_invoices(conn, rng, invoices)
+
+        for table in SEQUENCE_TABLES:
+            if await _exists(conn, table):
+                await conn.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), coalesce(max(id), 1)) FROM {table}"
+                )
+        if rollups_sql:
+            print("Rebuilding invoice rollups")
+            await conn.execute(rollups_sql)
+        print("Analyzing")
+        await conn.execute("ANALYZE")
+        await conn.execute("NOTIFY employees_changed, '*'")
+    finally:
+        await conn.close()
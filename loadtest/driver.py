@@ -0,0 +1,260 @@
+"""
+Asyncio HTTP load driver
+
+A scenario is a coroutine `step(ctx)` that performs one user action through
+`ctx.call(...)`; the driver runs it from many concurrent workers and records
+the latency of every call under the operation name the scenario gives it.
+
+Two load models:
+- closed loop (default): `concurrency` workers each run steps back to back
+- open loop (`rate`): steps start at a fixed rate regardless of how fast the
+  services answer, and latency is measured from the scheduled start, so a
+  stalled service shows up in the percentiles instead of silently lowering
+  the offered load (coordinated omission)
+
+With `pool_services`, the driver also polls those services' /health while
+it records and reports how many database connections they had checked out
+(`db_pool`), to show what a change does to connection pressure.
+"""
+import asyncio
+import math
+import random
+import time
+from contextlib import suppress
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+# Open loop only: when the current step was scheduled to start
+scheduled_start: ContextVar[Optional[float]] = ContextVar("scheduled_start", default=None)
+
+
+@dataclass
+class OperationStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    status_codes: Dict[int, int] = field(default_factory=dict)
+
+    def record(self, elapsed_ms: float, status_code: Optional[int], ok: bool) -> None:
+        self.latencies_ms.append(elapsed_ms)
+        if status_code is not None:
+            self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+        if not ok:
+            self.errors += 1
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(stats: OperationStats, duration: float) -> Dict[str, Any]:
+    values = sorted(stats.latencies_ms)
+    return {
+        "requests": len(values),
+        "errors": stats.errors,
+        "rps": round(len(values) / duration, 1) if duration else 0.0,
+        "p50_ms": round(percentile(values, 50), 1),
+        "p95_ms": round(percentile(values, 95), 1),
+        "p99_ms": round(percentile(values, 99), 1),
+        "max_ms": round(values[-1], 1) if values else 0.0,
+        "status_codes": {str(k): v for k, v in sorted(stats.status_codes.items())},
+    }
+
+
+@dataclass
+class PoolSamples:
+    """db_pool readings from one service's /health"""
+    checked_out: List[int] = field(default_factory=list)
+    overflow: List[int] = field(default_factory=list)
+    size: Optional[int] = None
+    errors: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        values = sorted(self.checked_out)
+        return {
+            "samples": len(values),
+            "errors": self.errors,
+            "pool_size": self.size,
+            "checked_out_mean": round(sum(values) / len(values), 1) if values else 0.0,
+            "checked_out_p95": percentile(values, 95),
+            "checked_out_max": values[-1] if values else 0,
+            # pool.overflow() is negative while the pool is below its size
+            "overflow_max": max(0, max(self.overflow, default=0)),
+        }
+
+
+class Context:
+    """What a scenario step sees: shared clients, random source and scenario state"""
+
+    def __init__(self, clients: Dict[str, httpx.AsyncClient], state: Dict[str, Any], seed: int):
+        self.clients = clients
+        self.state = state
+        self.rng = random.Random(seed)
+        self.stats: Dict[str, OperationStats] = {}
+        self.recording = False
+
+    async def call(
+        self,
+        service: str,
+        operation: str,
+        method: str,
+        path: str,
+        expect: tuple = (200, 201),
+        **kwargs,
+    ) -> Optional[httpx.Response]:
+        # The first call of an open-loop step also counts the time it waited to start
+        started = scheduled_start.get() or time.perf_counter()
+        scheduled_start.set(None)
+        response = None
+        try:
+            response = await self.clients[service].request(method, path, **kwargs)
+            ok = response.status_code in expect
+        except httpx.HTTPError:
+            ok = False
+        if self.recording:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.stats.setdefault(operation, OperationStats()).record(
+                elapsed_ms, response.status_code if response is not None else None, ok
+            )
+        return response
+
+
+Step = Callable[[Context], Awaitable[None]]
+
+
+class LoadDriver:
+    """Runs one scenario against the services and returns a report"""
+
+    def __init__(
+        self,
+        base_urls: Dict[str, str],
+        token: str,
+        concurrency: int = 50,
+        duration: float = 60.0,
+        warmup: float = 5.0,
+        rate: Optional[float] = None,
+        timeout: float = 30.0,
+        seed: int = 42,
+        pool_services: Optional[List[str]] = None,
+        pool_interval: float = 0.1,
+    ):
+        self.base_urls = base_urls
+        self.token = token
+        self.concurrency = concurrency
+        self.duration = duration
+        self.warmup = warmup
+        self.rate = rate
+        self.timeout = timeout
+        self.seed = seed
+        self.pool_services = pool_services or []
+        self.pool_interval = pool_interval
+
+    def _clients(self) -> Dict[str, httpx.AsyncClient]:
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        headers = {"Authorization": f"Bearer {self.token}"}
+        return {
+            name: httpx.AsyncClient(base_url=url, headers=headers, timeout=self.timeout, limits=limits)
+            for name, url in self.base_urls.items()
+        }
+
+    async def _closed_loop(self, ctx: Context, step: Step, stop_at: float) -> None:
+        async def worker():
+            while time.perf_counter() < stop_at:
+                await step(ctx)
+
+        await asyncio.gather(*[worker() for _ in range(self.concurrency)])
+
+    async def _open_loop(self, ctx: Context, step: Step, stop_at: float) -> None:
+        interval = 1.0 / self.rate
+        # Bounds memory if the services stall; extra arrivals still count from their scheduled time
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        next_at = time.perf_counter()
+
+        async def one(scheduled: float):
+            scheduled_start.set(scheduled)
+            async with slots:
+                await step(ctx)
+
+        while next_at < stop_at:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(one(next_at))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            next_at += interval
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _sample_pools(self, clients: Dict[str, httpx.AsyncClient], samples: Dict[str, PoolSamples]) -> None:
+        """Poll /health for db_pool until cancelled; runs alongside the recorded phase"""
+        while True:
+            started = time.perf_counter()
+            for service in self.pool_services:
+                readings = samples.setdefault(service, PoolSamples())
+                try:
+                    response = await clients[service].get("/health")
+                    pool = response.json()["db_pool"]
+                except (httpx.HTTPError, ValueError, KeyError):
+                    readings.errors += 1
+                    continue
+                readings.checked_out.append(pool["checked_out"])
+                readings.overflow.append(pool["overflow"])
+                readings.size = pool["size"]
+            await asyncio.sleep(max(0.0, self.pool_interval - (time.perf_counter() - started)))
+
+    async def run(self, name: str, step: Step, setup: Optional[Callable[[Context], Awaitable[None]]] = None) -> Dict[str, Any]:
+        clients = self._clients()
+        ctx = Context(clients, state={}, seed=self.seed)
+        pools: Dict[str, PoolSamples] = {}
+        monitor: Dict[str, httpx.AsyncClient] = {}
+        sampler = None
+        try:
+            if setup is not None:
+                await setup(ctx)
+            run = self._open_loop if self.rate else self._closed_loop
+            if self.warmup > 0:
+                await run(ctx, step, time.perf_counter() + self.warmup)
+            ctx.recording = True
+            if self.pool_services:
+                # A client of its own, so the probes do not queue behind the load
+                monitor.update({
+                    service: httpx.AsyncClient(base_url=self.base_urls[service], timeout=5.0)
+                    for service in self.pool_services
+                })
+                sampler = asyncio.create_task(self._sample_pools(monitor, pools))
+            started = time.perf_counter()
+            await run(ctx, step, started + self.duration)
+            elapsed = time.perf_counter() - started
+        finally:
+            if sampler is not None:
+                sampler.cancel()
+                with suppress(asyncio.CancelledError):
+                    await sampler
+            for client in [*clients.values(), *monitor.values()]:
+                await client.aclose()
+
+        total = OperationStats()
+        for stats in ctx.stats.values():
+            total.latencies_ms.extend(stats.latencies_ms)
+            total.errors += stats.errors
+            for code, count in stats.status_codes.items():
+                total.status_codes[code] = total.status_codes.get(code, 0) + count
+        report = {
+            "scenario": name,
+            "concurrency": self.concurrency,
+            "rate": self.rate,
+            "duration_s": round(elapsed, 1),
+            "total": summarize(total, elapsed),
+            "operations": {op: summarize(stats, elapsed) for op, stats in sorted(ctx.stats.items())},
+        }
+        if pools:
+            report["db_pool"] = {service: samples.summary() for service, samples in sorted(pools.items())}
+        return report
@@ -0,0 +1,158 @@
+"""
+Scripted load scenarios
+
+Each scenario is a (setup, step) pair for LoadDriver.run. Services are
+addressed by name: "asset", "invoice", "employee" and optionally "bff".
+Operation names are stable across releases so reports can be compared.
+"""
+import string
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from loadtest.data import FIRST_NAMES, LAST_NAMES, MANUFACTURERS
+from loadtest.driver import Context
+
+Setup = Optional[Callable[[Context], Awaitable[None]]]
+Step = Callable[[Context], Awaitable[None]]
+
+
+# ---------------------------------------------------------------- dashboard storm
+
+async def dashboard_step(ctx: Context) -> None:
+    """Everyone opens the dashboard at once: through the BFF when it is configured"""
+    if "bff" in ctx.clients:
+        await ctx.call("bff", "bff.dashboard", "GET", "/api/v1/dashboard", expect=(200,))
+        return
+    await ctx.call("asset", "asset.dashboard_stats", "GET", "/api/v1/analytics/dashboard-stats")
+    await ctx.call("asset", "asset.employee_usage", "GET", "/api/v1/analytics/employee-usage")
+    await ctx.call("invoice", "invoice.aging", "GET", "/api/v1/invoices/analytics/aging")
+    await ctx.call("employee", "employee.headcount", "GET", "/api/v1/employees/analytics/headcount")
+
+
+# ---------------------------------------------------------------- search
+
+def _prefix(ctx: Context) -> str:
+    name = ctx.rng.choice(FIRST_NAMES + LAST_NAMES)
+    return name[: ctx.rng.randint(2, min(5, len(name)))]
+
+
+async def search_step(ctx: Context) -> None:
+    """Typeahead keystrokes on employees and free-text asset search"""
+    roll = ctx.rng.random()
+    if roll < 0.6:
+        await ctx.call("employee", "employee.suggest", "GET", "/api/v1/employees/suggest",
+                       params={"q": _prefix(ctx), "limit": 10})
+    elif roll < 0.8:
+        await ctx.call("employee", "employee.search", "GET", "/api/v1/employees",
+                       params={"search": _prefix(ctx), "size": 20, "count": "estimate"})
+    else:
+        term = ctx.rng.choice([ctx.rng.choice(MANUFACTURERS), "".join(ctx.rng.choices(string.ascii_uppercase, k=3))])
+        await ctx.call("asset", "asset.search", "GET", "/api/v1/assets",
+                       params={"search": term, "size": 20, "count": "estimate"})
+
+
+# ---------------------------------------------------------------- list paging
+
+STATUSES = ["active", "assigned", "maintenance", "retired"]
+
+
+async def paging_step(ctx: Context) -> None:
+    """Browsing list pages, mostly shallow, sometimes deep, with and without filters"""
+    page = 1 if ctx.rng.random() < 0.6 else ctx.rng.randint(2, 500)
+    count = ctx.rng.choice(["exact", "estimate", "none"])
+    roll = ctx.rng.random()
+    if roll < 0.5:
+        params = {"page": page, "size": 50, "count": count}
+        if ctx.rng.random() < 0.5:
+            params["status"] = ctx.rng.choice(STATUSES)
+        await ctx.call("asset", f"asset.list.{count}", "GET", "/api/v1/assets", params=params)
+    elif roll < 0.8:
+        await ctx.call("invoice", f"invoice.list.{count}", "GET", "/api/v1/invoices",
+                       params={"page": page, "size": 50, "count": count})
+    else:
+        await ctx.call("employee", f"employee.list.{count}", "GET", "/api/v1/employees",
+                       params={"page": page, "size": 50, "count": count})
+
+
+# ---------------------------------------------------------------- assign / return churn
+
+ASSIGN_PATH = "/api/v1/assignments/{asset_id}/assign"
+
+
+async def churn_setup(ctx: Context) -> None:
+    """Collect a pool of unassigned assets and active employees to shuffle around"""
+    # asset-service logs and skips routers that fail to import; measuring 404s would be meaningless
+    response = await ctx.call("asset", "setup", "GET", "/openapi.json")
+    if response is None or ASSIGN_PATH not in response.json().get("paths", {}):
+        raise RuntimeError("asset-service does not serve /api/v1/assignments; check its startup log")
+    assets, employees = [], []
+    # Returned assets come back in_stock
+    for status in ("active", "in_stock"):
+        for page in range(1, 6):
+            response = await ctx.call("asset", "setup", "GET", "/api/v1/assets",
+                                      params={"status": status, "page": page, "size": 100, "count": "none"})
+            if response is None or response.status_code != 200 or not response.json()["items"]:
+                break
+            assets.extend(item["id"] for item in response.json()["items"])
+    for page in range(1, 6):
+        response = await ctx.call("employee", "setup", "GET", "/api/v1/employees",
+                                  params={"page": page, "size": 100, "count": "none"})
+        if response is None or response.status_code != 200:
+            break
+        employees.extend(item["id"] for item in response.json()["items"] if item.get("is_active", True))
+    if not assets or not employees:
+        raise RuntimeError("churn scenario needs active assets and employees; load data first")
+    ctx.state["free"] = assets
+    ctx.state["employees"] = employees
+
+
+async def churn_step(ctx: Context) -> None:
+    """Assign a free asset to someone and hand it back, as IT does at onboarding/offboarding"""
+    free = ctx.state["free"]
+    if not free:
+        return
+    asset_id = free.pop(ctx.rng.randrange(len(free)))
+    try:
+        response = await ctx.call(
+            "asset", "asset.assign", "POST", f"/api/v1/assignments/{asset_id}/assign",
+            json={"employee_id": ctx.rng.choice(ctx.state["employees"]), "notes": "load test"},
+        )
+        if response is not None and response.status_code == 200:
+            await ctx.call("asset", "asset.return", "POST", f"/api/v1/assignments/{asset_id}/return",
+                           json={"notes": "load test"})
+    finally:
+        free.append(asset_id)
+
+
+# ---------------------------------------------------------------- invoice billing run
+
+async def billing_step(ctx: Context) -> None:
+    """A billing run: create a batch of invoices with lines, then send them"""
+    due = date.today() + timedelta(days=ctx.rng.choice([15, 30, 45]))
+    batch = [
+        {
+            "status": "draft",
+            "due_date": due.isoformat(),
+            "line_items": [
+                {"description": f"Service {n}", "quantity": ctx.rng.randint(1, 10),
+                 "unit_price": round(ctx.rng.uniform(10, 2000), 2)}
+                for n in range(ctx.rng.randint(1, 5))
+            ],
+        }
+        for _ in range(ctx.rng.randint(20, 100))
+    ]
+    response = await ctx.call("invoice", "invoice.bulk_create", "POST", "/api/v1/invoices/bulk", json=batch)
+    if response is None or response.status_code != 201:
+        return
+    ids = [invoice["id"] for invoice in response.json()]
+    await ctx.call("invoice", "invoice.send", "POST", "/api/v1/invoices/status-transitions",
+                   json={"target_status": "sent", "ids": ids})
+
+
+SCENARIOS: Dict[str, Tuple[Setup, Step]] = {
+    "dashboard-storm": (None, dashboard_step),
+    "search": (None, search_step),
+    "list-paging": (None, paging_step),
+    "assign-churn": (churn_setup, churn_step),
+    "billing-run": (None, billing_step),
+}